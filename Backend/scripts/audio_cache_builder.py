@@ -0,0 +1,279 @@
+"""
+Build sẵn audio phát âm cho từ vựng HSK (thay cho link Google TTS gọi mỗi lần phát)
+
+Tải audio của mỗi từ một lần (nhiều luồng song song) từ TTS endpoint cấu hình được,
+lưu theo nội dung (tên file = sha256 của bytes audio, từ có audio giống hệt nhau dùng
+chung một file) trong wwwroot/audio của HiHSK.Api, và ghi audio-manifest.json
+(từ -> file). convert_hsk1_to_seed_data.py dùng manifest để audioUrl trỏ tới file
+tĩnh /audio/<hash>.mp3, lúc phát không còn gọi lên Google.
+
+Chạy lại chỉ tải các từ chưa có trong manifest (hoặc file đã bị xóa).
+
+Cách sử dụng:
+python audio_cache_builder.py [--endpoint=URL] [--lang=zh-CN] [--workers=8] [file/thư mục hsk*.json ...]
+
+--endpoint: URL template có {text} (đã encode) và {lang}, mặc định Google TTS.
+VD: dùng TTS chạy local: --endpoint="http://localhost:5002/tts?q={text}&lang={lang}"
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import requests
+
+from frequency_index import load_vocabulary
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+AUDIO_DIR = SCRIPT_DIR.parent / "src" / "HiHSK.Api" / "wwwroot" / "audio"
+MANIFEST_FILE = "audio-manifest.json"
+# wwwroot/audio được phục vụ bởi UseStaticFiles trong Program.cs; frontend chuyển /audio/* tới backend
+# qua rewrite trong Frontend/next.config.js
+AUDIO_URL_PREFIX = "/audio/"
+
+DEFAULT_TTS_ENDPOINT = "https://translate.google.com/translate_tts?ie=UTF-8&tl={lang}&client=tw-ob&q={text}"
+DEFAULT_LANG = "zh-CN"
+DEFAULT_WORKERS = 8
+MAX_RETRIES = 3
+
+_EXTENSIONS = {"audio/mpeg": ".mp3", "audio/mp3": ".mp3", "audio/ogg": ".ogg", "audio/wav": ".wav",
+               "audio/x-wav": ".wav", "audio/webm": ".webm"}
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "audio/mpeg, audio/*, */*",
+}
+
+
+def normalize_text(text: str) -> str:
+    """Bỏ BOM và khoảng trắng (giống TTSService phía backend)"""
+    return text.replace("\ufeff", "").strip()
+
+
+class AudioFetchError(Exception):
+    pass
+
+
+class AudioCacheBuilder:
+    """
+    Tải audio còn thiếu và lưu theo nội dung vào audio_dir
+
+    builder.build(texts) trả về (số từ đã tải, danh sách từ lỗi), manifest được ghi sau mỗi lần build.
+    """
+
+    def __init__(self, audio_dir: Path = AUDIO_DIR, endpoint: str = DEFAULT_TTS_ENDPOINT,
+                 lang: str = DEFAULT_LANG, workers: int = DEFAULT_WORKERS):
+        self.audio_dir = Path(audio_dir)
+        self.endpoint = endpoint
+        self.lang = lang
+        self.workers = workers
+        self.manifest_path = self.audio_dir / MANIFEST_FILE
+        self.entries: Dict[str, str] = {}  # Từ -> tên file
+        self._local = threading.local()  # Mỗi luồng một requests.Session
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            # Audio của ngôn ngữ khác không dùng lại được
+            if manifest.get("lang") == lang:
+                self.entries = manifest.get("entries", {})
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(_HEADERS)
+            self._local.session = session
+        return session
+
+    def missing(self, texts: Iterable[str]) -> List[str]:
+        """Các từ chưa có audio (chưa có trong manifest hoặc file đã bị xóa)"""
+        result = []
+        for text in sorted({normalize_text(t) for t in texts} - {""}):
+            filename = self.entries.get(text)
+            if filename is None or not (self.audio_dir / filename).exists():
+                result.append(text)
+        return result
+
+    def fetch(self, text: str) -> Tuple[bytes, str]:
+        """Tải audio của một từ, thử lại khi bị giới hạn (429) hoặc lỗi server"""
+        url = self.endpoint.format(text=urllib.parse.quote(text), lang=urllib.parse.quote(self.lang))
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = self._session().get(url, timeout=15)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                if response.status_code == 200:
+                    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    data = response.content
+                    if not data or content_type.startswith("text/") or data[:100].lstrip().startswith(b"<"):
+                        raise AudioFetchError(f"không phải audio ({content_type or 'không có Content-Type'})")
+                    return data, _EXTENSIONS.get(content_type, ".mp3")
+                if response.status_code != 429 and response.status_code < 500:
+                    raise AudioFetchError(f"HTTP {response.status_code}")
+                error = f"HTTP {response.status_code}"
+            if attempt + 1 < MAX_RETRIES:
+                time.sleep(2 ** attempt)
+        raise AudioFetchError(error)
+
+    def store(self, data: bytes, extension: str) -> str:
+        """Lưu audio theo sha256 của nội dung, trả về tên file (file trùng nội dung không ghi lại)"""
+        filename = hashlib.sha256(data).hexdigest() + extension
+        path = self.audio_dir / filename
+        if not path.exists():
+            tmp_path = path.with_name(f"{filename}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)  # Không để lại file dở
+                raise
+        return filename
+
+    def _fetch_and_store(self, text: str) -> str:
+        data, extension = self.fetch(text)
+        return self.store(data, extension)
+
+    def build(self, texts: Iterable[str]) -> Tuple[int, List[Tuple[str, str]]]:
+        """
+        Tải song song các từ còn thiếu, ghi manifest. Trả về (số từ đã tải, [(từ, lỗi)])
+
+        Lỗi tải hoặc ghi file (OSError) của một từ chỉ đưa từ đó vào danh sách lỗi. Lỗi khác
+        được ném lại sau khi các từ còn lại đã xong và manifest đã được ghi.
+        """
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        todo = self.missing(texts)
+        failed = []
+        done = 0
+        unexpected = []  # Lỗi bất ngờ (lỗi code): ném lại sau khi đã ghi manifest
+        try:
+            if todo:
+                print(f"📥 Tải audio {len(todo)} từ ({self.workers} luồng)...")
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = {executor.submit(self._fetch_and_store, text): text for text in todo}
+                    for future in as_completed(futures):
+                        text = futures[future]
+                        try:
+                            filename = future.result()
+                        except (AudioFetchError, OSError) as e:
+                            # OSError: ghi file lỗi (hết dung lượng, không có quyền...)
+                            failed.append((text, str(e)))
+                            continue
+                        except Exception as e:
+                            failed.append((text, f"{type(e).__name__}: {e}"))
+                            unexpected.append(e)
+                            continue
+                        self.entries[text] = filename
+                        done += 1
+                        if done % 100 == 0:
+                            print(f"   {done}/{len(todo)}")
+        finally:
+            # Bị ngắt giữa chừng vẫn ghi manifest: các file đã tải trong lượt này không phải tải lại
+            self.write_manifest()
+        if unexpected:
+            raise unexpected[0]
+        return done, failed
+
+    def write_manifest(self):
+        files = set(self.entries.values())
+        manifest = {
+            "lang": self.lang,
+            "urlPrefix": AUDIO_URL_PREFIX,
+            "words": len(self.entries),
+            "files": len(files),
+            "bytes": sum((self.audio_dir / name).stat().st_size for name in files
+                         if (self.audio_dir / name).exists()),
+            "entries": dict(sorted(self.entries.items())),
+        }
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+class AudioManifest:
+    """Manifest đã build, tra audioUrl local của một từ"""
+
+    def __init__(self, path: Path = AUDIO_DIR / MANIFEST_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.lang = manifest.get("lang", DEFAULT_LANG)
+        self.url_prefix = manifest.get("urlPrefix", AUDIO_URL_PREFIX)
+        self.entries: Dict[str, str] = manifest.get("entries", {})
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def url(self, text: str) -> Optional[str]:
+        """URL file audio tĩnh của từ, None nếu chưa có"""
+        filename = self.entries.get(normalize_text(text))
+        return self.url_prefix + filename if filename else None
+
+
+_audio_manifest: Optional[AudioManifest] = None
+_audio_manifest_checked = False
+
+
+def get_audio_manifest() -> Optional[AudioManifest]:
+    """AudioManifest dùng chung, None nếu chưa build audio"""
+    global _audio_manifest, _audio_manifest_checked
+    if not _audio_manifest_checked:
+        _audio_manifest_checked = True
+        path = AUDIO_DIR / MANIFEST_FILE
+        if path.exists():
+            manifest = AudioManifest(path)
+            _audio_manifest = manifest if len(manifest) else None
+    return _audio_manifest
+
+
+def main():
+    endpoint = DEFAULT_TTS_ENDPOINT
+    lang = DEFAULT_LANG
+    workers = DEFAULT_WORKERS
+    sources = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--endpoint="):
+            endpoint = arg.split("=", 1)[1]
+        elif arg.startswith("--lang="):
+            lang = arg.split("=", 1)[1]
+        elif arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+        else:
+            sources.append(Path(arg))
+
+    # Từ vựng: các file hsk*.json chỉ định, mặc định scripts/ và ../data
+    dirs = [p for p in sources if p.is_dir()] if sources else [SCRIPT_DIR, DATA_DIR]
+    texts: Set[str] = load_vocabulary(dirs)
+    for path in sources:
+        if path.is_file():
+            with open(path, "r", encoding="utf-8") as f:
+                texts |= {item.get("simplified", "") for item in json.load(f) if isinstance(item, dict)}
+    if not texts:
+        print("❌ Không tìm thấy từ vựng (file hsk*.json)")
+        sys.exit(1)
+
+    builder = AudioCacheBuilder(AUDIO_DIR, endpoint, lang, workers)
+    print(f"📚 {len(texts)} từ, đã có audio {len(texts) - len(builder.missing(texts))} từ")
+    start = time.time()
+    done, failed = builder.build(texts)
+
+    files = len(set(builder.entries.values()))
+    print(f"✅ Đã tải {done} từ ({time.time() - start:.1f}s) - manifest: {len(builder.entries)} từ, {files} file")
+    if failed:
+        print(f"⚠️  {len(failed)} từ lỗi (seed data sẽ dùng link TTS online cho các từ này):")
+        for text, error in failed[:20]:
+            print(f"   {text}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Bộ điều khiển backpressure kiểu AIMD cho import_hsk_all_levels.py
+
+Thay cho time.sleep(1) cố định giữa các batch:
+- Additive increase: mỗi response tốt tăng rate thêm rate_step, window tăng
+  thêm 1 sau mỗi "vòng" (window response)
+- Multiplicative decrease: 429, 5xx, timeout/lỗi kết nối hoặc p95 latency vượt
+  latency_target thì nhân window và rate với decrease_factor
+- Sau mỗi lần giảm có thời gian chờ (cooldown) để các request đang bay
+  với window cũ không làm giảm thêm lần nữa
+
+Cách sử dụng (đồng bộ):
+    controller.acquire()
+    ... gửi request ...
+    controller.on_response(latency, status_code)
+
+Cách sử dụng (async):
+    await controller.acquire_async()
+    try:
+        ... gửi request ...
+    finally:
+        controller.on_response(latency, status_code)
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+# Status code được coi là server đang quá tải
+PUSHBACK_STATUS_CODES = (429, 502, 503, 504)
+
+
+class AIMDController:
+    """Điều khiển rate (request/giây) và window (số request đồng thời)"""
+
+    def __init__(self, initial_rate: float = 10.0, min_rate: float = 1.0, max_rate: float = 1000.0,
+                 initial_window: float = 4.0, min_window: float = 1.0, max_window: float = 32.0,
+                 rate_step: float = 1.0, decrease_factor: float = 0.5,
+                 latency_target: float = 3.0, sample_size: int = 100, min_cooldown: float = 0.5):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_window = min_window
+        self.max_window = max_window
+        self.rate = max(min_rate, min(max_rate, initial_rate))
+        self.window = max(min_window, min(max_window, initial_window))
+        self.rate_step = rate_step
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.min_cooldown = min_cooldown
+
+        self.in_flight = 0
+        self.latencies = deque(maxlen=sample_size)
+        self.increases = 0
+        self.decreases = 0
+        self._next_slot = 0.0
+        self._cooldown_until = 0.0
+        self._waiters = deque()  # Future của các coroutine đang chờ chỗ trong window
+
+    # ============ PERCENTILES ============
+
+    def percentile(self, p: float) -> float:
+        """Percentile latency (giây) trên các mẫu gần nhất, 0 nếu chưa có mẫu"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    # ============ ACQUIRE ============
+
+    def _reserve_slot(self, now: float) -> float:
+        """Đặt chỗ cho request tiếp theo theo rate, trả về thời gian cần chờ"""
+        start = max(now, self._next_slot)
+        self._next_slot = start + 1.0 / self.rate
+        return start - now
+
+    def acquire(self):
+        """Chờ đến lượt gửi request (chế độ tuần tự)"""
+        delay = self._reserve_slot(time.monotonic())
+        if delay > 0:
+            time.sleep(delay)
+        self.in_flight += 1
+
+    async def acquire_async(self):
+        """Chờ đến khi còn chỗ trong window và đến lượt theo rate"""
+        while self.in_flight >= int(self.window):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+        self.in_flight += 1
+        delay = self._reserve_slot(time.monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # ============ FEEDBACK ============
+
+    def on_response(self, latency: float, status_code: Optional[int]):
+        """
+        Cập nhật sau mỗi response
+
+        status_code=None nghĩa là timeout hoặc lỗi kết nối
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+        self.latencies.append(latency)
+
+        pushback = status_code is None or status_code in PUSHBACK_STATUS_CODES or status_code >= 500
+        if pushback or self.percentile(95) > self.latency_target:
+            self._decrease()
+        else:
+            self._increase()
+
+        # Chỉ đánh thức đúng số coroutine vừa có chỗ trong window
+        free_slots = int(self.window) - self.in_flight
+        while free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free_slots -= 1
+
+    def _increase(self):
+        self.increases += 1
+        self.window = min(self.max_window, self.window + 1.0 / self.window)
+        self.rate = min(self.max_rate, self.rate + self.rate_step)
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now < self._cooldown_until:
+            return
+
+        self.decreases += 1
+        self.window = max(self.min_window, self.window * self.decrease_factor)
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._cooldown_until = now + max(self.min_cooldown, self.percentile(95))
+
+        # Bỏ các mẫu latency cũ để p95 phản ánh trạng thái sau khi giảm
+        self.latencies.clear()
+        # Không giữ các slot đã đặt trước theo rate cũ
+        self._next_slot = min(self._next_slot, now + 1.0 / self.rate)
+
+    def status(self) -> str:
+        """Trạng thái hiện tại để in kèm progress"""
+        return (f"rate {self.rate:.1f} req/s, window {int(self.window)}, "
+                f"p50 {self.percentile(50):.2f}s, p95 {self.percentile(95):.2f}s")
@@ -0,0 +1,130 @@
+"""
+Benchmark thời gian download_hsk_data.py với HTTP server local (không cần mạng)
+
+Server phục vụ 6 file hsk{N}.json giả lập, có ETag / Last-Modified và trả 304 cho
+request có điều kiện, mỗi response chậm thêm một khoảng (giả lập mạng). Các lượt chạy:
+1. Tải lần đầu, 1 luồng (như cách tải tuần tự cũ)
+2. Tải lần đầu, song song (--force)
+3. Chạy lại: mọi file nhận 304, không tải lại
+4. Đổi nội dung một file trên server: chỉ file đó được tải lại
+
+Kiểm tra tính đúng (304, giữ mirror khi server trả nội dung hỏng, manifest) nằm trong
+test_download_hsk_data.py.
+
+Cách sử dụng:
+python benchmark_hsk_download.py [số từ mỗi file] [độ trễ mỗi response (ms)]
+"""
+
+import contextlib
+import email.utils
+import hashlib
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+
+import download_hsk_data
+from download_hsk_data import HSK_DATA_SOURCES, download_hsk_data as run_download
+
+SOURCE_NAME = "local_benchmark"
+
+
+class FileStore:
+    """Nội dung các file trên server giả lập (tên file -> (bytes, ETag, Last-Modified))"""
+
+    def __init__(self):
+        self.files: Dict[str, tuple] = {}
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+    def put(self, name: str, content: bytes):
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        self.files[name] = (content, etag, email.utils.formatdate(time.time(), usegmt=True))
+
+
+def make_handler(store: FileStore, delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with store.lock:
+                store.requests += 1
+            time.sleep(delay)
+            entry = store.files.get(self.path.lstrip("/"))
+            if entry is None:
+                self.send_error(404)
+                return
+            content, etag, last_modified = entry
+            if self.headers.get("If-None-Match") == etag:
+                with store.lock:
+                    store.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def level_file(level: int, words: int, version: int = 1) -> bytes:
+    items = [{"id": i, "hanzi": chr(0x4E00 + (level * 1000 + i) % 20000), "pinyin": "pīn yīn",
+              "translations": [f"meaning {level}-{i} v{version}"]} for i in range(words)]
+    return json.dumps(items, ensure_ascii=False).encode("utf-8")
+
+
+def run(label: str, output_dir: Path, workers: int, force: bool = False) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = run_download(output_dir, SOURCE_NAME, workers, force)
+    print(f"  {label:<34} {stats['elapsed']:.2f}s - tải {stats['downloaded']}, 304 {stats['notModified']}, "
+          f"lỗi {stats['failed']}, {stats['bytesDownloaded']:,} bytes (tiết kiệm {stats['bytesSaved']:,} bytes, "
+          f"~{stats['secondsSaved']:.2f}s)")
+    return stats
+
+
+def main():
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+
+    store = FileStore()
+    for level in range(1, 7):
+        store.put(f"hsk{level}.json", level_file(level, words))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(store, delay))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    HSK_DATA_SOURCES[SOURCE_NAME] = {
+        "name": "local benchmark",
+        "base_url": f"http://127.0.0.1:{server.server_address[1]}",
+        "files": {level: f"hsk{level}.json" for level in range(1, 7)},
+    }
+
+    print("=" * 60)
+    print(f"BENCHMARK DOWNLOAD HSK ({words:,} từ/file, trễ {delay * 1000:.0f}ms/response)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        run("1. lần đầu, 1 luồng", output_dir, workers=1)
+        run("2. lần đầu, song song (--force)", output_dir, download_hsk_data.DEFAULT_WORKERS, force=True)
+        run("3. chạy lại", output_dir, download_hsk_data.DEFAULT_WORKERS)
+        store.put("hsk3.json", level_file(3, words, version=2))
+        run("4. hsk3.json thay đổi", output_dir, download_hsk_data.DEFAULT_WORKERS)
+
+    server.shutdown()
+    print(f"\n  Server: {store.requests} request, {store.not_modified} lần 304")
+
+
+if __name__ == "__main__":
+    main()
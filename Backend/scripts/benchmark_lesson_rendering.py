@@ -0,0 +1,120 @@
+"""
+Benchmark render nội dung HTML bài học (lesson_renderer.py) so với cách cũ (cộng chuỗi content +=)
+trên một khóa học giả lập
+
+Cách sử dụng:
+python benchmark_lesson_rendering.py [số từ] [số lần lặp]
+
+Mặc định 50.000 từ (~4.200 bài 12 từ), lặp 5 lần. Chạy hai trường hợp: nghĩa
+không có ký tự cần escape (như dữ liệu HSK thực tế), và 1/50 từ có &, < hoặc > trong
+nghĩa (cách cũ để nguyên làm hỏng HTML, renderer mới escape các giá trị này bằng html.escape).
+Dòng "content += escape" là cách cũ có escape mọi giá trị, để so với renderer khi cùng an toàn.
+"""
+
+import html
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from lesson_renderer import get_lesson_renderer
+
+WORDS_PER_LESSON = 12
+
+
+def generate_lesson_content_concat(words: List[Dict[str, Any]]) -> str:
+    """Cách render cũ: cộng chuỗi từng dòng (giữ lại để so sánh)"""
+    content = f"<h2>Học {len(words)} từ vựng</h2>\n"
+    content += "<p>Trong bài học này, bạn sẽ học các từ vựng sau:</p>\n"
+    content += "<ul>\n"
+
+    for word in words:
+        char = word.get("character", "")
+        pinyin = word.get("pinyin", "")
+        meaning = word.get("meaning", "")
+        content += f"<li><strong>{char}</strong> ({pinyin}) - {meaning}</li>\n"
+
+    content += "</ul>"
+    return content
+
+
+def generate_lesson_content_concat_escaped(words: List[Dict[str, Any]]) -> str:
+    """Cách cộng chuỗi cũ nhưng escape mọi giá trị (cùng kết quả với lesson_renderer)"""
+    content = f"<h2>Học {len(words)} từ vựng</h2>\n"
+    content += "<p>Trong bài học này, bạn sẽ học các từ vựng sau:</p>\n"
+    content += "<ul>\n"
+
+    for word in words:
+        char = html.escape(str(word.get("character", "")), quote=False)
+        pinyin = html.escape(str(word.get("pinyin", "")), quote=False)
+        meaning = html.escape(str(word.get("meaning", "")), quote=False)
+        content += f"<li><strong>{char}</strong> ({pinyin}) - {meaning}</li>\n"
+
+    content += "</ul>"
+    return content
+
+
+def synthetic_course(total_words: int, special_every: int = 0, seed: int = 1) -> List[List[Dict[str, Any]]]:
+    """
+    Khóa học giả lập: danh sách bài, mỗi bài WORDS_PER_LESSON từ
+    special_every: cứ bao nhiêu từ thì có một từ có ký tự cần escape trong nghĩa (0 = không có)
+    """
+    rng = random.Random(seed)
+    syllables = ["ài", "bā", "chī", "diàn", "fēi", "gōng", "hǎo", "jiā", "kàn", "lái", "mǎi", "nǐ"]
+    meanings = ["yêu", "tám", "ăn", "điện", "bay", "công việc", "tốt", "nhà", "xem", "đến", "mua", "bạn"]
+    words = []
+    for index in range(total_words):
+        length = rng.randint(1, 3)
+        meaning = ", ".join(rng.sample(meanings, rng.randint(1, 3)))
+        if special_every and index % special_every == 0:
+            meaning += " (A & B <phrase>)"
+        words.append({
+            "character": "".join(chr(0x4E00 + rng.randrange(20000)) for _ in range(length)),
+            "pinyin": " ".join(rng.choice(syllables) for _ in range(length)),
+            "meaning": meaning,
+        })
+    return [words[i:i + WORDS_PER_LESSON] for i in range(0, total_words, WORDS_PER_LESSON)]
+
+
+def run(name: str, func: Callable[[List[List[Dict[str, Any]]]], List[str]],
+        lessons: List[List[Dict[str, Any]]], repeat: int) -> List[str]:
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = func(lessons)
+    elapsed = time.perf_counter() - start
+    total = len(lessons) * repeat
+    print(f"  {name:<18} {elapsed:.3f}s - {total / elapsed:,.0f} bài/s")
+    return results
+
+
+def main():
+    total_words = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print("=" * 60)
+    print("BENCHMARK RENDER NỘI DUNG BÀI HỌC")
+    print("=" * 60)
+
+    renderer = get_lesson_renderer()
+    for label, special_every in (("không cần escape", 0), ("1/50 từ cần escape", 50)):
+        lessons = synthetic_course(total_words, special_every)
+        print(f"\n{label}: {total_words:,} từ, {len(lessons):,} bài x {repeat} lần")
+
+        old_results = run("content +=", lambda batch: [generate_lesson_content_concat(w) for w in batch],
+                          lessons, repeat)
+        escaped_results = run("content += escape",
+                              lambda batch: [generate_lesson_content_concat_escaped(w) for w in batch],
+                              lessons, repeat)
+        new_results = run("lesson_renderer", renderer.render_contents, lessons, repeat)
+        if new_results != escaped_results:
+            print("  ❌ lesson_renderer khác kết quả cộng chuỗi có escape")
+
+        changed = [(old, new) for old, new in zip(old_results, new_results) if old != new]
+        print(f"  📝 {len(changed)}/{len(lessons)} bài khác kết quả (do escape &, < và >)")
+        for old, new in changed[:1]:
+            print(f"    cũ:  {next(line for line in old.split(chr(10)) if '<phrase>' in line)}")
+            print(f"    mới: {next(line for line in new.split(chr(10)) if '&amp;' in line)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark translate_meaning (trie, longest match) so với cách cũ (tra từng từ)
+trên toàn bộ definitions HSK 1-6 có sẵn
+
+Cách sử dụng:
+python benchmark_translation.py [số lần lặp]
+
+Script đọc các file hsk*.json trong Backend/scripts và Backend/data
+(chạy download_hsk_data.py trước để có đủ HSK 1-6).
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from translation_dict import TRANSLATION_DICT, get_phrase_translator, translate_meaning
+
+
+def translate_meaning_by_word(english_text: str) -> str:
+    """Cách dịch cũ: tra cả cụm, không có thì tra từng từ (giữ lại để so sánh)"""
+    if not english_text:
+        return ""
+
+    meanings = [m.strip() for m in english_text.split(',')]
+
+    translated_meanings = []
+    for meaning in meanings:
+        clean_meaning = meaning.split('(')[0].strip()
+
+        if clean_meaning in TRANSLATION_DICT:
+            translated_meanings.append(TRANSLATION_DICT[clean_meaning])
+        else:
+            words = clean_meaning.split()
+            translated_words = []
+            for word in words:
+                clean_word = word.strip('.,!?;:')
+                if clean_word.lower() in TRANSLATION_DICT:
+                    translated_words.append(TRANSLATION_DICT[clean_word.lower()])
+                else:
+                    translated_words.append(clean_word)
+
+            if translated_words:
+                translated_meanings.append(' '.join(translated_words))
+            else:
+                translated_meanings.append(meaning)
+
+    return ', '.join(translated_meanings) if translated_meanings else english_text
+
+
+def load_definitions(dirs: List[Path]) -> List[str]:
+    """Đọc definitions của mọi từ trong các file hsk*.json (mỗi từ một chuỗi như convert script)"""
+    definitions = []
+    seen_files = set()
+    for directory in dirs:
+        for filepath in sorted(directory.glob("hsk*.json")):
+            if filepath.name in seen_files:
+                continue
+            seen_files.add(filepath.name)
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for item in data:
+                if isinstance(item, dict) and item.get('definitions'):
+                    definitions.append(', '.join(item['definitions']))
+            print(f"  📄 {filepath.name}: {len(data)} từ")
+    return definitions
+
+
+def run(name: str, func: Callable[[str], str], definitions: List[str], repeat: int) -> List[str]:
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(text) for text in definitions]
+    elapsed = time.perf_counter() - start
+    total = len(definitions) * repeat
+    print(f"  {name:<14} {elapsed:.3f}s - {total / elapsed:,.0f} definitions/s")
+    return results
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    script_dir = Path(__file__).parent
+
+    print("=" * 60)
+    print("BENCHMARK TRANSLATE_MEANING")
+    print("=" * 60)
+
+    definitions = load_definitions([script_dir, script_dir.parent / "data"])
+    if not definitions:
+        print("❌ Không tìm thấy file hsk*.json")
+        sys.exit(1)
+    print(f"  Tổng: {len(definitions)} definitions x {repeat} lần")
+
+    # Build trie trước để không tính vào thời gian dịch
+    start = time.perf_counter()
+    translator = get_phrase_translator()
+    print(f"  Build trie: {(time.perf_counter() - start) * 1000:.2f}ms "
+          f"({len(TRANSLATION_DICT)} key, cụm dài nhất {translator.max_phrase_length} token)")
+
+    print()
+    old_results = run("tra từng từ", translate_meaning_by_word, definitions, repeat)
+    new_results = run("trie", translate_meaning, definitions, repeat)
+
+    changed = [(text, old, new) for text, old, new in zip(definitions, old_results, new_results) if old != new]
+    print(f"\n📝 {len(changed)}/{len(definitions)} definitions cho kết quả khác")
+    for text, old, new in changed[:15]:
+        print(f"  {text[:50]}")
+        print(f"    cũ:  {old[:70]}")
+        print(f"    mới: {new[:70]}")
+
+
+if __name__ == "__main__":
+    main()
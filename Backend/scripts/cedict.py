@@ -0,0 +1,326 @@
+"""
+Đọc CC-CEDICT và tra cứu theo chữ giản thể, phồn thể, pinyin không dấu
+
+File CC-CEDICT (cedict_ts.u8, ~120k dòng) được đọc tuần tự từng dòng và ghi
+theo lô vào SQLite có index, nên bộ nhớ không phụ thuộc kích thước file.
+Store chỉ build lại khi file nguồn thay đổi (so kích thước + mtime).
+
+Format một dòng CC-CEDICT:
+    傳統 传统 [chuan2 tong3] /tradition/traditional/
+
+Cách sử dụng:
+    python cedict.py [đường dẫn cedict_ts.u8]
+
+    store = open_cedict_store()
+    if store is not None:
+        store.enrich(hsk_items)  # Bổ sung traditional/pinyin/definitions còn thiếu
+
+Tải CC-CEDICT: https://www.mdbg.net/chinese/dictionary?page=cc-cedict
+(giải nén cedict_ts.u8 vào Backend/data)
+"""
+
+import json
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_SOURCE_FILE = DATA_DIR / "cedict_ts.u8"
+DEFAULT_STORE_FILE = DATA_DIR / "cedict.db"
+
+_LINE_RE = re.compile(r"^(\S+) (\S+) \[([^\]]*)\] /(.*)/\s*$")
+_SYLLABLE_RE = re.compile(r"^([A-Za-z:]+)([1-5])$")
+_TONE_MARKS = {
+    "a": "āáǎà", "e": "ēéěè", "i": "īíǐì", "o": "ōóǒò", "u": "ūúǔù", "ü": "ǖǘǚǜ",
+    "A": "ĀÁǍÀ", "E": "ĒÉĚÈ", "I": "ĪÍǏÌ", "O": "ŌÓǑÒ", "U": "ŪÚǓÙ", "Ü": "ǕǗǙǛ",
+}
+_INSERT_BATCH = 5000
+_QUERY_BATCH = 400  # Số key mỗi câu IN (...) (mỗi key dùng 2 tham số, SQLite giới hạn 999)
+
+
+# ============ PINYIN ============
+
+def _mark_syllable(syllable: str) -> str:
+    """"hao3" -> "hǎo", "nu:3" -> "nǚ", tone 5 (thanh nhẹ) không dấu"""
+    match = _SYLLABLE_RE.match(syllable)
+    if not match:
+        return syllable
+    letters, tone = match.group(1).replace("u:", "ü").replace("U:", "Ü"), int(match.group(2))
+    if tone == 5:
+        return letters
+
+    lower = letters.lower()
+    # Quy tắc đặt dấu: a/e nhận dấu, "ou" đặt trên o, còn lại đặt trên nguyên âm cuối
+    if "a" in lower:
+        index = lower.index("a")
+    elif "e" in lower:
+        index = lower.index("e")
+    elif "ou" in lower:
+        index = lower.index("o")
+    else:
+        index = max((i for i, c in enumerate(lower) if c in "iouü"), default=-1)
+    if index < 0:
+        return letters
+    return letters[:index] + _TONE_MARKS[letters[index]][tone - 1] + letters[index + 1:]
+
+
+def numbered_to_marked(pinyin: str) -> str:
+    """Pinyin số của CC-CEDICT sang pinyin có dấu, viết liền như file HSK: "Bei3 jing1" -> "Běijīng" """
+    return "".join(_mark_syllable(syllable) for syllable in pinyin.split())
+
+
+def toneless_pinyin(pinyin: str) -> str:
+    """Pinyin không dấu, không khoảng trắng, lowercase (nhận cả dạng số lẫn có dấu): "nǚ'ér" -> "nver" """
+    # NFD tách dấu thanh ra khỏi nguyên âm (ǚ -> u + ¨ + ˇ), ü và u: viết thành v
+    text = unicodedata.normalize("NFD", pinyin.lower())
+    text = text.replace("u:", "v").replace("u\u0308", "v")
+    return "".join(c for c in text if c.isalpha() and c.isascii())
+
+
+# ============ PARSER ============
+
+def parse_cedict_line(line: str) -> Optional[Dict]:
+    """Parse một dòng CC-CEDICT, None với dòng comment hoặc sai format"""
+    if not line or line.startswith("#"):
+        return None
+    match = _LINE_RE.match(line.rstrip("\r\n"))
+    if not match:
+        return None
+    traditional, simplified, pinyin, definitions = match.groups()
+    return {
+        "traditional": traditional,
+        "simplified": simplified,
+        "pinyin_numbered": pinyin,
+        "pinyin": numbered_to_marked(pinyin),
+        "definitions": [d for d in definitions.split("/") if d],
+    }
+
+
+def iter_cedict(path: Path) -> Iterator[Dict]:
+    """Đọc file CC-CEDICT từng dòng (không nạp cả file vào bộ nhớ)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = parse_cedict_line(line)
+            if entry is not None:
+                yield entry
+
+
+# ============ STORE ============
+
+class CedictStore:
+    """
+    Store SQLite của CC-CEDICT, index theo simplified, traditional và pinyin không dấu
+
+    Tra nhiều chữ một lần (lookup_many) bằng câu IN (...) theo lô,
+    không truy vấn riêng từng từ.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_STORE_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                traditional TEXT NOT NULL,
+                simplified TEXT NOT NULL,
+                pinyin TEXT NOT NULL,
+                pinyin_toneless TEXT NOT NULL,
+                definitions TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ============ BUILD ============
+
+    @staticmethod
+    def _source_signature(source_path: Path) -> str:
+        stat = Path(source_path).stat()
+        return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+    def is_current(self, source_path: Path) -> bool:
+        """True nếu store đã build từ đúng phiên bản file nguồn này"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        return row is not None and row[0] == self._source_signature(source_path)
+
+    def build(self, source_path: Path) -> int:
+        """Build lại store từ file CC-CEDICT (một lượt đọc, ghi theo lô), trả về số mục"""
+        self.conn.execute("DROP INDEX IF EXISTS idx_entries_simplified")
+        self.conn.execute("DROP INDEX IF EXISTS idx_entries_traditional")
+        self.conn.execute("DROP INDEX IF EXISTS idx_entries_pinyin")
+        self.conn.execute("DELETE FROM entries")
+
+        count = 0
+        batch = []
+        for entry in iter_cedict(source_path):
+            batch.append((
+                entry["traditional"],
+                entry["simplified"],
+                entry["pinyin"],
+                toneless_pinyin(entry["pinyin_numbered"]),
+                json.dumps(entry["definitions"], ensure_ascii=False),
+            ))
+            if len(batch) >= _INSERT_BATCH:
+                self._insert(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._insert(batch)
+            count += len(batch)
+
+        # Tạo index sau khi insert xong (nhanh hơn cập nhật index từng dòng)
+        self.conn.execute("CREATE INDEX idx_entries_simplified ON entries (simplified)")
+        self.conn.execute("CREATE INDEX idx_entries_traditional ON entries (traditional)")
+        self.conn.execute("CREATE INDEX idx_entries_pinyin ON entries (pinyin_toneless)")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)",
+            (self._source_signature(source_path),),
+        )
+        self.conn.commit()
+        return count
+
+    def _insert(self, batch: List[tuple]):
+        self.conn.executemany(
+            "INSERT INTO entries (traditional, simplified, pinyin, pinyin_toneless, definitions) "
+            "VALUES (?, ?, ?, ?, ?)",
+            batch,
+        )
+
+    # ============ LOOKUP ============
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> Dict:
+        traditional, simplified, pinyin, pinyin_toneless, definitions = row
+        return {
+            "traditional": traditional,
+            "simplified": simplified,
+            "pinyin": pinyin,
+            "pinyin_toneless": pinyin_toneless,
+            "definitions": json.loads(definitions),
+        }
+
+    def lookup_many(self, characters: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Các mục theo từng chữ (khớp simplified hoặc traditional), theo thứ tự trong CC-CEDICT"""
+        keys = list(dict.fromkeys(c for c in characters if c))
+        results: Dict[str, List[Dict]] = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            chunk = keys[start:start + _QUERY_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT traditional, simplified, pinyin, pinyin_toneless, definitions FROM entries "
+                f"WHERE simplified IN ({placeholders}) OR traditional IN ({placeholders}) ORDER BY id",
+                chunk + chunk,
+            )
+            wanted = set(chunk)
+            for row in rows:
+                entry = self._row_to_entry(row)
+                for key in {entry["simplified"], entry["traditional"]} & wanted:
+                    results.setdefault(key, []).append(entry)
+        return results
+
+    def lookup(self, character: str) -> List[Dict]:
+        """Các mục của một chữ (giản thể hoặc phồn thể)"""
+        return self.lookup_many([character]).get(character, [])
+
+    def lookup_pinyin(self, pinyin: str, limit: int = 50) -> List[Dict]:
+        """Các mục có pinyin không dấu trùng (VD: "nihao", "ni3 hao3" hay "nǐhǎo")"""
+        rows = self.conn.execute(
+            "SELECT traditional, simplified, pinyin, pinyin_toneless, definitions FROM entries "
+            "WHERE pinyin_toneless = ? ORDER BY id LIMIT ?",
+            (toneless_pinyin(pinyin), limit),
+        )
+        return [self._row_to_entry(row) for row in rows]
+
+    # ============ ENRICH ============
+
+    @staticmethod
+    def _choose_entry(entries: List[Dict], pinyin: str) -> Dict:
+        """Ưu tiên mục cùng pinyin, bỏ qua mục "variant of ..." nếu có lựa chọn khác"""
+        if pinyin:
+            toneless = toneless_pinyin(pinyin)
+            same_reading = [e for e in entries if e["pinyin_toneless"] == toneless]
+            entries = same_reading or entries
+        main = [e for e in entries if not e["definitions"][0].startswith(("variant of", "old variant of"))]
+        return (main or entries)[0]
+
+    def enrich(self, items: List[Dict]) -> int:
+        """
+        Bổ sung traditional / pinyin / definitions còn thiếu cho các từ HSK
+        (format {"simplified", "traditional", "pinyin", "definitions"}), trả về số từ được bổ sung
+        """
+        def key_of(item: Dict) -> str:
+            return (item.get("simplified") or item.get("traditional") or "").replace("\ufeff", "").strip()
+
+        fields = ("simplified", "traditional", "pinyin", "definitions")
+        missing = [item for item in items
+                   if isinstance(item, dict) and key_of(item) and not all(item.get(f) for f in fields)]
+        if not missing:
+            return 0
+
+        entries = self.lookup_many(key_of(item) for item in missing)
+        enriched = 0
+        for item in missing:
+            candidates = entries.get(key_of(item))
+            if not candidates:
+                continue
+            entry = self._choose_entry(candidates, item.get("pinyin") or "")
+            for field in fields:
+                if not item.get(field):
+                    item[field] = entry[field]
+            enriched += 1
+        return enriched
+
+    def close(self):
+        self.conn.close()
+
+
+def open_cedict_store(source_path: Path = DEFAULT_SOURCE_FILE,
+                      db_path: Path = DEFAULT_STORE_FILE) -> Optional[CedictStore]:
+    """
+    Mở store, build lại nếu file nguồn đổi. Trả về None nếu chưa có cả file nguồn lẫn store
+    """
+    source_path = Path(source_path)
+    if not source_path.exists():
+        if not Path(db_path).exists():
+            return None
+        return CedictStore(db_path)
+
+    store = CedictStore(db_path)
+    if not store.is_current(source_path):
+        start = time.time()
+        print(f"📚 Build CC-CEDICT store từ {source_path.name}...")
+        count = store.build(source_path)
+        print(f"   {count:,} mục ({time.time() - start:.1f}s)")
+    return store
+
+
+def main():
+    source_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SOURCE_FILE
+    if not source_path.exists():
+        print(f"❌ Không tìm thấy file CC-CEDICT: {source_path}")
+        print("   Tải tại https://www.mdbg.net/chinese/dictionary?page=cc-cedict và giải nén vào Backend/data")
+        sys.exit(1)
+
+    store = open_cedict_store(source_path)
+    print(f"✅ CC-CEDICT store: {store.db_path} ({len(store):,} mục)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
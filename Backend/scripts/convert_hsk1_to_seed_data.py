@@ -1,19 +1,75 @@
 """
 Script để chuyển đổi file hsk1.json sang format seed data
 và tích hợp Text-to-Speech cho audioUrl
+
+Cách sử dụng:
+python convert_hsk1_to_seed_data.py          # Chỉ HSK 1 (hsk1.json -> ../data/seed-data-hsk1.json)
+python convert_hsk1_to_seed_data.py 1-6      # Nhiều cấp độ, mỗi cấp một process
+python convert_hsk1_to_seed_data.py 1,3,5
+python convert_hsk1_to_seed_data.py 1-6 --format=compact --gzip --brotli
+
+Chế độ nhiều cấp độ đọc hsk{N}.json (thư mục scripts hoặc ../data), ghi
+../data/seed-data-hsk{N}.json cho từng cấp và ../data/seed-data-manifest.json.
+
+Tùy chọn output (xem seed_writer.py):
+--format=json|compact|ndjson   JSON thụt lề (mặc định), JSON gọn hoặc NDJSON (.ndjson)
+--gzip / --brotli              Tạo thêm file nén sẵn .gz / .br bên cạnh
+--partition=sequential|balanced|cluster
+                               Chia bài theo thứ tự file (mặc định), cân bằng độ khó hoặc
+                               gom từ cùng chữ Hán / bộ thủ (xem lesson_partitioner.py)
+--order=file|dependencies      Giữ thứ tự chia bài (mặc định, ghi stream khi chia sequential) hoặc
+                               sắp bài theo phụ thuộc chữ Hán (bài chứa 电 trước bài chứa 电脑,
+                               xem lesson_dependencies.py, cần toàn bộ từ của cấp độ)
 """
 
+import hashlib
+import itertools
 import json
 import math
+import os
+import time
 import urllib.parse
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+from audio_cache_builder import get_audio_manifest
+from cedict import CedictStore, open_cedict_store
+from frequency_index import get_frequency_ranks
+from lesson_dependencies import LESSON_ORDERS, order_lessons
+from lesson_partitioner import lesson_count, partition_words
+from lesson_renderer import get_lesson_renderer
+from seed_fingerprints import SeedBuildState, changes_path, lesson_fingerprint, word_hash
+from seed_writer import SeedWriter, seed_file_suffix
+from stroke_table import get_stroke_table
+from translation_cache import TranslationCache, open_translation_cache
 from translation_dict import translate_meaning
 
 # Cấu hình
 WORDS_PER_LESSON = 12  # Số từ vựng mỗi bài học
+# Cách chia bài (lesson_partitioner.py): "sequential" cắt theo thứ tự file,
+# "balanced" cân bằng độ khó, "cluster" gom từ tương đồng; số từ mỗi bài nằm trong [MIN, MAX]
+LESSON_PARTITION = "sequential"
+MIN_WORDS_PER_LESSON = 10
+MAX_WORDS_PER_LESSON = 15
+# Thứ tự bài (lesson_dependencies.py): "file" giữ thứ tự chia bài (bài trước là tiên quyết, ghi stream),
+# "dependencies" sắp topo theo phụ thuộc chữ Hán và prerequisiteLessonId là bài thật sự cần học trước
+LESSON_ORDER = "file"
 COURSE_ID = 1  # ID khóa học HSK 1
 HSK_LEVEL = 1
 
+# ID cố định theo cấp độ để ID không trùng giữa các file seed và không đổi giữa các lần chạy:
+# cấp N dùng word ID từ (N-1)*WORD_ID_BLOCK + 1 và lesson ID từ (N-1)*LESSON_ID_BLOCK + 1
+WORD_ID_BLOCK = 10000
+LESSON_ID_BLOCK = 1000
+MANIFEST_FILE = "seed-data-manifest.json"
+
+# Format file seed mặc định (xem seed_writer.py): "json" giữ format thụt lề như trước,
+# "compact"/"ndjson" nhỏ hơn nhiều cho HSK 1-6
+SEED_FORMAT = "json"
+
+# Phiên bản cách render lesson (render_lesson), tăng khi sửa để build tăng dần render lại mọi bài
+LESSON_RENDER_VERSION = 4
+
 # Text-to-Speech service URL
 # Có thể dùng Google TTS, Baidu TTS, hoặc tạo endpoint backend
 TTS_SERVICE_URL = "https://api.voicerss.org/?key=YOUR_KEY&hl=zh-cn&src={text}"
@@ -55,9 +111,17 @@ def generate_audio_url(character: str, pinyin: str = None, tts_service: str = "g
 
 def estimate_stroke_count(character: str) -> int:
     """
-    Ước tính số nét của chữ Hán (đơn giản)
-    Có thể cải thiện bằng cách dùng thư viện chuyên dụng
+    Số nét của chữ Hán / tổng số nét của từ ghép
+    
+    Tra bảng số nét Unihan (stroke_table.py) nếu đã build,
+    không có thì ước tính đơn giản như trước
     """
+    table = get_stroke_table()
+    if table is not None:
+        strokes = table.word_strokes(character)
+        if strokes is not None:
+            return strokes
+    
     # Số nét ước tính dựa trên độ phức tạp
     # Đây là cách đơn giản, có thể cải thiện
     if len(character) == 1:
@@ -72,22 +136,46 @@ def estimate_stroke_count(character: str) -> int:
 def estimate_frequency(index: int, total: int) -> int:
     """
     Ước tính tần suất sử dụng (từ đầu danh sách thường phổ biến hơn)
+    Chỉ dùng khi chưa build chỉ số tần suất từ corpus (frequency_index.py)
     """
     # Từ đầu danh sách có frequency cao hơn
     frequency = 100 - (index * 50 // total)
     return max(10, frequency)  # Tối thiểu 10
 
 
-def convert_hsk1_to_seed_format(hsk1_file: str) -> List[Dict[str, Any]]:
+def level_id_offsets(hsk_level: int) -> Tuple[int, int]:
+    """(word ID offset, lesson ID offset) của một cấp độ"""
+    return (hsk_level - 1) * WORD_ID_BLOCK, (hsk_level - 1) * LESSON_ID_BLOCK
+
+
+def load_hsk_items(hsk_file: str, cedict: CedictStore = None) -> List[Dict[str, Any]]:
     """
-    Chuyển đổi từ format hsk1.json sang format seed data
+    Đọc file hsk{N}.json, bổ sung pinyin/definitions còn thiếu từ CC-CEDICT (nếu có)
     """
-    with open(hsk1_file, 'r', encoding='utf-8') as f:
-        hsk1_data = json.load(f)
+    with open(hsk_file, 'r', encoding='utf-8') as f:
+        hsk_data = json.load(f)
     
-    words = []
+    if cedict is not None:
+        enriched = cedict.enrich(hsk_data)
+        if enriched:
+            print(f"   Bổ sung {enriched} từ từ CC-CEDICT")
     
-    for index, item in enumerate(hsk1_data):
+    return hsk_data
+
+
+def iter_seed_words(hsk_data: List[Dict[str, Any]], cache: TranslationCache = None,
+                    hsk_level: int = HSK_LEVEL) -> Iterator[Dict[str, Any]]:
+    """
+    Chuyển từng mục của file HSK sang word của seed data (tạo dần, không giữ cả danh sách)
+    
+    cache: cache bản dịch trên đĩa (bỏ qua bước dịch với nghĩa đã dịch ở lần chạy trước)
+    """
+    # Tần suất từ corpus nếu đã build frequency_index.py, không thì ước tính theo vị trí
+    frequency_ranks = get_frequency_ranks()
+    # File audio tĩnh nếu đã build audio_cache_builder.py
+    audio_manifest = get_audio_manifest()
+    
+    for index, item in enumerate(hsk_data):
         # Lấy dữ liệu từ hsk1.json
         character = item.get('simplified', '').strip()
         pinyin = item.get('pinyin', '').strip()
@@ -95,172 +183,521 @@ def convert_hsk1_to_seed_format(hsk1_file: str) -> List[Dict[str, Any]]:
         
         # Chuyển đổi definitions thành meaning (tiếng Việt)
         english_meaning = ', '.join(definitions) if definitions else ''
-        meaning = translate_meaning(english_meaning) if english_meaning else ''
+        if not english_meaning:
+            meaning = ''
+        elif cache is not None:
+            meaning = cache.translate("meaning", english_meaning, translate_meaning)
+        else:
+            meaning = translate_meaning(english_meaning)
         
         # Tạo example sentence đơn giản (dùng tiếng Việt)
         example_sentence = f"{character} ({pinyin}) - {meaning}"
         
-        # Tạo audioUrl bằng Text-to-Speech (dùng Google TTS cho seed data)
-        audio_url = generate_audio_url(character, pinyin, tts_service="google")
+        # audioUrl: file audio đã build sẵn, từ chưa có thì dùng Google TTS
+        audio_url = audio_manifest.url(character) if audio_manifest is not None else None
+        if audio_url is None:
+            audio_url = generate_audio_url(character, pinyin, tts_service="google")
         
         # Tạo word object
-        word = {
+        yield {
             "character": character,
             "pinyin": pinyin,
             "meaning": meaning,
             "audioUrl": audio_url,
             "exampleSentence": example_sentence,
-            "hskLevel": HSK_LEVEL,
-            "frequency": estimate_frequency(index, len(hsk1_data)),
+            "hskLevel": hsk_level,
+            "frequency": (frequency_ranks.frequency(character) if frequency_ranks is not None
+                          else estimate_frequency(index, len(hsk_data))),
             "strokeCount": estimate_stroke_count(character)
         }
-        
-        words.append(word)
+
+
+def convert_hsk1_to_seed_format(hsk1_file: str, cache: TranslationCache = None,
+                                cedict: CedictStore = None, hsk_level: int = HSK_LEVEL) -> List[Dict[str, Any]]:
+    """
+    Chuyển đổi từ format hsk1.json sang format seed data
     
-    return words
+    cache: cache bản dịch trên đĩa (bỏ qua bước dịch với nghĩa đã dịch ở lần chạy trước)
+    cedict: CC-CEDICT store để bổ sung pinyin/definitions còn thiếu
+    """
+    hsk1_data = load_hsk_items(hsk1_file, cedict)
+    return list(iter_seed_words(hsk1_data, cache, hsk_level))
+
+
+def check_level_size(hsk_level: int, total_words: int, partition: str = LESSON_PARTITION) -> int:
+    """Số bài học của cấp độ, lỗi nếu số từ vượt khoảng ID của cấp (xem level_id_offsets)"""
+    if partition == "sequential":
+        num_lessons = math.ceil(total_words / WORDS_PER_LESSON)
+    else:
+        num_lessons = lesson_count(total_words, WORDS_PER_LESSON, MIN_WORDS_PER_LESSON, MAX_WORDS_PER_LESSON)
+    if total_words > WORD_ID_BLOCK or num_lessons > LESSON_ID_BLOCK:
+        raise ValueError(f"HSK {hsk_level} có {total_words} từ, vượt khoảng ID {WORD_ID_BLOCK} từ mỗi cấp")
+    return num_lessons
 
 
-def divide_words_into_lessons(words: List[Dict[str, Any]], course_id: int) -> Dict[str, Any]:
+def render_lesson(lesson_id: int, lesson_index: int, lesson_words: List[Dict[str, Any]],
+                  course_id: int, hsk_level: int = HSK_LEVEL, prerequisite_id: Optional[int] = None) -> Dict[str, Any]:
     """
-    Chia từ vựng thành các bài học
+    Tạo lesson (tiêu đề, nội dung HTML qua lesson_renderer.py) từ các từ của bài
+    
+    prerequisite_id: ID bài tiên quyết (xem lesson_groups)
+    
+    Sửa cách render hoặc template thì tăng LESSON_RENDER_VERSION để build tăng dần render lại mọi bài.
     """
-    total_words = len(words)
-    num_lessons = math.ceil(total_words / WORDS_PER_LESSON)
+    renderer = get_lesson_renderer()
     
-    print(f"Tổng số từ vựng: {total_words}")
-    print(f"Số từ vựng mỗi bài: {WORDS_PER_LESSON}")
-    print(f"Số bài học cần tạo: {num_lessons}")
-    print("-" * 50)
+    return {
+        "id": lesson_id,
+        "courseId": course_id,
+        "title": renderer.title(lesson_index, lesson_words),
+        "description": f"Học {len(lesson_words)} từ vựng HSK {hsk_level} cơ bản",
+        "lessonIndex": lesson_index,
+        "content": renderer.content(lesson_words),
+        "isLocked": lesson_index > 1,
+        "prerequisiteLessonId": prerequisite_id,
+        "isActive": True
+    }
+
+
+def chunk_words(words: Iterable[Dict[str, Any]], size: int = WORDS_PER_LESSON) -> Iterator[List[Dict[str, Any]]]:
+    """Cắt từ vựng theo thứ tự thành các nhóm size từ (kiểu stream, chỉ giữ một nhóm trong bộ nhớ)"""
+    words = iter(words)
+    while True:
+        group = list(itertools.islice(words, size))
+        if not group:
+            return
+        yield group
+
+
+def lesson_groups(words: Iterable[Dict[str, Any]], partition: str = LESSON_PARTITION,
+                  order: str = LESSON_ORDER) -> Iterable[Tuple[List[Dict[str, Any]], Optional[int]]]:
+    """
+    Nhóm từ của từng bài theo cách chia partition, sắp theo order, kèm lessonIndex của bài tiên quyết
     
-    lessons = []
-    word_id = 1
+    Chỉ "sequential" + order "file" cắt dần theo thứ tự (stream), các cách khác cần toàn bộ
+    từ vựng của cấp độ
+    """
+    if order not in LESSON_ORDERS:
+        raise ValueError(f"Thứ tự bài không hỗ trợ: {order} (chọn một trong {', '.join(LESSON_ORDERS)})")
+    if partition == "sequential":
+        groups = chunk_words(words, WORDS_PER_LESSON)
+    else:
+        groups = partition_words(list(words), partition, WORDS_PER_LESSON, MIN_WORDS_PER_LESSON, MAX_WORDS_PER_LESSON)
     
-    for lesson_index in range(1, num_lessons + 1):
-        start_idx = (lesson_index - 1) * WORDS_PER_LESSON
-        end_idx = min(start_idx + WORDS_PER_LESSON, total_words)
-        lesson_words = words[start_idx:end_idx]
-        
-        # Tạo tiêu đề bài học
-        if lesson_words:
-            first_chars = [w['character'] for w in lesson_words[:3]]
-            if len(first_chars) >= 2:
-                title = f"Bài {lesson_index}: {first_chars[0]}, {first_chars[1]} và các từ liên quan"
-            else:
-                title = f"Bài {lesson_index}: {first_chars[0]} và các từ cơ bản"
+    if order == "file":
+        return ((group, index - 1 if index > 1 else None) for index, group in enumerate(groups, 1))
+    groups, prerequisites = order_lessons(list(groups))
+    return zip(groups, prerequisites)
+
+
+def iter_lessons(groups: Iterable[Tuple[List[Dict[str, Any]], Optional[int]]], course_id: int,
+                 hsk_level: int = HSK_LEVEL,
+                 build_state: SeedBuildState = None) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Tạo các bài học từ các nhóm từ kèm lessonIndex bài tiên quyết (xem lesson_groups):
+    mỗi lần trả về (lesson, từ của bài)
+    
+    ID của word và lesson nằm trong khoảng riêng của cấp độ (xem level_id_offsets).
+    build_state: bài có fingerprint không đổi so với lần build trước được dùng lại, không render lại
+    """
+    word_offset, lesson_offset = level_id_offsets(hsk_level)
+    word_id = word_offset + 1
+    
+    for lesson_index, (lesson_words, prerequisite_index) in enumerate(groups, 1):
+        lesson_id = lesson_offset + lesson_index
+        prerequisite_id = lesson_offset + prerequisite_index if prerequisite_index else None
+        if build_state is None:
+            lesson = render_lesson(lesson_id, lesson_index, lesson_words, course_id, hsk_level, prerequisite_id)
         else:
-            title = f"Bài {lesson_index}: Từ vựng cơ bản"
-        
-        # Tạo nội dung bài học
-        content = f"<h2>Học {len(lesson_words)} từ vựng</h2>\n"
-        content += "<p>Trong bài học này, bạn sẽ học các từ vựng sau:</p>\n<ul>\n"
-        for word in lesson_words:
-            content += f"<li><strong>{word['character']}</strong> ({word['pinyin']}) - {word['meaning']}</li>\n"
-        content += "</ul>"
-        
-        # Tạo lesson
-        lesson = {
-            "courseId": course_id,
-            "title": title,
-            "description": f"Học {len(lesson_words)} từ vựng HSK {HSK_LEVEL} cơ bản",
-            "lessonIndex": lesson_index,
-            "content": content,
-            "isLocked": lesson_index > 1,
-            "prerequisiteLessonId": lesson_index - 1 if lesson_index > 1 else None,
-            "isActive": True
-        }
-        
-        lessons.append(lesson)
+            fingerprint = lesson_fingerprint(lesson_id, lesson_index, course_id, hsk_level,
+                                             [word_hash(word) for word in lesson_words], prerequisite_id)
+            lesson = build_state.lookup(lesson_id, fingerprint)
+            if lesson is None:
+                lesson = render_lesson(lesson_id, lesson_index, lesson_words, course_id, hsk_level, prerequisite_id)
+                build_state.store(lesson_id, fingerprint, lesson)
         
         # Thêm từ vựng với lessonId
         for word in lesson_words:
-            word["lessonId"] = lesson_index
+            word["lessonId"] = lesson_id
             word["id"] = word_id
             word_id += 1
         
-        print(f"Bài {lesson_index}: {title} - {len(lesson_words)} từ vựng")
+        yield lesson, lesson_words
+
+
+def divide_words_into_lessons(words: List[Dict[str, Any]], course_id: int, hsk_level: int = HSK_LEVEL,
+                              verbose: bool = True, partition: str = LESSON_PARTITION,
+                              order: str = LESSON_ORDER) -> Dict[str, Any]:
+    """
+    Chia từ vựng thành các bài học
+    
+    ID của word và lesson nằm trong khoảng riêng của cấp độ (xem level_id_offsets)
+    """
+    total_words = len(words)
+    num_lessons = check_level_size(hsk_level, total_words, partition)
+    
+    if verbose:
+        print(f"Tổng số từ vựng: {total_words}")
+        print(f"Số từ vựng mỗi bài: {WORDS_PER_LESSON}")
+        print(f"Số bài học cần tạo: {num_lessons}")
+        print("-" * 50)
+    
+    lessons = []
+    lesson_word_lists = []
+    for lesson, lesson_words in iter_lessons(lesson_groups(words, partition, order), course_id, hsk_level):
+        lessons.append(lesson)
+        lesson_word_lists.append(lesson_words)
+        if verbose:
+            print(f"Bài {lesson['lessonIndex']}: {lesson['title']} - {len(lesson_words)} từ vựng")
     
     return {
         "lessons": lessons,
-        "words": words
+        "words": [word for lesson_words in lesson_word_lists for word in lesson_words]
     }
 
 
-def create_seed_data_json(output_file: str, hsk1_file: str = "hsk1.json"):
+def build_course_entries(hsk_level: int, num_words: int, num_lessons: int) -> Dict[str, Any]:
     """
-    Tạo file seed data JSON đầy đủ
+    Course category và course của một cấp độ (ID = cấp độ)
     """
-    print("=" * 50)
-    print("Chuyển đổi HSK1 JSON sang Seed Data")
-    print("=" * 50)
-    
-    # Đọc và chuyển đổi từ vựng
-    print("\n1. Đọc và chuyển đổi từ vựng...")
-    words = convert_hsk1_to_seed_format(hsk1_file)
-    print(f"   Đã chuyển đổi {len(words)} từ vựng")
-    
-    # Chia thành bài học
-    print("\n2. Chia từ vựng thành bài học...")
-    lesson_data = divide_words_into_lessons(words, COURSE_ID)
-    
-    # Tạo seed data đầy đủ
-    print("\n3. Tạo seed data đầy đủ...")
-    seed_data = {
+    basic = hsk_level == 1
+    return {
         "courseCategories": [
             {
-                "id": 1,
-                "name": "HSK1",
-                "displayName": "HSK Cấp độ 1",
-                "description": "Cấp độ cơ bản nhất - 150 từ vựng",
+                "id": hsk_level,
+                "name": f"HSK{hsk_level}",
+                "displayName": f"HSK Cấp độ {hsk_level}",
+                "description": f"{'Cấp độ cơ bản nhất' if basic else f'Cấp độ {hsk_level}'} - {num_words} từ vựng",
                 "iconUrl": None,
-                "sortOrder": 1
+                "sortOrder": hsk_level
             }
         ],
         "courses": [
             {
-                "id": 1,
-                "categoryId": 1,
-                "title": "HSK 1 - Khóa học cơ bản",
-                "description": f"Khóa học HSK 1 với {len(lesson_data['lessons'])} bài học cơ bản, học {len(words)} từ vựng và các mẫu câu giao tiếp đơn giản nhất.",
+                "id": hsk_level,
+                "categoryId": hsk_level,
+                "title": f"HSK {hsk_level} - Khóa học {'cơ bản' if basic else f'cấp độ {hsk_level}'}",
+                "description": f"Khóa học HSK {hsk_level} với {num_lessons} bài học"
+                               f"{' cơ bản' if basic else ''}, học {num_words} từ vựng"
+                               f"{' và các mẫu câu giao tiếp đơn giản nhất' if basic else ''}.",
                 "imageUrl": None,
-                "level": "HSK 1",
-                "hskLevel": 1,
-                "sortOrder": 1,
+                "level": f"HSK {hsk_level}",
+                "hskLevel": hsk_level,
+                "sortOrder": hsk_level,
                 "isActive": True
             }
-        ],
-        "lessons": lesson_data["lessons"],
-        "words": lesson_data["words"],
-        "questions": []  # Có thể thêm sau
+        ]
+    }
+
+
+def build_seed_data(words: List[Dict[str, Any]], lesson_data: Dict[str, Any], hsk_level: int) -> Dict[str, Any]:
+    """
+    Tạo seed data đầy đủ của một cấp độ trong bộ nhớ (course category và course có ID = cấp độ)
+    """
+    seed_data = build_course_entries(hsk_level, len(words), len(lesson_data["lessons"]))
+    seed_data["lessons"] = lesson_data["lessons"]
+    seed_data["words"] = lesson_data["words"]
+    seed_data["questions"] = []  # Có thể thêm sau
+    return seed_data
+
+
+def write_seed_file(output_file: str, hsk_data: List[Dict[str, Any]], cache: TranslationCache = None,
+                    hsk_level: int = HSK_LEVEL, fmt: str = SEED_FORMAT, compress: Sequence[str] = (),
+                    partition: str = LESSON_PARTITION, order: str = LESSON_ORDER, verbose: bool = False,
+                    incremental: bool = True) -> Dict[str, Any]:
+    """
+    Chuyển đổi và ghi file seed của một cấp độ theo kiểu stream (SeedWriter):
+    word được tạo, chia bài và ghi ra file từng bài một, bộ nhớ không tăng theo số từ
+    (trừ khi partition khác "sequential" hoặc order khác "file": cần toàn bộ từ của cấp độ)
+    
+    incremental: chỉ render lại bài có word thay đổi so với lần build trước (seed_fingerprints.py)
+    và ghi danh sách bài thay đổi ra seed-data-hsk{N}.changes.json
+    
+    Trả về thống kê: số từ, số bài, khoảng ID, các file đã ghi, các bài thay đổi
+    """
+    output_path = Path(output_file)
+    num_lessons = check_level_size(hsk_level, len(hsk_data), partition)
+    header = build_course_entries(hsk_level, len(hsk_data), num_lessons)
+    first_word_id = last_word_id = first_lesson_id = last_lesson_id = None
+    
+    build_state = SeedBuildState(output_path, LESSON_RENDER_VERSION) if incremental else None
+    try:
+        with SeedWriter(output_path, fmt, compress) as writer:
+            writer.write_section("courseCategories", header["courseCategories"])
+            writer.write_section("courses", header["courses"])
+            
+            groups = lesson_groups(iter_seed_words(hsk_data, cache, hsk_level), partition, order)
+            for lesson, lesson_words in iter_lessons(groups, hsk_level, hsk_level, build_state):
+                writer.add_lesson(lesson)
+                for word in lesson_words:
+                    writer.add_word(word)
+                
+                if first_lesson_id is None:
+                    first_lesson_id, first_word_id = lesson["id"], lesson_words[0]["id"]
+                last_lesson_id, last_word_id = lesson["id"], lesson_words[-1]["id"]
+                if verbose:
+                    print(f"Bài {lesson['lessonIndex']}: {lesson['title']} - {len(lesson_words)} từ vựng")
+            
+            writer.write_section("questions", [])  # Có thể thêm sau
+        
+        changes = None
+        if build_state is not None:
+            changes = build_state.finish()
+            with open(changes_path(output_path), 'w', encoding='utf-8') as f:
+                json.dump({"hskLevel": hsk_level, "file": output_path.name, "reusedLessons": build_state.reused,
+                           **changes}, f, ensure_ascii=False, indent=2)
+    finally:
+        if build_state is not None:
+            build_state.close()
+    
+    return {
+        "words": writer.word_count,
+        "lessons": writer.lesson_count,
+        "wordIdRange": [first_word_id, last_word_id] if writer.word_count else None,
+        "lessonIdRange": [first_lesson_id, last_lesson_id] if writer.lesson_count else None,
+        "outputs": writer.outputs,
+        "unchanged": writer.unchanged,
+        "changes": changes,
     }
+
+
+def describe_changes(changes: Optional[Dict[str, List[int]]]) -> str:
+    """Tóm tắt các bài thay đổi để in ra"""
+    if changes is None:
+        return "build đầy đủ"
+    parts = [f"{len(changes[key])} {label}" for key, label in
+             (("changedLessons", "bài thay đổi"), ("addedLessons", "bài mới"), ("removedLessons", "bài bị xóa"))
+             if changes[key]]
+    return ", ".join(parts) if parts else "không bài nào thay đổi"
+
+
+def create_seed_data_json(output_file: str, hsk1_file: str = "hsk1.json", fmt: str = SEED_FORMAT,
+                          compress: Sequence[str] = (), partition: str = LESSON_PARTITION,
+                          order: str = LESSON_ORDER) -> Dict[str, Any]:
+    """
+    Tạo file seed data đầy đủ (ghi stream, xem write_seed_file)
+    """
+    print("=" * 50)
+    print("Chuyển đổi HSK1 JSON sang Seed Data")
+    print("=" * 50)
     
-    # Lưu vào file
-    print(f"\n4. Lưu vào file {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(seed_data, f, ensure_ascii=False, indent=2)
+    # Đọc từ vựng
+    print("\n1. Đọc từ vựng...")
+    cedict = open_cedict_store()  # None nếu chưa có CC-CEDICT
+    hsk1_data = load_hsk_items(hsk1_file, cedict)
+    if cedict is not None:
+        cedict.close()
+    print(f"Tổng số từ vựng: {len(hsk1_data)}")
+    print(f"Số từ vựng mỗi bài: {WORDS_PER_LESSON}")
+    print(f"Số bài học cần tạo: {check_level_size(HSK_LEVEL, len(hsk1_data), partition)} (chia bài: {partition}, thứ tự: {order})")
     
+    # Chuyển đổi, chia bài và ghi file cùng lúc
+    print(f"\n2. Chuyển đổi, chia bài học và lưu vào file {output_file} ({fmt})...")
+    print("-" * 50)
+    with open_translation_cache() as cache:
+        if cache.invalidated:
+            print("   TRANSLATION_DICT đã thay đổi, cache bản dịch được làm mới")
+        result = write_seed_file(output_file, hsk1_data, cache, HSK_LEVEL, fmt, compress, partition, order,
+                                 verbose=True)
+        print(f"   Cache bản dịch: {cache.status()}")
+    
+    changes = result["changes"]
     print("\n" + "=" * 50)
     print("Hoàn thành!")
-    print(f"   - Tổng số bài học: {len(lesson_data['lessons'])}")
-    print(f"   - Tổng số từ vựng: {len(words)}")
-    print(f"   - File output: {output_file}")
+    print(f"   - Tổng số bài học: {result['lessons']}")
+    print(f"   - Tổng số từ vựng: {result['words']}")
+    print(f"   - Thay đổi so với lần build trước: {describe_changes(changes)}")
+    if changes and changes["changedLessons"]:
+        print(f"     Lesson ID thay đổi: {', '.join(map(str, changes['changedLessons']))}")
+    for path in result["outputs"]:
+        state = " (không đổi)" if result["unchanged"] else ""
+        print(f"   - File output: {path} ({path.stat().st_size:,} bytes){state}")
     print("=" * 50)
     
-    return seed_data
+    return result
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def convert_level(hsk_level: int, input_file: str, output_file: str, fmt: str = SEED_FORMAT,
+                  compress: Sequence[str] = (), partition: str = LESSON_PARTITION,
+                  order: str = LESSON_ORDER) -> Dict[str, Any]:
+    """
+    Chuyển đổi một cấp độ và ghi file seed (chạy trong process riêng của pool)
+    
+    Mỗi process tự mở cache bản dịch và CC-CEDICT (kết nối SQLite không dùng chung giữa process).
+    Trả về thông tin của cấp độ cho manifest.
+    """
+    start_time = time.time()
+    cedict = open_cedict_store()
+    hsk_data = load_hsk_items(input_file, cedict)
+    if cedict is not None:
+        cedict.close()
+    
+    with open_translation_cache() as cache:
+        result = write_seed_file(output_file, hsk_data, cache, hsk_level, fmt, compress, partition, order)
+    
+    return {
+        "hskLevel": hsk_level,
+        "file": Path(output_file).name,
+        "courseId": hsk_level,
+        "words": result["words"],
+        "lessons": result["lessons"],
+        "wordIdRange": result["wordIdRange"],
+        "lessonIdRange": result["lessonIdRange"],
+        "sha1": _file_sha1(Path(output_file)),
+        "compressed": [path.name for path in result["outputs"][1:]],
+        "changes": result["changes"],
+        "seconds": round(time.time() - start_time, 2),
+    }
+
+
+def find_level_file(hsk_level: int, search_dirs: List[Path]) -> Optional[Path]:
+    """Tìm hsk{N}.json trong các thư mục (theo thứ tự ưu tiên)"""
+    for directory in search_dirs:
+        path = directory / f"hsk{hsk_level}.json"
+        if path.exists():
+            return path
+    return None
+
+
+def create_all_levels_seed_data(levels: List[int], search_dirs: List[Path], output_dir: Path,
+                                max_workers: Optional[int] = None, fmt: str = SEED_FORMAT,
+                                compress: Sequence[str] = (), partition: str = LESSON_PARTITION,
+                                order: str = LESSON_ORDER) -> Dict[str, Any]:
+    """
+    Chuyển đổi nhiều cấp độ song song (mỗi cấp một task trong process pool),
+    ghi file seed từng cấp và manifest tổng hợp
+    """
+    print("=" * 50)
+    print(f"Chuyển đổi HSK {', '.join(map(str, levels))} sang Seed Data")
+    print("=" * 50)
+    
+    tasks = []
+    for level in levels:
+        input_file = find_level_file(level, search_dirs)
+        if input_file is None:
+            print(f"   ⚠️  Bỏ qua HSK {level}: không tìm thấy hsk{level}.json")
+            continue
+        output_file = output_dir / f"seed-data-hsk{level}{seed_file_suffix(fmt)}"
+        tasks.append((level, str(input_file), str(output_file), fmt, tuple(compress), partition, order))
+    
+    if not tasks:
+        print("❌ Không có file HSK nào để chuyển đổi")
+        return {}
+    
+    # Build CC-CEDICT store và làm mới cache bản dịch (nếu dictionary đổi) một lần
+    # trước khi chia process, để các process không cùng build/xóa
+    cedict = open_cedict_store()
+    if cedict is not None:
+        cedict.close()
+    with open_translation_cache() as cache:
+        if cache.invalidated:
+            print("   TRANSLATION_DICT đã thay đổi, cache bản dịch được làm mới")
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    print(f"\n{len(tasks)} cấp độ, {workers} process")
+    
+    start_time = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_level, *task): task[0] for task in tasks}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"   ✅ HSK {result['hskLevel']}: {result['words']} từ, {result['lessons']} bài "
+                  f"-> {result['file']} ({result['seconds']}s, {describe_changes(result['changes'])})")
+    
+    results.sort(key=lambda r: r["hskLevel"])
+    manifest = {
+        "format": fmt,
+        "partition": partition,
+        "order": order,
+        "wordIdBlock": WORD_ID_BLOCK,
+        "lessonIdBlock": LESSON_ID_BLOCK,
+        "totalWords": sum(r["words"] for r in results),
+        "totalLessons": sum(r["lessons"] for r in results),
+        "levels": [{k: v for k, v in r.items() if k not in ("seconds", "changes")} for r in results],
+    }
+    manifest_path = output_dir / MANIFEST_FILE
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    print("\n" + "=" * 50)
+    print("Hoàn thành!")
+    print(f"   - Tổng số bài học: {manifest['totalLessons']}")
+    print(f"   - Tổng số từ vựng: {manifest['totalWords']}")
+    print(f"   - Manifest: {manifest_path}")
+    print(f"   - Thời gian: {time.time() - start_time:.2f}s")
+    print("=" * 50)
+    
+    return manifest
+
+
+def parse_levels(text: str) -> List[int]:
+    """ "1-6" -> [1..6], "1,3,5" -> [1, 3, 5] """
+    levels = []
+    for part in text.split(','):
+        part = part.strip()
+        if '-' in part:
+            first, last = part.split('-', 1)
+            levels.extend(range(int(first), int(last) + 1))
+        elif part:
+            levels.append(int(part))
+    return sorted(set(levels))
+
+
+def parse_output_options(args: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Tách --format=..., --gzip, --brotli, --partition=..., --order=... khỏi tham số:
+    (tham số còn lại, dict tùy chọn fmt/compress/partition/order)
+    """
+    rest = []
+    options = {"fmt": SEED_FORMAT, "compress": (), "partition": LESSON_PARTITION, "order": LESSON_ORDER}
+    for arg in args:
+        if arg.startswith("--format="):
+            options["fmt"] = arg.split("=", 1)[1]
+        elif arg == "--gzip":
+            options["compress"] += ("gzip",)
+        elif arg == "--brotli":
+            options["compress"] += ("brotli",)
+        elif arg.startswith("--partition="):
+            options["partition"] = arg.split("=", 1)[1]
+        elif arg.startswith("--order="):
+            options["order"] = arg.split("=", 1)[1]
+        else:
+            rest.append(arg)
+    return rest, options
 
 
 if __name__ == "__main__":
     import sys
     
+    args, options = parse_output_options(sys.argv[1:])
+    
+    # Nhiều cấp độ: python convert_hsk1_to_seed_data.py 1-6
+    if args:
+        script_dir = Path(__file__).parent
+        data_dir = script_dir.parent / "data"
+        create_all_levels_seed_data(parse_levels(args[0]), [script_dir, data_dir], data_dir, **options)
+        sys.exit(0)
+    
     # Đường dẫn file input và output
     hsk1_file = "hsk1.json"
-    output_file = "../data/seed-data-hsk1.json"
+    output_file = f"../data/seed-data-hsk1{seed_file_suffix(options['fmt'])}"
     
     # Kiểm tra file input
-    import os
     if not os.path.exists(hsk1_file):
         print(f"Lỗi: Không tìm thấy file {hsk1_file}")
         print("Vui lòng đặt file hsk1.json trong thư mục scripts/")
         sys.exit(1)
     
     # Tạo seed data
-    create_seed_data_json(output_file, hsk1_file)
+    create_seed_data_json(output_file, hsk1_file, **options)
@@ -0,0 +1,127 @@
+"""
+Dead-letter queue cho import_hsk_all_levels.py
+
+Mỗi từ import thất bại được ghi (append) vào file JSONL kèm status code,
+loại lỗi, latency và số lần thử. Khi từ đó import thành công ở lần sau,
+một dòng "resolved" được ghi thêm. Chế độ replay chỉ chạy lại các từ
+còn trong queue thay vì import lại toàn bộ.
+
+Format mỗi dòng:
+    {"character": "你好", "level": 1, "payload": {...}, "status_code": 503,
+     "error_class": "HTTP 503", "error": "...", "latency": 1.23,
+     "attempts": 2, "failed_at": 1700000000.0}
+    {"character": "你好", "resolved": true}
+"""
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff có jitter: base * 2^attempt * [0.5, 1.5), tối đa cap giây"""
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+class DeadLetterQueue:
+    """
+    Dead-letter queue lưu trên file JSONL (append-only, compact khi đóng)
+
+    Thread-safe: có thể gọi add()/resolve() từ các worker thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Dòng cuối có thể bị ghi dở khi bị ngắt
+                    if entry.get("resolved"):
+                        self._entries.pop(entry["character"], None)
+                    else:
+                        self._entries[entry["character"]] = entry
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, character: str) -> bool:
+        return character in self._entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _append(self, entry: Dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def add(self, payload: Dict, level: Optional[int], status_code: Optional[int],
+            error_class: str, error: str, latency: float):
+        """Ghi một lần thất bại (số lần thử cộng dồn theo character)"""
+        character = payload["character"]
+        with self._lock:
+            previous = self._entries.get(character)
+            entry = {
+                "character": character,
+                "level": level if level is not None else (previous or {}).get("level"),
+                "payload": payload,
+                "status_code": status_code,
+                "error_class": error_class,
+                "error": error,
+                "latency": round(latency, 3),
+                "attempts": (previous["attempts"] if previous else 0) + 1,
+                "failed_at": time.time(),
+            }
+            self._entries[character] = entry
+            self._append(entry)
+
+    def resolve(self, character: str):
+        """Đánh dấu character đã import thành công"""
+        with self._lock:
+            if self._entries.pop(character, None) is not None:
+                self._append({"character": character, "resolved": True})
+
+    def pending(self) -> List[Dict]:
+        """Các từ còn thất bại, theo thứ tự cấp độ"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return sorted(entries, key=lambda e: (e.get("level") or 0, e["character"]))
+
+    def summary(self) -> Dict[str, int]:
+        """Số từ theo loại lỗi"""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for entry in self._entries.values():
+                counts[entry["error_class"]] = counts.get(entry["error_class"], 0) + 1
+        return counts
+
+    def compact(self):
+        """Ghi lại file chỉ với các từ còn thất bại (bỏ lịch sử và dòng resolved)"""
+        with self._lock:
+            self._file.close()
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            tmp_path.replace(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        self.compact()
+        self._file.close()
@@ -1,19 +1,80 @@
 """
 Script để chia từ vựng HSK thành các bài học nhỏ
 Mỗi bài học sẽ có 10-15 từ vựng
+
+Cách sử dụng:
+python divide_vocabulary_into_lessons.py <file .json/.xlsx> [course_id] [--sheet=Tên sheet]
+       [--partition=sequential|balanced|cluster] [--order=file|dependencies]
+
+File Excel được đọc kiểu stream (xem vocabulary_reader.py).
 """
 
+import itertools
 import json
-import math
+import sys
+
+from lesson_dependencies import order_lessons
+from lesson_partitioner import partition_words
+from lesson_renderer import get_lesson_renderer
+from vocabulary_reader import iter_vocabulary
+
+def lesson_batches(words, partition="sequential", words_per_lesson=12, min_words=10, max_words=15,
+                   order="file"):
+    """
+    Chia từ vựng thành các bài, trả về từng cặp (từ của bài, lessonIndex của bài tiên quyết)
+    
+    Chỉ partition "sequential" + order "file" cắt dần từ generator words thành từng nhóm
+    words_per_lesson từ (stream, chỉ giữ một bài trong bộ nhớ). "balanced", "cluster" và
+    order "dependencies" cần toàn bộ danh sách từ vựng.
+    """
+    if partition == "sequential" and order == "file":
+        words = iter(words)
+        index = 0
+        while True:
+            batch = list(itertools.islice(words, words_per_lesson))
+            if not batch:
+                return
+            yield batch, index if index else None
+            index += 1
+    
+    batches = partition_words(list(words), partition, words_per_lesson, min_words, max_words)
+    if order == "dependencies":
+        batches, prerequisites = order_lessons(batches)
+    else:
+        prerequisites = [index if index else None for index in range(len(batches))]
+    yield from zip(batches, prerequisites)
+
+
+def _indent_json(value, indent):
+    """JSON của value thụt lề như phần tử lồng trong json.dump(..., indent=2)"""
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + " " * indent)
+
 
-def divide_vocabulary_into_lessons(vocabulary_file, course_id, words_per_lesson=12):
+def divide_vocabulary_into_lessons(vocabulary_file, course_id, words_per_lesson=12,
+                                   partition="sequential", min_words=10, max_words=15, order="file",
+                                   sheet=None, columns=None):
     """
-    Chia từ vựng từ file Excel hoặc JSON thành các bài học
+    Chia từ vựng từ file Excel hoặc JSON thành các bài học, ghi vào lessons_course_{course_id}.json
+    
+    Mỗi bài được render và ghi ra file ngay khi chia xong. Với partition "sequential" và
+    order "file" (mặc định) từ vựng được đọc kiểu stream nên bộ nhớ chỉ phụ thuộc một bài;
+    "balanced", "cluster" và order "dependencies" cần đọc toàn bộ từ vựng trước khi chia.
     
     Args:
         vocabulary_file: Đường dẫn đến file chứa từ vựng (JSON hoặc Excel)
         course_id: ID của khóa học
         words_per_lesson: Số từ vựng mỗi bài học (mặc định 12)
+        partition: "sequential" (cắt theo thứ tự file), "balanced" (cân bằng độ khó các bài)
+                   hoặc "cluster" (gom từ cùng chữ Hán / bộ thủ)
+        min_words, max_words: Giới hạn số từ mỗi bài khi partition khác "sequential"
+        order: "file" (giữ thứ tự chia bài, bài trước là bài tiên quyết, mặc định)
+               hoặc "dependencies" (bài chứa chữ thành phần học trước, xem lesson_dependencies.py)
+        sheet: Tên sheet Excel (mặc định sheet đang chọn)
+        columns: Tên cột Excel cho từng trường nếu khác tên mặc định,
+                 VD: {"meaning": "Nghĩa tiếng Việt"} (xem vocabulary_reader.COLUMN_ALIASES)
+    
+    Returns:
+        summary của file đã ghi (totalWords, totalLessons, ...)
     """
     
     # Đọc từ vựng từ file
@@ -28,129 +89,101 @@ def divide_vocabulary_into_lessons(vocabulary_file, course_id, words_per_lesson=
     #   },
     #   ...
     # ]
+    # Excel: dòng tiêu đề có các cột "Chữ Hán", "Pinyin", "Nghĩa", "HSK"... mỗi dòng một từ
     
-    with open(vocabulary_file, 'r', encoding='utf-8') as f:
-        words = json.load(f)
-    
-    # Tính số bài học cần thiết
-    total_words = len(words)
-    num_lessons = math.ceil(total_words / words_per_lesson)
+    words = iter_vocabulary(vocabulary_file, sheet, columns)
     
-    print(f"Tổng số từ vựng: {total_words}")
-    print(f"Số từ vựng mỗi bài: {words_per_lesson}")
-    print(f"Số bài học cần tạo: {num_lessons}")
+    print(f"Số từ vựng mỗi bài: {words_per_lesson} (chia bài: {partition}, thứ tự: {order})")
     print("-" * 50)
     
-    lessons = []
     lesson_index = 1
+    word_id = 1
+    renderer = get_lesson_renderer()
+    output_file = f"lessons_course_{course_id}.json"
     
-    # Chia từ vựng thành các bài học
-    for i in range(0, total_words, words_per_lesson):
-        lesson_words = words[i:i + words_per_lesson]
-        
-        # Tạo lesson
-        lesson = {
-            "courseId": course_id,
-            "title": f"Bài {lesson_index}: {generate_lesson_title(lesson_words)}",
-            "description": f"Học {len(lesson_words)} từ vựng HSK cơ bản",
-            "lessonIndex": lesson_index,
-            "content": generate_lesson_content(lesson_words),
-            "isLocked": lesson_index > 1,  # Bài đầu tiên mở, các bài sau khóa
-            "prerequisiteLessonId": lesson_index - 1 if lesson_index > 1 else None,
-            "isActive": True,
-            "words": []
-        }
+    # Ghi cùng format với json.dump(output, indent=2): {"lessons": [...], "summary": {...}}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('{\n  "lessons": [')
         
-        # Thêm từ vựng vào lesson
-        word_id = (lesson_index - 1) * words_per_lesson + 1
-        for word in lesson_words:
-            lesson_word = {
-                "id": word_id,
-                "lessonId": lesson_index,  # Sẽ được cập nhật sau khi tạo lesson
-                "character": word.get("character", ""),
-                "pinyin": word.get("pinyin", ""),
-                "meaning": word.get("meaning", ""),
-                "audioUrl": word.get("audioUrl"),
-                "exampleSentence": word.get("exampleSentence"),
-                "hskLevel": word.get("hskLevel"),
-                "frequency": word.get("frequency"),
-                "strokeCount": word.get("strokeCount")
+        # Chia từ vựng thành các bài học (xem lesson_partitioner.py)
+        for lesson_words, prerequisite in lesson_batches(words, partition, words_per_lesson,
+                                                         min_words, max_words, order):
+            # Tạo lesson
+            lesson = {
+                "courseId": course_id,
+                "title": renderer.title(lesson_index, lesson_words),
+                "description": f"Học {len(lesson_words)} từ vựng HSK cơ bản",
+                "lessonIndex": lesson_index,
+                "content": renderer.content(lesson_words),
+                "isLocked": lesson_index > 1,  # Bài đầu tiên mở, các bài sau khóa
+                "prerequisiteLessonId": prerequisite,
+                "isActive": True,
+                "words": []
             }
-            lesson["words"].append(lesson_word)
-            word_id += 1
-        
-        lessons.append(lesson)
-        lesson_index += 1
+            
+            # Thêm từ vựng vào lesson
+            for word in lesson_words:
+                lesson_word = {
+                    "id": word_id,
+                    "lessonId": lesson_index,  # Sẽ được cập nhật sau khi tạo lesson
+                    "character": word.get("character", ""),
+                    "pinyin": word.get("pinyin", ""),
+                    "meaning": word.get("meaning", ""),
+                    "audioUrl": word.get("audioUrl"),
+                    "exampleSentence": word.get("exampleSentence"),
+                    "hskLevel": word.get("hskLevel"),
+                    "frequency": word.get("frequency"),
+                    "strokeCount": word.get("strokeCount")
+                }
+                lesson["words"].append(lesson_word)
+                word_id += 1
+            
+            f.write((",\n    " if lesson_index > 1 else "\n    ") + _indent_json(lesson, 4))
+            print(f"Bài {lesson['lessonIndex']}: {lesson['title']} - {len(lesson['words'])} từ vựng")
+            lesson_index += 1
         
-        print(f"Bài {lesson['lessonIndex']}: {lesson['title']} - {len(lesson['words'])} từ vựng")
-    
-    # Tạo output JSON
-    output = {
-        "lessons": lessons,
-        "summary": {
-            "totalWords": total_words,
+        num_lessons = lesson_index - 1
+        summary = {
+            "totalWords": word_id - 1,
             "totalLessons": num_lessons,
             "wordsPerLesson": words_per_lesson,
+            "partition": partition,
+            "order": order,
             "courseId": course_id
         }
-    }
-    
-    # Lưu vào file
-    output_file = f"lessons_course_{course_id}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+        f.write("\n  ]" if num_lessons else "]")
+        f.write(',\n  "summary": ' + _indent_json(summary, 2) + "\n}")
     
     print("-" * 50)
+    print(f"Tổng số từ vựng: {summary['totalWords']}")
     print(f"Đã tạo {num_lessons} bài học và lưu vào {output_file}")
     
-    return output
+    return summary
 
 
 def generate_lesson_title(words):
     """Tạo tiêu đề bài học dựa trên các từ vựng đầu tiên"""
-    if not words:
-        return "Từ vựng cơ bản"
-    
-    # Lấy 2-3 từ đầu tiên làm tiêu đề
-    first_words = words[:3]
-    titles = []
-    for word in first_words:
-        char = word.get("character", "")
-        if char:
-            titles.append(char)
-    
-    if len(titles) >= 2:
-        return f"{titles[0]}, {titles[1]} và các từ liên quan"
-    elif len(titles) == 1:
-        return f"{titles[0]} và các từ cơ bản"
-    else:
-        return "Từ vựng cơ bản"
+    return get_lesson_renderer().topic(words)
 
 
 def generate_lesson_content(words):
     """Tạo nội dung HTML cho bài học"""
-    content = f"<h2>Học {len(words)} từ vựng</h2>\n"
-    content += "<p>Trong bài học này, bạn sẽ học các từ vựng sau:</p>\n"
-    content += "<ul>\n"
-    
-    for word in words:
-        char = word.get("character", "")
-        pinyin = word.get("pinyin", "")
-        meaning = word.get("meaning", "")
-        content += f"<li><strong>{char}</strong> ({pinyin}) - {meaning}</li>\n"
-    
-    content += "</ul>"
-    return content
+    return get_lesson_renderer().content(words)
 
 
 if __name__ == "__main__":
-    # Ví dụ sử dụng
-    # vocabulary_file = "hsk1_vocabulary.json"
-    # course_id = 1
-    # divide_vocabulary_into_lessons(vocabulary_file, course_id, words_per_lesson=12)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+    if args:
+        divide_vocabulary_into_lessons(args[0], int(args[1]) if len(args) > 1 else 1,
+                                       partition=options.get("partition", "sequential"),
+                                       order=options.get("order", "file"),
+                                       sheet=options.get("sheet"))
+        sys.exit(0)
     
     print("Script chia từ vựng thành bài học")
-    print("Sử dụng: python divide_vocabulary_into_lessons.py")
+    print("Sử dụng: python divide_vocabulary_into_lessons.py <file .json/.xlsx> [course_id] "
+          "[--sheet=...] [--partition=...] [--order=...]")
     print("\nVí dụ input JSON:")
     print("""
     [
@@ -7,9 +7,22 @@ Nguồn dữ liệu:
 3. CC-CEDICT (Chinese-English dictionary)
 
 Cách sử dụng:
-python download_hsk_data.py
+python download_hsk_data.py                                  # Chọn nguồn
+python download_hsk_data.py github_aldrian [--workers=6] [--force]
+
+Các file được tải song song vào mirror local (Backend/data): bytes tải về được kiểm tra
+(JSON danh sách từ) và ghi nguyên vẹn một lần. ETag / Last-Modified của mỗi file lưu trong
+download-manifest.json, lần chạy sau gửi request có điều kiện (If-None-Match /
+If-Modified-Since): file không đổi nhận 304 và không tải lại. --force bỏ qua mirror.
 """
 
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Optional
+
 import requests
 import json
 from pathlib import Path
@@ -43,39 +56,115 @@ HSK_DATA_SOURCES = {
     }
 }
 
-def download_file(url: str, save_path: Path) -> bool:
-    """Download file từ URL"""
+# Tên không khớp glob("hsk*.json") của các script đọc từ vựng (frequency_index.py, audio_cache_builder.py...)
+MIRROR_MANIFEST_FILE = "download-manifest.json"
+_LEGACY_MANIFEST_FILE = "hsk-download-manifest.json"  # Tên cũ, được đổi sang MIRROR_MANIFEST_FILE
+DEFAULT_WORKERS = 6
+
+_local = threading.local()  # Mỗi luồng một requests.Session (giữ kết nối)
+
+
+def _session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+def load_mirror_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Manifest mirror: tên file -> url, etag, lastModified, bytes, sha1, items, downloadSeconds"""
+    path = output_dir / MIRROR_MANIFEST_FILE
+    legacy_path = output_dir / _LEGACY_MANIFEST_FILE
+    if legacy_path.exists() and not path.exists():
+        os.replace(legacy_path, path)
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("files", {})
+        except (OSError, json.JSONDecodeError):
+            pass  # Manifest hỏng: tải lại toàn bộ
+    return {}
+
+
+def save_mirror_manifest(output_dir: Path, entries: Dict[str, Any]):
+    path = output_dir / MIRROR_MANIFEST_FILE
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"files": dict(sorted(entries.items()))}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _mirror_is_valid(save_path: Path, entry: Optional[Dict[str, Any]]) -> bool:
+    """File trong mirror còn nguyên (cùng kích thước với lần tải trước)"""
+    return bool(entry) and save_path.exists() and save_path.stat().st_size == entry.get("bytes")
+
+
+def download_file(url: str, save_path: Path, entry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Download file từ URL vào mirror
+    
+    entry: thông tin lần tải trước trong manifest mirror (None = tải mới). Nếu file mirror còn
+    nguyên thì gửi If-None-Match / If-Modified-Since, server trả 304 thì giữ file cũ.
+    Trả về entry mới kèm "status": downloaded / not_modified / error
+    """
+    headers = {}
+    if _mirror_is_valid(save_path, entry):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+    
+    start = time.perf_counter()
     try:
-        print(f"  📥 Downloading: {url}")
-        response = requests.get(url, timeout=30)
+        response = _session().get(url, headers=headers, timeout=30)
+        if response.status_code == 304 and headers:
+            return {**entry, "status": "not_modified", "elapsed": time.perf_counter() - start}
         response.raise_for_status()
+        content = response.content
+        elapsed = time.perf_counter() - start
         
-        # Kiểm tra content
-        data = response.json()
+        # Kiểm tra content: parse một lần trên bytes tải về, đếm số từ, ghi nguyên bytes
+        data = json.loads(content)
+        if not isinstance(data, list):
+            raise ValueError(f"không phải danh sách từ ({type(data).__name__})")
         
-        # Lưu file
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        print(f"  ✅ Saved to: {save_path} ({len(data)} items)")
-        return True
+        tmp_path = save_path.with_name(save_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, save_path)
         
+        return {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+            "bytes": len(content),
+            "sha1": hashlib.sha1(content).hexdigest(),
+            "items": len(data),
+            "downloadSeconds": round(elapsed, 3),
+            "status": "downloaded",
+            "elapsed": elapsed,
+        }
+    
     except requests.exceptions.RequestException as e:
-        print(f"  ❌ Download error: {e}")
-        return False
-    except json.JSONDecodeError as e:
-        print(f"  ❌ JSON parse error: {e}")
-        return False
-    except Exception as e:
-        print(f"  ❌ Unknown error: {e}")
-        return False
-
-def download_hsk_data(output_dir: Path, source_name: str = "github_aldrian"):
-    """Download toàn bộ dữ liệu HSK từ một nguồn"""
+        return {"status": "error", "error": f"Download error: {e}"}
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return {"status": "error", "error": f"JSON parse error: {e}"}
+    except (ValueError, OSError) as e:
+        return {"status": "error", "error": str(e)}
+
+def download_hsk_data(output_dir: Path, source_name: str = "github_aldrian",
+                      workers: int = DEFAULT_WORKERS, force: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Download toàn bộ dữ liệu HSK từ một nguồn (song song, request có điều kiện theo mirror)
+    
+    force: bỏ qua ETag / Last-Modified đã lưu, tải lại mọi file
+    Trả về thống kê: số file đã tải / không đổi / lỗi, số từ, bytes đã tải và tiết kiệm
+    """
     if source_name not in HSK_DATA_SOURCES:
         print(f"❌ Nguồn không hợp lệ: {source_name}")
         print(f"Các nguồn có sẵn: {', '.join(HSK_DATA_SOURCES.keys())}")
-        return
+        return None
     
     source = HSK_DATA_SOURCES[source_name]
     print(f"\n{'='*60}")
@@ -83,33 +172,67 @@ def download_hsk_data(output_dir: Path, source_name: str = "github_aldrian"):
     print(f"{'='*60}\n")
     
     output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_mirror_manifest(output_dir)
     
-    success_count = 0
-    total_words = 0
-    
+    tasks = {}
     for level, filename in source["files"].items():
         url = f"{source['base_url']}/{filename}"
         save_path = output_dir / f"hsk{level}.json"
+        entry = manifest.get(save_path.name)
+        # Mirror tải từ nguồn khác (URL khác) không dùng cho request có điều kiện
+        if force or (entry and entry.get("url") != url):
+            entry = None
+        tasks[level] = (url, save_path, entry)
+    
+    workers = max(1, min(workers, len(tasks)))
+    start = time.perf_counter()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(download_file, *task): level for level, task in tasks.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    elapsed = time.perf_counter() - start
+    
+    stats = {"downloaded": 0, "notModified": 0, "failed": 0, "totalWords": 0,
+             "bytesDownloaded": 0, "bytesSaved": 0, "secondsSaved": 0.0, "elapsed": elapsed}
+    for level in sorted(results):
+        url, save_path, _ = tasks[level]
+        result = results[level]
+        status = result.pop("status")
+        request_elapsed = result.pop("elapsed", 0.0)
+        print(f"HSK {level}: {url}")
+        if status == "error":
+            stats["failed"] += 1
+            print(f"  ❌ {result['error']}")
+            continue
         
-        print(f"HSK {level}:")
-        if download_file(url, save_path):
-            success_count += 1
-            # Đếm số từ
-            try:
-                with open(save_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    total_words += len(data)
-            except:
-                pass
-        print()
+        manifest[save_path.name] = result
+        stats["totalWords"] += result["items"]
+        if status == "not_modified":
+            # Thời gian tiết kiệm: thời gian tải lần trước trừ thời gian request 304
+            stats["notModified"] += 1
+            stats["bytesSaved"] += result["bytes"]
+            stats["secondsSaved"] += max(0.0, result.get("downloadSeconds", 0.0) - request_elapsed)
+            print(f"  ♻️  Không đổi (304), dùng bản mirror: {save_path} ({result['items']} items)")
+        else:
+            stats["downloaded"] += 1
+            stats["bytesDownloaded"] += result["bytes"]
+            print(f"  ✅ Saved to: {save_path} ({result['items']} items, {result['bytes']:,} bytes)")
+    
+    save_mirror_manifest(output_dir, manifest)
     
     print(f"\n{'='*60}")
     print(f"📊 SUMMARY")
     print(f"{'='*60}")
-    print(f"✅ Downloaded: {success_count}/{len(source['files'])} files")
-    print(f"📝 Total words: {total_words}")
+    print(f"✅ Downloaded: {stats['downloaded']}/{len(tasks)} files, không đổi: {stats['notModified']}, "
+          f"lỗi: {stats['failed']}")
+    print(f"📝 Total words: {stats['totalWords']}")
+    print(f"📦 Đã tải: {stats['bytesDownloaded']:,} bytes, tiết kiệm: {stats['bytesSaved']:,} bytes "
+          f"(~{stats['secondsSaved']:.2f}s)")
+    print(f"⏱️  Thời gian: {elapsed:.2f}s ({workers} luồng)")
     print(f"📂 Output directory: {output_dir}")
     print()
+    return stats
 
 
 def main():
@@ -117,25 +240,37 @@ def main():
     script_dir = Path(__file__).parent
     output_dir = script_dir.parent / "data"
     
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    workers = DEFAULT_WORKERS
+    for arg in sys.argv[1:]:
+        if arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+    force = "--force" in sys.argv[1:]
+    
     print("="*60)
     print("HSK DATA DOWNLOADER")
     print("="*60)
     print()
-    print("Chọn nguồn dữ liệu:")
-    print("1. aldrian/hsk-vocabulary (GitHub) - ĐỀ XUẤT")
-    print("2. clem109/hsk-vocabulary (GitHub)")
     
-    choice = input("\nNhập lựa chọn (1-2): ").strip()
-    
-    if choice == "1":
-        source_name = "github_aldrian"
-    elif choice == "2":
-        source_name = "github_clem109"
+    if args:
+        source_name = args[0]
     else:
-        print("❌ Lựa chọn không hợp lệ")
-        sys.exit(1)
+        print("Chọn nguồn dữ liệu:")
+        print("1. aldrian/hsk-vocabulary (GitHub) - ĐỀ XUẤT")
+        print("2. clem109/hsk-vocabulary (GitHub)")
+        
+        choice = input("\nNhập lựa chọn (1-2): ").strip()
+        
+        if choice == "1":
+            source_name = "github_aldrian"
+        elif choice == "2":
+            source_name = "github_clem109"
+        else:
+            print("❌ Lựa chọn không hợp lệ")
+            sys.exit(1)
     
-    download_hsk_data(output_dir, source_name)
+    if download_hsk_data(output_dir, source_name, workers, force) is None:
+        sys.exit(1)
     
     print("\n✅ HOÀN TẤT!")
     print("\nBước tiếp theo:")
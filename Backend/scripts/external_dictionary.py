@@ -0,0 +1,302 @@
+"""
+Dictionary Anh -> Việt lưu ngoài file (sorted, memory-mapped) cho translation_dict.py
+
+TRANSLATION_DICT chỉ chứa vài trăm mục viết tay. Dictionary lớn (100k+ mục,
+VD: gloss của CC-CEDICT đã dịch) được build thành một file nhị phân đã sắp xếp
+và chỉ được mmap khi tra lần đầu, nên `import translation_dict` vẫn tức thì và
+bộ nhớ chỉ gồm các trang file đang được OS cache.
+
+Format file:
+    header   : magic b"HSKDICT1", uint32 số mục, uint32 số token của key dài nhất,
+               20 byte sha1 của phần data (dùng làm version)
+    offsets  : uint32 x số mục, vị trí bắt đầu của từng record trong phần data
+    data     : các record "key\\tvalue\\n" (UTF-8), sắp xếp theo key (byte)
+
+Key được chuẩn hóa như token trong translation_dict (lowercase, bỏ dấu câu,
+gộp khoảng trắng). Tra một key: bisect trên sparse index trong RAM (1/32 số key)
+rồi binary search trong khối 32 mục trên mmap; kết quả tra gần đây được cache.
+
+Cách sử dụng:
+    python external_dictionary.py build dictionary.tsv ../data/translation_dict.bin
+    python external_dictionary.py bench ../data/translation_dict.bin
+
+File nguồn: TSV (english<TAB>vietnamese mỗi dòng) hoặc JSON object {english: vietnamese}.
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import random
+import struct
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"HSKDICT1"
+_HEADER = struct.Struct("<8sII20s")
+_OFFSET = struct.Struct("<I")
+
+# Giữ trong RAM key của mỗi _SPARSE_STEP mục (sparse index) để thu hẹp binary search trên mmap
+_SPARSE_STEP = 32
+
+# Dấu câu bỏ đi khi chuẩn hóa key (giống _MATCH_STRIP_CHARS trong translation_dict.py)
+_STRIP_CHARS = '.,!?;:()"'
+
+
+def normalize_key(text: str) -> str:
+    """Chuẩn hóa key: lowercase, bỏ dấu câu ở đầu/cuối mỗi token, gộp khoảng trắng"""
+    tokens = []
+    for raw in text.split():
+        token = raw.strip(_STRIP_CHARS).lower()
+        if token:
+            tokens.append(token)
+    return " ".join(tokens)
+
+
+def build_dictionary_file(entries: Iterable[Tuple[str, str]], output_path: Path) -> int:
+    """
+    Build file dictionary từ các cặp (english, vietnamese), trả về số mục
+
+    Key trùng sau khi chuẩn hóa thì giữ mục đầu tiên.
+    """
+    records: Dict[bytes, bytes] = {}
+    max_tokens = 0
+    for english, vietnamese in entries:
+        key = normalize_key(english)
+        value = " ".join(vietnamese.split())
+        if not key or not value:
+            continue
+        key_bytes = key.encode("utf-8")
+        if key_bytes not in records:
+            records[key_bytes] = value.encode("utf-8")
+            max_tokens = max(max_tokens, key.count(" ") + 1)
+
+    offsets = []
+    data = bytearray()
+    for key_bytes in sorted(records):
+        offsets.append(len(data))
+        data += key_bytes + b"\t" + records[key_bytes] + b"\n"
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(offsets), max_tokens, hashlib.sha1(data).digest()))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(data)
+    tmp_path.replace(output_path)
+    return len(offsets)
+
+
+def read_source_file(path: Path) -> Iterator[Tuple[str, str]]:
+    """Đọc file nguồn TSV hoặc JSON object, trả về các cặp (english, vietnamese)"""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f).items()
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or "\t" not in line:
+                continue
+            english, vietnamese = line.rstrip("\n").split("\t", 1)
+            yield english, vietnamese
+
+
+class ExternalDictionary:
+    """
+    Dictionary read-only trên file đã sắp xếp, mmap khi tra lần đầu
+
+    Thread-safe: sau khi mở chỉ có thao tác đọc trên mmap.
+    """
+
+    def __init__(self, path: Path, cache_size: int = 65536):
+        self.path = Path(path)
+        # Cache kết quả tra (kể cả key không có), giới hạn cache_size key
+        self.get_normalized = lru_cache(maxsize=cache_size)(self._get_normalized)
+        self._lock = threading.Lock()
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        # Bảng offsets dạng uint32[] trỏ thẳng vào mmap (không copy, byte order của máy - file ghi little-endian)
+        self._offsets: Optional[memoryview] = None
+        self._sparse_keys: List[bytes] = []
+        self._count = 0
+        self._max_phrase_length = 0
+        self._version = ""
+        self._offsets_start = _HEADER.size
+        self._data_start = _HEADER.size
+
+    # ============ OPEN ============
+
+    def _open(self) -> mmap.mmap:
+        with self._lock:
+            if self._mm is None:
+                self._file = open(self.path, "rb")
+                mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, count, max_tokens, digest = _HEADER.unpack_from(mm, 0)
+                if magic != MAGIC:
+                    mm.close()
+                    self._file.close()
+                    raise ValueError(f"{self.path} không phải file dictionary ({magic!r})")
+                self._count = count
+                self._max_phrase_length = max_tokens
+                self._version = digest.hex()
+                self._data_start = self._offsets_start + count * _OFFSET.size
+                self._offsets = memoryview(mm)[self._offsets_start:self._data_start].cast("I")
+                self._mm = mm
+                self._sparse_keys = [self._key_at(mm, i) for i in range(0, count, _SPARSE_STEP)]
+        return self._mm
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._offsets.release()
+                self._offsets = None
+                self._mm.close()
+                self._file.close()
+                self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        self._open()
+        return self._count
+
+    @property
+    def max_phrase_length(self) -> int:
+        """Số token của key dài nhất"""
+        self._open()
+        return self._max_phrase_length
+
+    @property
+    def version(self) -> str:
+        """sha1 của phần data, đổi khi nội dung dictionary đổi"""
+        self._open()
+        return self._version
+
+    # ============ LOOKUP ============
+
+    def _record_start(self, mm: mmap.mmap, index: int) -> int:
+        return self._data_start + self._offsets[index]
+
+    def _key_at(self, mm: mmap.mmap, index: int) -> bytes:
+        start = self._record_start(mm, index)
+        return mm[start:mm.find(b"\t", start)]
+
+    def _bisect_left(self, mm: mmap.mmap, key: bytes) -> int:
+        offsets = self._offsets
+        data_start = self._data_start
+        find = mm.find
+        # Khối chứa key: sparse_keys[block - 1] < key <= sparse_keys[block]
+        block = bisect.bisect_left(self._sparse_keys, key)
+        low = max(0, (block - 1) * _SPARSE_STEP)
+        high = min(self._count, block * _SPARSE_STEP)
+        while low < high:
+            mid = (low + high) // 2
+            start = data_start + offsets[mid]
+            if mm[start:find(b"\t", start)] < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _record_at(self, mm: mmap.mmap, index: int) -> Tuple[str, str]:
+        start = self._record_start(mm, index)
+        record = mm[start:mm.find(b"\n", start)].decode("utf-8")
+        key, value = record.split("\t", 1)
+        return key, value
+
+    def _get_normalized(self, key: str) -> Optional[str]:
+        """Tra key đã chuẩn hóa (normalize_key), None nếu không có"""
+        mm = self._mm or self._open()
+        key_bytes = key.encode("utf-8")
+        index = self._bisect_left(mm, key_bytes)
+        if index < self._count:
+            start = self._record_start(mm, index)
+            tab = mm.find(b"\t", start)
+            if mm[start:tab] == key_bytes:
+                return mm[tab + 1:mm.find(b"\n", tab)].decode("utf-8")
+        return None
+
+    def get(self, english: str, default: Optional[str] = None) -> Optional[str]:
+        """Tra một cụm tiếng Anh (chưa chuẩn hóa)"""
+        value = self.get_normalized(normalize_key(english))
+        return default if value is None else value
+
+    def __contains__(self, english: str) -> bool:
+        return self.get(english) is not None
+
+    def prefix(self, prefix: str, limit: int = 20) -> List[Tuple[str, str]]:
+        """Các mục có key bắt đầu bằng prefix (theo thứ tự key), tối đa limit mục"""
+        mm = self._mm or self._open()
+        prefix_bytes = normalize_key(prefix).encode("utf-8")
+        results = []
+        index = self._bisect_left(mm, prefix_bytes)
+        while index < self._count and len(results) < limit:
+            if not self._key_at(mm, index).startswith(prefix_bytes):
+                break
+            results.append(self._record_at(mm, index))
+            index += 1
+        return results
+
+
+def benchmark(path: Path, lookups: int = 100000):
+    """Đo thời gian mở và tra ngẫu nhiên (một nửa key có, một nửa không có)"""
+    start = time.perf_counter()
+    dictionary = ExternalDictionary(path)
+    size = len(dictionary)
+    print(f"  Mở file: {(time.perf_counter() - start) * 1000:.2f}ms - {size:,} mục, "
+          f"key dài nhất {dictionary.max_phrase_length} token")
+
+    mm = dictionary._open()
+    sample = [dictionary._record_at(mm, random.randrange(size))[0] for _ in range(lookups // 2)]
+    sample += [key + " zzz" for key in sample]
+    random.shuffle(sample)
+
+    start = time.perf_counter()
+    found = sum(1 for key in sample if dictionary.get_normalized(key) is not None)
+    elapsed = time.perf_counter() - start
+    print(f"  {len(sample):,} lần tra: {elapsed:.3f}s - {elapsed / len(sample) * 1e6:.2f}µs/lần ({found:,} có)")
+
+    # Nghĩa HSK lặp lại nhiều: tra lại một tập key nóng (nằm trong cache)
+    hot = sample[:10000] * 10
+    start = time.perf_counter()
+    for key in hot:
+        dictionary.get_normalized(key)
+    elapsed = time.perf_counter() - start
+    print(f"  Tra lại 10,000 key nóng (đã cache): {elapsed / len(hot) * 1e6:.2f}µs/lần")
+
+    start = time.perf_counter()
+    matches = dictionary.prefix(sample[0].split()[0], limit=1000)
+    print(f"  Prefix '{sample[0].split()[0]}': {len(matches)} mục trong "
+          f"{(time.perf_counter() - start) * 1000:.2f}ms")
+    dictionary.close()
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == "build":
+        output_path = Path(sys.argv[3])
+        start = time.time()
+        count = build_dictionary_file(read_source_file(Path(sys.argv[2])), output_path)
+        print(f"✅ Đã build {count:,} mục vào {output_path} "
+              f"({output_path.stat().st_size / 1024:.0f} KB, {time.time() - start:.2f}s)")
+    elif len(sys.argv) >= 3 and sys.argv[1] == "bench":
+        benchmark(Path(sys.argv[2]))
+    else:
+        print("Cách sử dụng:")
+        print("  python external_dictionary.py build <nguồn.tsv|nguồn.json> <output.bin>")
+        print("  python external_dictionary.py bench <output.bin>")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
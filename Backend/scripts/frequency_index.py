@@ -0,0 +1,316 @@
+"""
+Chỉ số tần suất từ HSK dựa trên corpus (thay cho estimate_frequency theo vị trí trong file)
+
+Đọc stream các file corpus (văn bản, phụ đề .srt) hoặc danh sách tần suất
+("từ<TAB>số lần[<TAB>cột số khác...]" mỗi dòng, VD: SUBTLEX-CH), tách từ bằng
+longest match (forward maximum matching) trên từ vựng HSK và đếm số lần xuất
+hiện trong một lượt đọc. Kết quả lưu trong SQLite kèm bảng rank để tra O(1).
+
+Mỗi file được xác định một lần là danh sách tần suất hay văn bản: danh sách tần
+suất khi mọi dòng có chữ Hán trong FREQUENCY_SNIFF_LINES dòng đầu đều có dạng
+"từ số lần" (dòng tiêu đề không có chữ Hán được bỏ qua). Văn bản thường như
+"我 2008 年去北京" vì vậy không bị đọc thành 我 x 2008.
+
+Build tăng dần: số đếm được lưu theo từng file, file corpus đã đếm (cùng
+kích thước + mtime) được bỏ qua, chỉ file mới hoặc đã sửa được đếm (lại),
+số đếm của file không còn trong danh sách corpus bị xóa. Khi từ vựng HSK thay
+đổi, toàn bộ số đếm cũ bị xóa.
+
+Cách sử dụng:
+    python frequency_index.py corpus/ subtitles.srt SUBTLEX-CH-WF.txt
+
+    ranks = get_frequency_ranks()
+    if ranks is not None:
+        ranks.frequency("你好")  # 10-100, cao hơn = phổ biến hơn
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+DEFAULT_INDEX_FILE = DATA_DIR / "frequency_index.db"
+
+CORPUS_EXTENSIONS = (".txt", ".srt", ".ass", ".tsv", ".csv")
+_HAN_RUN_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]+")
+# Dòng danh sách tần suất: từ, số lần, có thể thêm các cột số (SUBTLEX-CH: W/million, logW, CD...)
+_FREQUENCY_LINE_RE = re.compile(
+    r"^\s*([\u3400-\u9fff\uf900-\ufaff]+)[\t ,]+(\d+)(?:[\t ,]+[\d.]+%?)*\s*$"
+)
+FREQUENCY_SNIFF_LINES = 20  # Số dòng có chữ Hán đầu file dùng để xác định danh sách tần suất
+
+
+def load_vocabulary(search_dirs: List[Path]) -> Set[str]:
+    """Từ vựng (chữ giản thể) của mọi file hsk*.json trong các thư mục"""
+    vocabulary = set()
+    for directory in search_dirs:
+        for path in sorted(Path(directory).glob("hsk*.json")):
+            with open(path, "r", encoding="utf-8") as f:
+                for item in json.load(f):
+                    if isinstance(item, dict):
+                        word = (item.get("simplified") or "").replace("\ufeff", "").strip()
+                        if word:
+                            vocabulary.add(word)
+    return vocabulary
+
+
+class Segmenter:
+    """Tách từ forward maximum matching trên một tập từ vựng"""
+
+    def __init__(self, vocabulary: Set[str]):
+        self.vocabulary = vocabulary
+        self.max_length = max((len(w) for w in vocabulary), default=1)
+
+    def segment(self, text: str) -> Iterator[str]:
+        """Các từ thuộc từ vựng trong text (ký tự không khớp từ nào bị bỏ qua)"""
+        vocabulary = self.vocabulary
+        max_length = self.max_length
+        for run in _HAN_RUN_RE.findall(text):
+            i = 0
+            length = len(run)
+            while i < length:
+                for size in range(min(max_length, length - i), 0, -1):
+                    word = run[i:i + size]
+                    if word in vocabulary:
+                        yield word
+                        i += size
+                        break
+                else:
+                    i += 1
+
+
+def _corpus_files(paths: Iterable[Path]) -> List[Path]:
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in CORPUS_EXTENSIONS))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def _file_signature(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def frequency_score(rank: int, total: int) -> int:
+    """Rank (1 = phổ biến nhất) sang thang 10-100 như estimate_frequency"""
+    if total <= 1:
+        return 100
+    return max(10, 100 - (rank - 1) * 90 // (total - 1))
+
+
+class FrequencyIndex:
+    """
+    Store SQLite: số lần xuất hiện của từng từ HSK theo từng file corpus, bảng rank tổng hợp
+
+    index.update(corpus_paths) đếm các file mới/đã sửa và tính lại bảng rank.
+    """
+
+    def __init__(self, vocabulary: Set[str], db_path: Path = DEFAULT_INDEX_FILE):
+        self.db_path = Path(db_path)
+        self.vocabulary = vocabulary
+        self.segmenter = Segmenter(vocabulary)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, signature TEXT NOT NULL,
+                                              tokens INTEGER NOT NULL, counted_at REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS file_counts (path TEXT NOT NULL, word TEXT NOT NULL,
+                                                    count INTEGER NOT NULL, PRIMARY KEY (path, word));
+            CREATE TABLE IF NOT EXISTS ranks (word TEXT PRIMARY KEY, rank INTEGER NOT NULL,
+                                              count INTEGER NOT NULL);
+            """
+        )
+
+        # Từ vựng đổi thì số đếm cũ không còn đúng (thiếu từ mới, tách từ khác đi): đếm lại từ đầu
+        version = hashlib.sha1("\n".join(sorted(vocabulary)).encode("utf-8")).hexdigest()
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'vocabulary'").fetchone()
+        self.reset = row is not None and row[0] != version
+        if row is None or self.reset:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("DELETE FROM file_counts")
+            self.conn.execute("DELETE FROM ranks")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('vocabulary', ?)", (version,))
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ============ COUNT ============
+
+    def _count_file(self, path: Path) -> Tuple[Dict[str, int], int]:
+        """Đếm một file trong một lượt đọc: văn bản thường hoặc danh sách tần suất"""
+        counts: Dict[str, int] = {}
+        tokens = 0
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            # Đọc trước các dòng đầu để xác định loại file, rồi đếm tiếp phần còn lại
+            head = []
+            han_lines = 0
+            is_frequency_list = True
+            for line in f:
+                head.append(line)
+                if _HAN_RUN_RE.search(line):
+                    han_lines += 1
+                    if not _FREQUENCY_LINE_RE.match(line):
+                        is_frequency_list = False
+                        break
+                    if han_lines >= FREQUENCY_SNIFF_LINES:
+                        break
+            is_frequency_list = is_frequency_list and han_lines > 0
+
+            for line in itertools.chain(head, f):
+                weight = 1
+                if is_frequency_list:
+                    # "từ<TAB>số lần" -> mỗi từ HSK trong đó được cộng số lần, dòng khác (tiêu đề) bỏ qua
+                    match = _FREQUENCY_LINE_RE.match(line)
+                    if not match:
+                        continue
+                    line, weight = match.group(1), int(match.group(2))
+                for word in self.segmenter.segment(line):
+                    counts[word] = counts.get(word, 0) + weight
+                    tokens += weight
+        return counts, tokens
+
+    def update(self, paths: Iterable[Path]) -> List[Path]:
+        """
+        Đếm các file corpus mới hoặc đã thay đổi, xóa số đếm của file không còn trong paths
+        (đã xóa hoặc không còn được chỉ định), trả về danh sách file đã đếm
+        """
+        known = dict(self.conn.execute("SELECT path, signature FROM files"))
+        files = _corpus_files(paths)
+        counted = []
+
+        current = {str(path.resolve()) for path in files}
+        removed = [key for key in known if key not in current]
+        for key in removed:
+            self.conn.execute("DELETE FROM file_counts WHERE path = ?", (key,))
+            self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+            print(f"   🗑️  {Path(key).name}: không còn trong corpus, bỏ số đếm")
+        self.conn.commit()
+
+        for path in files:
+            key = str(path.resolve())
+            signature = _file_signature(path)
+            if known.get(key) == signature:
+                continue
+
+            # File mới hoặc đã sửa: thay số đếm cũ của riêng file này (nếu có)
+            counts, tokens = self._count_file(path)
+            self.conn.execute("DELETE FROM file_counts WHERE path = ?", (key,))
+            self.conn.executemany(
+                "INSERT INTO file_counts (path, word, count) VALUES (?, ?, ?)",
+                ((key, word, count) for word, count in counts.items()),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, signature, tokens, counted_at) VALUES (?, ?, ?, ?)",
+                (key, signature, tokens, time.time()),
+            )
+            self.conn.commit()
+            counted.append(path)
+            print(f"   📄 {path.name}: {tokens:,} từ HSK")
+
+        if counted or removed:
+            self.rebuild_ranks()
+        return counted
+
+    def rebuild_ranks(self):
+        """Tính lại bảng rank (1 = phổ biến nhất, từ cùng số lần xếp theo thứ tự chữ)"""
+        rows = self.conn.execute(
+            "SELECT word, SUM(count) AS total FROM file_counts GROUP BY word ORDER BY total DESC, word"
+        )
+        ranks = [(word, rank, count) for rank, (word, count) in enumerate(rows, 1)]
+        self.conn.execute("DELETE FROM ranks")
+        self.conn.executemany("INSERT INTO ranks (word, rank, count) VALUES (?, ?, ?)", ranks)
+        self.conn.commit()
+
+    def top(self, limit: int = 20) -> List[Tuple[str, int, int]]:
+        return list(self.conn.execute("SELECT word, rank, count FROM ranks ORDER BY rank LIMIT ?", (limit,)))
+
+    def close(self):
+        self.conn.close()
+
+
+class FrequencyRanks:
+    """Bảng rank nạp vào dict một lần, tra O(1)"""
+
+    def __init__(self, db_path: Path = DEFAULT_INDEX_FILE):
+        conn = sqlite3.connect(str(db_path))
+        try:
+            self.ranks: Dict[str, int] = dict(conn.execute("SELECT word, rank FROM ranks"))
+        finally:
+            conn.close()
+        self.total = len(self.ranks)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def rank(self, word: str) -> Optional[int]:
+        return self.ranks.get(word)
+
+    def frequency(self, word: str) -> Optional[int]:
+        """Tần suất thang 10-100, 10 nếu từ không xuất hiện trong corpus, None nếu bảng rỗng"""
+        if not self.total:
+            return None
+        rank = self.ranks.get(word.replace("\ufeff", "").strip())
+        return frequency_score(rank, self.total) if rank is not None else 10
+
+
+_frequency_ranks: Optional[FrequencyRanks] = None
+_frequency_ranks_checked = False
+
+
+def get_frequency_ranks() -> Optional[FrequencyRanks]:
+    """FrequencyRanks dùng chung, None nếu chưa build DEFAULT_INDEX_FILE"""
+    global _frequency_ranks, _frequency_ranks_checked
+    if not _frequency_ranks_checked:
+        _frequency_ranks_checked = True
+        if DEFAULT_INDEX_FILE.exists():
+            ranks = FrequencyRanks(DEFAULT_INDEX_FILE)
+            _frequency_ranks = ranks if len(ranks) else None
+    return _frequency_ranks
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Cách sử dụng: python frequency_index.py <file hoặc thư mục corpus> ...")
+        sys.exit(1)
+
+    vocabulary = load_vocabulary([SCRIPT_DIR, DATA_DIR])
+    if not vocabulary:
+        print("❌ Không tìm thấy file hsk*.json để lấy từ vựng")
+        sys.exit(1)
+
+    print(f"📚 Từ vựng HSK: {len(vocabulary):,} từ")
+    start = time.time()
+    with FrequencyIndex(vocabulary) as index:
+        if index.reset:
+            print("   Từ vựng HSK đã thay đổi, đếm lại toàn bộ corpus")
+        counted = index.update([Path(p) for p in sys.argv[1:]])
+        if not counted:
+            print("✅ Không có file corpus mới")
+        else:
+            print(f"✅ Đã đếm {len(counted)} file ({time.time() - start:.1f}s)")
+
+        print("\nTop 20:")
+        for word, rank, count in index.top(20):
+            print(f"  {rank:>4}. {word:<6} {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Checkpoint journal cho import_hsk_all_levels.py
+
+Lưu kết quả import của từng character vào SQLite cùng hash của payload,
+để lần chạy lại (sau khi bị ngắt giữa chừng) bỏ qua các từ đã xác nhận
+và chỉ gửi lại các từ thất bại hoặc có payload thay đổi. Hash chỉ tính các
+trường thực sự gửi lên API (SENT_FIELDS): đổi bản dịch meaning không làm
+gửi lại từ đã có trong database.
+
+Cách sử dụng:
+    with ImportCheckpoint(Path("import_checkpoint.db")) as checkpoint:
+        if not checkpoint.is_confirmed(payload):
+            ...
+            checkpoint.record(level, payload, outcome)
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Các outcome được coi là đã có trong database
+CONFIRMED_OUTCOMES = ("success", "skipped")
+
+# Các trường của payload được gửi lên API (send_word chỉ gửi character)
+SENT_FIELDS = ("character",)
+
+
+def payload_hash(payload: Dict) -> str:
+    """Hash ổn định của các trường payload gửi lên API (không phụ thuộc thứ tự key)"""
+    sent = {field: payload.get(field) for field in SENT_FIELDS}
+    data = json.dumps(sent, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class ImportCheckpoint:
+    """
+    Journal SQLite: character -> (level, payload_hash, outcome, attempts)
+
+    attempts chỉ đếm các lần gửi thật: bản ghi "skipped" không tăng attempts.
+
+    Toàn bộ journal được nạp vào dict khi mở nên is_confirmed() là O(1),
+    ghi được commit theo nhóm commit_every bản ghi (WAL mode).
+    """
+
+    def __init__(self, db_path: Path, commit_every: int = 50):
+        self.db_path = Path(db_path)
+        self.commit_every = max(1, commit_every)
+        self._uncommitted = 0
+        self._entries: Dict[str, Tuple[str, str]] = {}
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS words (
+                character TEXT PRIMARY KEY,
+                level INTEGER,
+                payload_hash TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+        for character, digest, outcome in self.conn.execute(
+            "SELECT character, payload_hash, outcome FROM words"
+        ):
+            self._entries[character] = (digest, outcome)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def is_confirmed(self, payload: Dict, digest: Optional[str] = None) -> bool:
+        """True nếu character đã import thành công với đúng payload này"""
+        entry = self._entries.get(payload["character"])
+        if entry is None or entry[1] not in CONFIRMED_OUTCOMES:
+            return False
+        return entry[0] == (digest or payload_hash(payload))
+
+    def record(self, level: Optional[int], payload: Dict, outcome: str):
+        """Ghi kết quả import của một character"""
+        character = payload["character"]
+        digest = payload_hash(payload)
+        attempt = 0 if outcome == "skipped" else 1
+        self._entries[character] = (digest, outcome)
+
+        self.conn.execute(
+            """
+            INSERT INTO words (character, level, payload_hash, outcome, attempts, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(character) DO UPDATE SET
+                level = excluded.level,
+                payload_hash = excluded.payload_hash,
+                outcome = excluded.outcome,
+                attempts = words.attempts + excluded.attempts,
+                updated_at = excluded.updated_at
+            """,
+            (character, level, digest, outcome, attempt, time.time()),
+        )
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        """Commit các bản ghi đang chờ"""
+        if self._uncommitted:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def summary(self) -> Dict[str, int]:
+        """Số character theo outcome"""
+        counts: Dict[str, int] = {}
+        for _, outcome in self._entries.values():
+            counts[outcome] = counts.get(outcome, 0) + 1
+        return counts
+
+    def close(self):
+        self.flush()
+        self.conn.close()
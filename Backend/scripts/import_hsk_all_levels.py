@@ -19,16 +19,49 @@ Số lượng từ mỗi cấp (tham khảo):
 - HSK 6: ~2500 từ (tổng 5000)
 """
 
+import asyncio
+import codecs
 import json
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
+from requests.adapters import HTTPAdapter
 import sys
 
+from backpressure import AIMDController
+from cedict import CedictStore, open_cedict_store
+from dead_letter import DeadLetterQueue, backoff_delay
+from import_checkpoint import ImportCheckpoint
+from import_pipeline import PipelineStage, StagedPipeline
+from translation_cache import open_translation_cache
+from translation_dict import get_translation_engine
+
 # Cấu hình
 API_BASE_URL = "https://localhost:7028/api"  # Thay đổi theo môi trường
 API_TOKEN = ""  # Nếu cần authentication
+MAX_IN_FLIGHT = 32  # Số request đồng thời tối đa ở chế độ async
+CHECKPOINT_FILE = "import_checkpoint.db"  # Journal resume, lưu trong thư mục data
+DEAD_LETTER_FILE = "import_dead_letter.jsonl"  # Các từ thất bại, lưu trong thư mục data
+REPLAY_MAX_RETRIES = 5  # Số lần thử lại mỗi từ trong chế độ replay
+EXISTING_PAGE_SIZE = 2000  # Số từ mỗi trang khi tải danh sách từ đã có (GET /admin/words)
+
+# Chế độ pipeline: số worker và kích thước queue của từng stage
+PIPELINE_QUEUE_SIZE = 256
+PIPELINE_WORKERS = {
+    "normalize": 1,
+    "translate": 4,
+    "send": MAX_IN_FLIGHT,
+}
+
+# Chế độ bulk (words/get-or-create-batch)
+BULK_INITIAL_BATCH = 20  # Kích thước batch ban đầu
+BULK_MIN_BATCH = 5
+BULK_MAX_BATCH = 500
+BULK_TARGET_LATENCY = 5.0  # Thời gian mục tiêu (giây) cho mỗi request batch
+BULK_MAX_PAYLOAD_BYTES = 256 * 1024  # Giới hạn kích thước body mỗi request
+BULK_TIMEOUT = 300  # Backend có thể gọi Gemini cho từ mới nên cần timeout dài
 
 # Mapping HSK level
 HSK_LEVELS = {
@@ -40,9 +73,110 @@ HSK_LEVELS = {
     6: {"file": "hsk6.json", "expected_count": 2500},
 }
 
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Parse dần một JSON array từ các chunk bytes, yield từng phần tử
+    Không cần giữ toàn bộ response trong bộ nhớ
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    
+    for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+        
+        while True:
+            # Bỏ qua khoảng trắng và dấu phẩy giữa các phần tử
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Response không phải JSON array")
+                started = True
+                pos += 1
+                continue
+            
+            if buffer[pos] == "]":
+                return
+            
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Phần tử chưa nhận đủ, đọc thêm chunk
+            yield item
+    
+    raise ValueError("JSON array không đầy đủ")
+
+
+class AdaptiveBatchSizer:
+    """
+    Điều chỉnh kích thước batch theo latency và kích thước payload quan sát được
+    
+    - Ước lượng thời gian xử lý mỗi từ từ batch trước, chọn batch sao cho
+      latency xấp xỉ target_latency (thay đổi tối đa x2 hoặc /2 mỗi lần)
+    - Batch lỗi (timeout, 5xx) thì giảm một nửa
+    - Không vượt quá max_payload_bytes dựa trên số byte trung bình mỗi từ
+    """
+    
+    def __init__(self, initial: int = BULK_INITIAL_BATCH, min_size: int = BULK_MIN_BATCH,
+                 max_size: int = BULK_MAX_BATCH, target_latency: float = BULK_TARGET_LATENCY,
+                 max_payload_bytes: int = BULK_MAX_PAYLOAD_BYTES):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.size = max(min_size, min(max_size, initial))
+        self.bytes_per_item: Optional[float] = None  # Trung bình trượt (EWMA)
+    
+    def next_size(self) -> int:
+        """Kích thước batch tiếp theo"""
+        size = self.size
+        if self.bytes_per_item:
+            size = min(size, int(self.max_payload_bytes // self.bytes_per_item))
+        return max(self.min_size, min(self.max_size, size))
+    
+    def observe(self, batch_len: int, latency: float, payload_bytes: int, ok: bool):
+        """Cập nhật sau mỗi request batch"""
+        if batch_len <= 0:
+            return
+        
+        per_item_bytes = payload_bytes / batch_len
+        if self.bytes_per_item is None:
+            self.bytes_per_item = per_item_bytes
+        else:
+            self.bytes_per_item = 0.8 * self.bytes_per_item + 0.2 * per_item_bytes
+        
+        if not ok:
+            new_size = batch_len // 2
+        elif latency <= 0:
+            new_size = batch_len * 2
+        else:
+            ideal = self.target_latency * batch_len / latency
+            new_size = int(max(batch_len / 2, min(batch_len * 2, ideal)))
+        
+        self.size = max(self.min_size, min(self.max_size, new_size))
+
+
 class HSKImporter:
-    def __init__(self, api_base_url: str, api_token: Optional[str] = None):
+    def __init__(self, api_base_url: str, api_token: Optional[str] = None,
+                 max_in_flight: int = MAX_IN_FLIGHT,
+                 checkpoint: Optional[ImportCheckpoint] = None):
         self.api_base_url = api_base_url
+        self.max_in_flight = max(1, max_in_flight)
+        self.checkpoint = checkpoint  # Journal để resume import (tùy chọn)
+        self.existing_characters: Optional[Set[str]] = None  # Các từ đã có trong database
+        self.dead_letter: Optional[DeadLetterQueue] = None  # Lưu các từ thất bại để replay
+        self.cedict: Optional[CedictStore] = None  # Bổ sung pinyin/definitions còn thiếu (tùy chọn)
+        # Engine dịch tạo một lần, dùng chung cho mọi worker
+        self.translator = get_translation_engine()
+        # Điều khiển rate/window theo latency và tín hiệu 429/5xx/timeout
+        self.controller = AIMDController(max_window=self.max_in_flight)
         self.headers = {
             "Content-Type": "application/json",
         }
@@ -58,12 +192,16 @@ class HSKImporter:
         }
     
     def load_hsk_file(self, filepath: Path) -> List[Dict]:
-        """Đọc file JSON HSK"""
+        """Đọc file JSON HSK (bổ sung từ CC-CEDICT các từ thiếu pinyin/definitions nếu có store)"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 print(f"✅ Đọc file {filepath.name}: {len(data)} từ")
-                return data
+            if self.cedict is not None:
+                enriched = self.cedict.enrich(data)
+                if enriched:
+                    print(f"   📚 Bổ sung {enriched} từ từ CC-CEDICT")
+            return data
         except FileNotFoundError:
             print(f"❌ Không tìm thấy file: {filepath}")
             return []
@@ -74,21 +212,13 @@ class HSKImporter:
     def translate_meaning(self, definitions: List[str]) -> str:
         """
         Dịch definitions từ tiếng Anh sang tiếng Việt
-        TODO: Tích hợp translation API hoặc sử dụng dictionary
+        Definition không có trong dictionary được giữ nguyên tiếng Anh
         """
-        from translation_dict import TRANSLATION_DICT
-        
-        vietnamese_meanings = []
-        for definition in definitions:
-            # Tìm trong dictionary
-            translated = TRANSLATION_DICT.get(definition.lower(), definition)
-            vietnamese_meanings.append(translated)
-        
-        return ", ".join(vietnamese_meanings)
+        return self.translator.translate_definitions(definitions)
     
-    def create_word(self, word_data: Dict, hsk_level: int, batch_mode: bool = False) -> bool:
+    def normalize_word(self, word_data: Dict) -> Optional[Dict]:
         """
-        Tạo một từ vựng qua API
+        Chuẩn hóa một từ từ HSK JSON, trả về None nếu thiếu thông tin
         
         word_data format từ HSK JSON:
         {
@@ -98,61 +228,250 @@ class HSKImporter:
             "definitions": ["hello", "hi"]
         }
         """
+        # Bỏ BOM (file HSK gốc có BOM ở từ đầu tiên) và khoảng trắng thừa
+        character = (word_data.get("simplified") or "").replace("\ufeff", "").strip()
+        pinyin = (word_data.get("pinyin") or "").strip()
+        definitions = [d.strip() for d in word_data.get("definitions") or [] if d and d.strip()]
+        
+        if not character or not pinyin:
+            return None
+        
+        return {"character": character, "pinyin": pinyin, "definitions": definitions}
+    
+    def build_payload(self, word: Dict) -> Dict:
+        """Dịch definitions của từ đã chuẩn hóa và tạo payload gửi API"""
+        # Dịch sang tiếng Việt (nếu có translation dict)
         try:
-            # Chuẩn bị payload
-            character = word_data.get("simplified", "")
-            pinyin = word_data.get("pinyin", "")
-            definitions = word_data.get("definitions", [])
-            
-            # Dịch sang tiếng Việt (nếu có translation dict)
-            try:
-                meaning = self.translate_meaning(definitions)
-            except:
-                meaning = ", ".join(definitions)  # Fallback: giữ tiếng Anh
-            
-            if not character or not pinyin:
-                print(f"⚠️  Bỏ qua từ thiếu thông tin: {word_data}")
-                self.stats["skipped"] += 1
-                return False
-            
-            # Gọi API để tạo word
-            endpoint = f"{self.api_base_url}/vocabulary/get-or-create"
-            params = {"character": character}
-            
-            if not batch_mode:
-                print(f"  📝 Đang tạo: {character} ({pinyin}) - {meaning[:50]}...")
-            
-            response = requests.get(
+            meaning = self.translate_meaning(word["definitions"])
+        except Exception as e:
+            print(f"  ⚠️  Lỗi dịch {word['character']}, giữ nghĩa tiếng Anh: {e}")
+            meaning = ", ".join(word["definitions"])  # Fallback: giữ tiếng Anh
+        
+        return {"character": word["character"], "pinyin": word["pinyin"], "meaning": meaning}
+    
+    def prepare_word(self, word_data: Dict) -> Optional[Dict]:
+        """Chuẩn bị payload cho một từ, trả về None nếu thiếu thông tin"""
+        word = self.normalize_word(word_data)
+        if word is None:
+            return None
+        return self.build_payload(word)
+    
+    def send_word(self, payload: Dict, session: Optional[requests.Session] = None) -> Tuple[str, Optional[int], str, str]:
+        """
+        Gọi API để tạo một từ
+        
+        Returns:
+            (outcome, status_code, message, error_class) với outcome là "success", "skipped" hoặc "failed"
+            error_class: tên exception (VD: "ReadTimeout") hoặc "HTTP <status>", rỗng nếu thành công
+        """
+        endpoint = f"{self.api_base_url}/vocabulary/get-or-create"
+        params = {"character": payload["character"]}
+        http = session or requests
+        
+        try:
+            response = http.get(
                 endpoint,
                 params=params,
                 headers=self.headers,
                 timeout=30,
                 verify=False  # Tắt SSL verify cho localhost
             )
+        except requests.exceptions.RequestException as e:
+            return "failed", None, f"Lỗi kết nối API: {e}", type(e).__name__
+        
+        if response.status_code == 200:
+            return "success", 200, "", ""
+        elif response.status_code == 409:  # Conflict - từ đã tồn tại
+            return "skipped", 409, "Từ đã tồn tại", ""
+        else:
+            return "failed", response.status_code, (response.text or "")[:200], f"HTTP {response.status_code}"
+    
+    def send_batch(self, payloads: List[Dict], session: Optional[requests.Session] = None) -> Tuple[Dict[str, str], Optional[int], str, int]:
+        """
+        Gọi POST words/get-or-create-batch cho nhiều từ trong một request
+        
+        Returns:
+            (outcomes, status_code, message, payload_bytes)
+            outcomes: character -> "success" (có trong response) hoặc "failed"
+        """
+        endpoint = f"{self.api_base_url}/vocabularytopics/words/get-or-create-batch"
+        characters = [payload["character"] for payload in payloads]
+        body = json.dumps({"characters": characters}, ensure_ascii=False).encode("utf-8")
+        http = session or requests
+        
+        try:
+            response = http.post(
+                endpoint,
+                data=body,
+                headers=self.headers,
+                timeout=BULK_TIMEOUT,
+                verify=False
+            )
+        except requests.exceptions.RequestException as e:
+            return {}, None, f"Lỗi kết nối API: {e}", len(body)
+        
+        if response.status_code != 200:
+            return {}, response.status_code, (response.text or "")[:200], len(body)
+        
+        try:
+            words = response.json()
+        except ValueError:
+            return {}, response.status_code, "Response không phải JSON", len(body)
+        
+        # Backend chỉ trả về các từ lấy/tạo thành công, từ thiếu trong response là thất bại
+        outcomes = {
+            character: "success" if character in words else "failed"
+            for character in characters
+        }
+        return outcomes, response.status_code, "", len(body)
+    
+    def import_word(self, word_data: Dict, batch_mode: bool = False,
+                    session: Optional[requests.Session] = None) -> str:
+        """
+        Chuẩn bị và gửi một từ, trả về outcome ("success", "skipped", "failed")
+        Không cập nhật stats để có thể chạy an toàn trong worker thread
+        """
+        try:
+            payload = self.prepare_word(word_data)
+        except Exception as e:
+            print(f"  ❌ Lỗi không xác định: {e}")
+            return "failed"
+        
+        if payload is None:
+            print(f"⚠️  Bỏ qua từ thiếu thông tin: {word_data}")
+            return "skipped"
+        
+        return self.import_payload(payload, batch_mode, session)[0]
+    
+    def import_payload(self, payload: Dict, batch_mode: bool = False,
+                       session: Optional[requests.Session] = None,
+                       level: Optional[int] = None) -> Tuple[str, Optional[int]]:
+        """
+        Gửi payload đã chuẩn bị, in lỗi và trả về (outcome, status_code)
+        Từ thất bại được ghi vào dead-letter queue (nếu có), thành công thì xóa khỏi queue
+        """
+        character = payload["character"]
+        start = time.time()
+        try:
+            if not batch_mode:
+                print(f"  📝 Đang tạo: {character} ({payload['pinyin']}) - {payload['meaning'][:50]}...")
+            
+            outcome, status_code, message, error_class = self.send_word(payload, session)
+            
+            if self.dead_letter is not None:
+                if outcome == "failed":
+                    self.dead_letter.add(payload, level, status_code, error_class, message,
+                                         time.time() - start)
+                elif character in self.dead_letter:
+                    self.dead_letter.resolve(character)
             
-            if response.status_code == 200:
-                self.stats["success"] += 1
-                return True
-            elif response.status_code == 409:  # Conflict - từ đã tồn tại
+            if outcome == "skipped":
                 if not batch_mode:
                     print(f"  ℹ️  Từ đã tồn tại: {character}")
-                self.stats["skipped"] += 1
-                return True
-            else:
-                print(f"  ❌ Lỗi API ({response.status_code}): {character}")
-                if response.text:
-                    print(f"     {response.text[:200]}")
-                self.stats["failed"] += 1
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            print(f"  ❌ Lỗi kết nối API: {e}")
-            self.stats["failed"] += 1
-            return False
+            elif outcome == "failed":
+                if status_code is None:
+                    print(f"  ❌ {message}")
+                else:
+                    print(f"  ❌ Lỗi API ({status_code}): {character}")
+                    if message:
+                        print(f"     {message}")
+            return outcome, status_code
         except Exception as e:
             print(f"  ❌ Lỗi không xác định: {e}")
-            self.stats["failed"] += 1
-            return False
+            if self.dead_letter is not None:
+                self.dead_letter.add(payload, level, None, type(e).__name__, str(e), time.time() - start)
+            return "failed", None
+    
+    def create_word(self, word_data: Dict, hsk_level: int, batch_mode: bool = False) -> bool:
+        """Tạo một từ vựng qua API (đồng bộ), cập nhật stats tổng"""
+        outcome = self.import_word(word_data, batch_mode)
+        self.stats[outcome] += 1
+        return outcome != "failed"
+    
+    def _record_outcome(self, level_stats: Dict, outcome: str,
+                        level: Optional[int] = None, payload: Optional[Dict] = None):
+        """Cập nhật stats tổng, stats theo cấp độ và checkpoint journal (nếu có)"""
+        self.stats[outcome] += 1
+        level_stats[outcome] += 1
+        if self.checkpoint is not None and payload is not None:
+            self.checkpoint.record(level, payload, outcome)
+    
+    def fetch_existing_characters(self, page_size: int = EXISTING_PAGE_SIZE) -> Set[str]:
+        """
+        Tải một lần toàn bộ character đã có trong database qua GET /admin/words
+        
+        Đọc theo trang (page/pageSize) và parse stream từng phần tử,
+        dừng khi trang cuối ngắn hơn pageSize hoặc không có từ mới
+        (backend cũ bỏ qua tham số phân trang và trả về toàn bộ danh sách)
+        """
+        endpoint = f"{self.api_base_url}/admin/words"
+        existing: Set[str] = set()
+        page = 1
+        
+        with self._make_session() as session:
+            while True:
+                response = session.get(
+                    endpoint,
+                    params={"page": page, "pageSize": page_size},
+                    timeout=60,
+                    verify=False,
+                    stream=True
+                )
+                response.raise_for_status()
+                
+                before = len(existing)
+                count = 0
+                for word in iter_json_array(response.iter_content(chunk_size=64 * 1024)):
+                    character = word.get("character")
+                    if character:
+                        existing.add(character)
+                    count += 1
+                
+                if count != page_size or len(existing) == before:
+                    break
+                page += 1
+        
+        return existing
+    
+    def _prepare_pending(self, level: int, words: List[Dict], level_stats: Dict) -> List[Dict]:
+        """
+        Chuẩn bị payload cho các từ của một cấp độ, trả về danh sách cần gửi
+        
+        - Từ thiếu thông tin được tính là skipped
+        - Từ đã xác nhận trong checkpoint (cùng hash payload) được bỏ qua
+        - Từ đã có trong database (existing_characters) được bỏ qua, không gọi API
+        """
+        pending = []
+        resumed = 0
+        existing = 0
+        
+        for word_data in words:
+            try:
+                payload = self.prepare_word(word_data)
+            except Exception as e:
+                print(f"  ❌ Lỗi không xác định: {e}")
+                self._record_outcome(level_stats, "failed")
+                continue
+            
+            if payload is None:
+                print(f"⚠️  Bỏ qua từ thiếu thông tin: {word_data}")
+                self._record_outcome(level_stats, "skipped")
+            elif self.checkpoint is not None and self.checkpoint.is_confirmed(payload):
+                self._record_outcome(level_stats, "skipped")
+                resumed += 1
+            elif self.existing_characters is not None and payload["character"] in self.existing_characters:
+                self._record_outcome(level_stats, "skipped", level, payload)
+                existing += 1
+            else:
+                pending.append(payload)
+        
+        if resumed:
+            print(f"  ⏩ Bỏ qua {resumed} từ đã import (checkpoint)")
+        if existing:
+            print(f"  ⏩ Bỏ qua {existing} từ đã có trong database")
+        if resumed or existing:
+            print(f"  📝 Còn {len(pending)} từ cần gửi")
+        return pending
     
     def import_hsk_level(self, level: int, filepath: Path, batch_size: int = 10) -> Dict:
         """Import toàn bộ từ vựng của một cấp độ HSK"""
@@ -165,37 +484,282 @@ class HSKImporter:
             return {"success": 0, "failed": 0, "skipped": 0}
         
         level_stats = {"success": 0, "failed": 0, "skipped": 0}
-        total_words = len(words)
+        payloads = self._prepare_pending(level, words, level_stats)
+        total_words = len(payloads)
         
         # Import theo batch
         for i in range(0, total_words, batch_size):
-            batch = words[i:i + batch_size]
+            batch = payloads[i:i + batch_size]
             batch_num = (i // batch_size) + 1
             total_batches = (total_words + batch_size - 1) // batch_size
             
             print(f"\n⏳ Batch {batch_num}/{total_batches} ({len(batch)} từ):")
             
-            for word_data in batch:
-                success = self.create_word(word_data, level, batch_mode=True)
-                if success:
-                    level_stats["success"] += 1
-                else:
-                    level_stats["failed"] += 1
+            for payload in batch:
+                # Controller quyết định nhịp gửi thay cho delay cố định giữa các batch
+                self.controller.acquire()
+                start = time.time()
+                outcome, status_code = self.import_payload(payload, batch_mode=True, level=level)
+                self.controller.on_response(time.time() - start, status_code)
+                self._record_outcome(level_stats, outcome, level, payload)
             
             # Progress
             processed = min(i + batch_size, total_words)
             progress = (processed / total_words) * 100
-            print(f"  ✅ Tiến độ: {processed}/{total_words} ({progress:.1f}%)")
+            print(f"  ✅ Tiến độ: {processed}/{total_words} ({progress:.1f}%) - {self.controller.status()}")
+        
+        self.stats["by_level"][level] = level_stats
+        return level_stats
+    
+    def _make_session(self) -> requests.Session:
+        """Tạo session keep-alive với connection pool đủ cho MAX_IN_FLIGHT request"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+        return session
+    
+    async def _send_async(self, payload: Dict, level: Optional[int],
+                          session: requests.Session, executor: ThreadPoolExecutor) -> str:
+        """Gửi một payload qua thread pool theo nhịp của AIMDController, trả về outcome"""
+        await self.controller.acquire_async()
+        start = time.time()
+        status_code = None
+        try:
+            outcome, status_code = await asyncio.get_running_loop().run_in_executor(
+                executor, self.import_payload, payload, True, session, level
+            )
+        finally:
+            self.controller.on_response(time.time() - start, status_code)
+        return outcome
+    
+    async def import_hsk_level_async(self, level: int, filepath: Path) -> Dict:
+        """
+        Import một cấp độ HSK ở chế độ async
+        
+        - Các worker dùng chung một session keep-alive (connection pool)
+        - Tối đa max_in_flight worker; số request đồng thời thực tế và nhịp gửi
+          do AIMDController điều chỉnh theo phản hồi của server
+        - Stats chỉ được cập nhật trên event loop nên không cần lock
+        """
+        print(f"\n{'='*60}")
+        print(f"📚 Đang import HSK {level} từ {filepath.name} (async, {self.max_in_flight} request đồng thời)")
+        print(f"{'='*60}")
+        
+        words = self.load_hsk_file(filepath)
+        if not words:
+            return {"success": 0, "failed": 0, "skipped": 0}
+        
+        level_stats = {"success": 0, "failed": 0, "skipped": 0}
+        payloads = self._prepare_pending(level, words, level_stats)
+        total_words = len(payloads)
+        report_every = max(1, total_words // 10)
+        pending = iter(payloads)  # Các worker lấy từ chung một iterator
+        processed = 0
+        start_time = time.time()
+        
+        with self._make_session() as session, \
+                ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
             
-            # Delay giữa các batch để không quá tải server
-            if i + batch_size < total_words:
-                time.sleep(1)
+            async def worker():
+                nonlocal processed
+                for payload in pending:
+                    outcome = await self._send_async(payload, level, session, executor)
+                    self._record_outcome(level_stats, outcome, level, payload)
+                    processed += 1
+                    
+                    if processed % report_every == 0 or processed == total_words:
+                        elapsed = max(time.time() - start_time, 1e-6)
+                        progress = (processed / total_words) * 100
+                        print(f"  ✅ Tiến độ: {processed}/{total_words} ({progress:.1f}%) "
+                              f"- {processed / elapsed:.0f} từ/s - {self.controller.status()}")
+            
+            workers = min(self.max_in_flight, total_words)
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        
+        self.stats["by_level"][level] = level_stats
+        return level_stats
+    
+    def import_hsk_level_bulk(self, level: int, filepath: Path) -> Dict:
+        """
+        Import một cấp độ HSK qua endpoint words/get-or-create-batch
+        
+        Kích thước batch được AdaptiveBatchSizer điều chỉnh theo latency và payload,
+        kết quả từng character được map lại vào stats
+        """
+        print(f"\n{'='*60}")
+        print(f"📚 Đang import HSK {level} từ {filepath.name} (bulk)")
+        print(f"{'='*60}")
+        
+        words = self.load_hsk_file(filepath)
+        if not words:
+            return {"success": 0, "failed": 0, "skipped": 0}
+        
+        level_stats = {"success": 0, "failed": 0, "skipped": 0}
+        payloads = self._prepare_pending(level, words, level_stats)
+        total_words = len(payloads)
+        sizer = AdaptiveBatchSizer()
+        processed = 0
+        requests_sent = 0
+        
+        with self._make_session() as session:
+            while processed < total_words:
+                batch = payloads[processed:processed + sizer.next_size()]
+                
+                start = time.time()
+                outcomes, status_code, message, payload_bytes = self.send_batch(batch, session)
+                latency = time.time() - start
+                requests_sent += 1
+                
+                failed_characters = []
+                for payload in batch:
+                    outcome = outcomes.get(payload["character"], "failed")
+                    self._record_outcome(level_stats, outcome, level, payload)
+                    if outcome == "failed":
+                        failed_characters.append(payload["character"])
+                        if self.dead_letter is not None:
+                            if outcomes:
+                                error_class, error = "MissingFromResponse", "Không có trong response batch"
+                            else:
+                                error_class = f"HTTP {status_code}" if status_code else "RequestException"
+                                error = message
+                            self.dead_letter.add(payload, level, status_code, error_class, error, latency)
+                    elif self.dead_letter is not None and payload["character"] in self.dead_letter:
+                        self.dead_letter.resolve(payload["character"])
+                
+                if not outcomes:
+                    print(f"  ❌ Lỗi batch ({status_code}): {message}")
+                elif failed_characters:
+                    print(f"  ❌ {len(failed_characters)} từ thất bại: {', '.join(failed_characters[:10])}")
+                
+                sizer.observe(len(batch), latency, payload_bytes, ok=bool(outcomes))
+                processed += len(batch)
+                
+                progress = (processed / total_words) * 100
+                print(f"  ✅ Tiến độ: {processed}/{total_words} ({progress:.1f}%) "
+                      f"- batch {len(batch)} từ, {latency:.2f}s, {payload_bytes} bytes")
         
+        print(f"  📦 {requests_sent} request cho {total_words} từ")
         self.stats["by_level"][level] = level_stats
         return level_stats
     
-    def import_all_levels(self, base_dir: Path, levels: List[int] = None):
-        """Import tất cả các cấp độ HSK"""
+    async def import_levels_pipeline(self, level_files: List[Tuple[int, Path]]):
+        """
+        Import nhiều cấp độ qua pipeline load → normalize → translate → send
+        
+        Các stage chạy chồng lên nhau với queue giới hạn PIPELINE_QUEUE_SIZE:
+        - load: đọc lần lượt các file hsk*.json (một thread riêng, không chặn event loop)
+        - normalize: chuẩn hóa, bỏ từ thiếu thông tin hoặc đã có trong database
+        - translate: dịch definitions (thread pool riêng)
+        - send: kiểm tra checkpoint, gửi API theo AIMDController, ghi stats
+        """
+        print(f"\n{'='*60}")
+        print(f"📚 Đang import HSK {', '.join(str(level) for level, _ in level_files)} (pipeline)")
+        print(f"{'='*60}")
+        
+        def load():
+            for level, filepath in level_files:
+                self.stats["by_level"][level] = {"success": 0, "failed": 0, "skipped": 0}
+                for word_data in self.load_hsk_file(filepath):
+                    yield level, word_data
+        
+        def normalize(item):
+            level, word_data = item
+            level_stats = self.stats["by_level"][level]
+            word = self.normalize_word(word_data)
+            if word is None:
+                print(f"⚠️  Bỏ qua từ thiếu thông tin: {word_data}")
+                self._record_outcome(level_stats, "skipped")
+                return None
+            if self.existing_characters is not None and word["character"] in self.existing_characters:
+                # Checkpoint chỉ hash character (trường gửi API), không cần dịch để ghi lại
+                self._record_outcome(level_stats, "skipped", level, {"character": word["character"]})
+                return None
+            return level, word
+        
+        def translate(item):
+            # Chạy trong thread pool: không cập nhật stats ở đây
+            level, word = item
+            return level, self.build_payload(word)
+        
+        with self._make_session() as session, \
+                ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            
+            async def send(item):
+                level, payload = item
+                level_stats = self.stats["by_level"][level]
+                if self.checkpoint is not None and self.checkpoint.is_confirmed(payload):
+                    self._record_outcome(level_stats, "skipped")
+                    return None
+                
+                outcome = await self._send_async(payload, level, session, executor)
+                self._record_outcome(level_stats, outcome, level, payload)
+                return None
+            
+            pipeline = StagedPipeline("load", load(), [
+                PipelineStage("normalize", normalize, PIPELINE_WORKERS["normalize"], PIPELINE_QUEUE_SIZE),
+                PipelineStage("translate", translate, PIPELINE_WORKERS["translate"], PIPELINE_QUEUE_SIZE,
+                              blocking=True),
+                PipelineStage("send", send, min(PIPELINE_WORKERS["send"], self.max_in_flight),
+                              PIPELINE_QUEUE_SIZE),
+            ], status=self.controller.status)
+            await pipeline.run()
+    
+    async def replay_dead_letters(self, max_retries: int = REPLAY_MAX_RETRIES):
+        """
+        Chạy lại chỉ các từ trong dead-letter queue bằng engine async
+        
+        Mỗi từ được thử tối đa max_retries lần, giữa các lần chờ exponential
+        backoff có jitter; số request đồng thời vẫn do AIMDController quyết định
+        """
+        entries = self.dead_letter.pending()
+        print(f"\n{'='*60}")
+        print(f"🔁 Replay {len(entries)} từ thất bại từ {self.dead_letter.path.name}")
+        print(f"{'='*60}")
+        for error_class, count in sorted(self.dead_letter.summary().items(), key=lambda x: -x[1]):
+            print(f"  {error_class}: {count} từ")
+        
+        processed = 0
+        report_every = max(1, len(entries) // 10)
+        
+        with self._make_session() as session, \
+                ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            
+            async def retry(entry: Dict):
+                nonlocal processed
+                payload = entry["payload"]
+                level = entry.get("level")
+                level_stats = self.stats["by_level"].setdefault(
+                    level or 0, {"success": 0, "failed": 0, "skipped": 0}
+                )
+                
+                for attempt in range(max_retries):
+                    outcome = await self._send_async(payload, level, session, executor)
+                    if outcome != "failed":
+                        break
+                    if attempt + 1 < max_retries:
+                        await asyncio.sleep(backoff_delay(attempt))
+                
+                self._record_outcome(level_stats, outcome, level, payload)
+                processed += 1
+                if processed % report_every == 0 or processed == len(entries):
+                    print(f"  ✅ Tiến độ: {processed}/{len(entries)} - {self.controller.status()}")
+            
+            # Từ đang chờ backoff không chiếm chỗ, AIMDController giới hạn request đang chạy
+            await asyncio.gather(*(retry(entry) for entry in entries))
+        
+        print(f"  📮 Còn {len(self.dead_letter)} từ trong dead-letter queue")
+    
+    def import_all_levels(self, base_dir: Path, levels: List[int] = None, mode: str = "sync",
+                          server_diff: bool = False):
+        """
+        Import tất cả các cấp độ HSK
+        
+        mode: "sync" (tuần tự), "async" (nhiều request đồng thời), "bulk" (batch endpoint)
+              hoặc "pipeline" (các stage load/normalize/translate/send chạy chồng lên nhau)
+        server_diff: tải danh sách từ đã có trong database trước, chỉ gửi các từ còn thiếu
+        """
         if levels is None:
             levels = list(HSK_LEVELS.keys())
         
@@ -205,6 +769,17 @@ class HSKImporter:
         
         start_time = time.time()
         
+        if server_diff:
+            print("\n🔎 Đang tải danh sách từ đã có trong database...")
+            try:
+                self.existing_characters = self.fetch_existing_characters()
+                print(f"  ✅ Database có {len(self.existing_characters)} từ "
+                      f"({time.time() - start_time:.2f}s)")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"  ⚠️  Không tải được danh sách từ, import không so sánh: {e}")
+                self.existing_characters = None
+        
+        level_files = []
         for level in levels:
             if level not in HSK_LEVELS:
                 print(f"⚠️  Bỏ qua HSK {level} (không có trong config)")
@@ -217,7 +792,24 @@ class HSKImporter:
                 print(f"⚠️  Bỏ qua HSK {level}: Không tìm thấy {filepath}")
                 continue
             
-            self.import_hsk_level(level, filepath)
+            level_files.append((level, filepath))
+        
+        try:
+            if mode == "pipeline":
+                # Pipeline xử lý tất cả cấp độ trong một lần chạy
+                asyncio.run(self.import_levels_pipeline(level_files))
+            else:
+                for level, filepath in level_files:
+                    if mode == "async":
+                        asyncio.run(self.import_hsk_level_async(level, filepath))
+                    elif mode == "bulk":
+                        self.import_hsk_level_bulk(level, filepath)
+                    else:
+                        self.import_hsk_level(level, filepath)
+        finally:
+            # Luôn ghi checkpoint xuống đĩa, kể cả khi bị Ctrl+C
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
         
         # Tổng kết
         elapsed_time = time.time() - start_time
@@ -263,6 +855,12 @@ def main():
         api_token=API_TOKEN
     )
     
+    # Dead-letter queue: lưu các từ thất bại để replay
+    importer.dead_letter = DeadLetterQueue(data_dir / DEAD_LETTER_FILE)
+    
+    # CC-CEDICT (nếu có Backend/data/cedict_ts.u8): bổ sung pinyin/definitions còn thiếu
+    importer.cedict = open_cedict_store()
+    
     # Chọn cấp độ cần import
     print("\nChọn cấp độ cần import:")
     print("1. Chỉ HSK 1 (150 từ)")
@@ -271,8 +869,18 @@ def main():
     print("4. HSK 1-4 (1200 từ)")
     print("5. HSK 1-6 (5000 từ) - ĐỀ XUẤT")
     print("6. Tùy chọn")
+    print(f"7. Chạy lại các từ thất bại ({len(importer.dead_letter)} từ trong {DEAD_LETTER_FILE})")
+    
+    choice = input("\nNhập lựa chọn (1-7): ").strip()
     
-    choice = input("\nNhập lựa chọn (1-6): ").strip()
+    if choice == "7":
+        try:
+            start_time = time.time()
+            asyncio.run(importer.replay_dead_letters())
+            importer.print_summary(time.time() - start_time)
+        finally:
+            importer.dead_letter.close()
+        return
     
     if choice == "1":
         levels = [1]
@@ -291,6 +899,16 @@ def main():
         print("❌ Lựa chọn không hợp lệ")
         sys.exit(1)
     
+    # Chọn chế độ import
+    print("\nChọn chế độ import:")
+    print("1. Tuần tự (batch 10 từ, nhịp gửi theo backpressure)")
+    print(f"2. Async ({importer.max_in_flight} request đồng thời) - NHANH")
+    print("3. Bulk (gửi nhiều từ mỗi request qua get-or-create-batch)")
+    print("4. Pipeline (đọc file, dịch và gửi chạy song song theo stage)")
+    
+    mode_choice = input("\nNhập lựa chọn (1-4, mặc định 1): ").strip()
+    mode = {"2": "async", "3": "bulk", "4": "pipeline"}.get(mode_choice, "sync")
+    
     # Xác nhận
     print(f"\n⚠️  Sẽ import HSK {', '.join(map(str, levels))}")
     confirm = input("Tiếp tục? (y/n): ").strip().lower()
@@ -299,8 +917,37 @@ def main():
         print("❌ Đã hủy")
         sys.exit(0)
     
+    # So sánh với database trước khi import
+    diff = input("Tải danh sách từ đã có để chỉ gửi từ còn thiếu? (y/n, mặc định y): ").strip().lower()
+    server_diff = diff != "n"
+    
+    # Checkpoint journal để có thể resume nếu bị ngắt giữa chừng
+    checkpoint_path = data_dir / CHECKPOINT_FILE
+    resume = input(f"Dùng checkpoint {checkpoint_path.name} để resume? (y/n, mặc định y): ").strip().lower()
+    if resume != "n":
+        importer.checkpoint = ImportCheckpoint(checkpoint_path)
+        print(f"📒 Checkpoint: {len(importer.checkpoint)} từ đã ghi nhận")
+    
+    # Cache bản dịch trên đĩa (dùng chung với convert_hsk1_to_seed_data.py)
+    translation_cache = open_translation_cache()
+    importer.translator.persistent_cache = translation_cache
+    if translation_cache.invalidated:
+        print("📖 TRANSLATION_DICT đã thay đổi, cache bản dịch được làm mới")
+    
     # Bắt đầu import
-    importer.import_all_levels(data_dir, levels)
+    try:
+        importer.import_all_levels(data_dir, levels, mode=mode, server_diff=server_diff)
+    finally:
+        print(f"📖 Cache bản dịch: {translation_cache.status()}")
+        translation_cache.close()
+        if importer.checkpoint is not None:
+            importer.checkpoint.close()
+        if importer.cedict is not None:
+            importer.cedict.close()
+        importer.dead_letter.close()
+        if len(importer.dead_letter):
+            print(f"\n📮 {len(importer.dead_letter)} từ thất bại đã lưu vào {DEAD_LETTER_FILE}, "
+                  f"chọn 7 để chạy lại")
 
 
 if __name__ == "__main__":
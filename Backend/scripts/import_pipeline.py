@@ -0,0 +1,207 @@
+"""
+Pipeline nhiều stage cho import_hsk_all_levels.py
+
+Mỗi stage có queue đầu vào giới hạn kích thước và số worker riêng, các stage
+chạy chồng lên nhau (đọc file, chuẩn hóa, dịch và gửi HTTP cùng lúc).
+Source (iterable đồng bộ, VD: generator đọc file) được duyệt trong một thread riêng
+(generator chỉ đọc tuần tự được), không chặn event loop.
+Định kỳ in độ sâu queue và throughput của từng stage để thấy stage nghẽn.
+
+Cách sử dụng:
+    pipeline = StagedPipeline("load", source_items, [
+        PipelineStage("normalize", normalize),
+        PipelineStage("translate", translate, workers=2, blocking=True),
+        PipelineStage("send", send_async, workers=32),
+    ])
+    await pipeline.run()
+
+Handler nhận một item và trả về item cho stage sau (None để bỏ item).
+Handler có thể là hàm thường, coroutine function, hoặc hàm blocking
+(blocking=True, chạy trong thread pool riêng của stage).
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+_DONE = object()  # Sentinel báo worker dừng
+
+
+class PipelineStage:
+    """Một stage của pipeline"""
+
+    def __init__(self, name: str, handler: Callable, workers: int = 1,
+                 queue_size: int = 256, blocking: bool = False):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.blocking = blocking
+        self.is_async = asyncio.iscoroutinefunction(handler)
+
+        self.queue: Optional[asyncio.Queue] = None  # Tạo trong run() (gắn với event loop)
+        self.processed = 0
+        self.emitted = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+
+class StagedPipeline:
+    """Chạy source -> stage 1 -> stage 2 -> ... với queue giới hạn giữa các stage"""
+
+    def __init__(self, source_name: str, source: Iterable, stages: List[PipelineStage],
+                 report_interval: float = 2.0, status: Optional[Callable[[], str]] = None):
+        self.source_name = source_name
+        self.source = source
+        self.stages = stages
+        self.report_interval = report_interval
+        self.status = status  # Thông tin thêm in kèm báo cáo (VD: trạng thái backpressure)
+
+        self.produced = 0
+        self.source_busy_time = 0.0
+        self.start_time = 0.0
+
+    # ============ WORKERS ============
+
+    async def _produce(self):
+        # Source đồng bộ (đọc file, parse JSON) chạy trong một thread riêng, không chặn event loop.
+        # Generator không gọi next() song song được nên thêm thread cũng không nhanh hơn.
+        loop = asyncio.get_running_loop()
+        iterator = iter(self.source)
+        first = self.stages[0]
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while True:
+                start = time.perf_counter()
+                item = await loop.run_in_executor(executor, next, iterator, _DONE)
+                self.source_busy_time += time.perf_counter() - start
+                if item is _DONE:
+                    break
+                await first.queue.put(item)
+                self.produced += 1
+                first.max_depth = max(first.max_depth, first.queue.qsize())
+        finally:
+            executor.shutdown(wait=False)
+
+        for _ in range(first.workers):
+            await first.queue.put(_DONE)
+
+    async def _worker(self, stage: PipelineStage, next_stage: Optional[PipelineStage],
+                      executor: Optional[ThreadPoolExecutor]):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await stage.queue.get()
+            if item is _DONE:
+                return
+
+            start = time.perf_counter()
+            if stage.blocking:
+                result = await loop.run_in_executor(executor, stage.handler, item)
+            elif stage.is_async:
+                result = await stage.handler(item)
+            else:
+                result = stage.handler(item)
+            stage.busy_time += time.perf_counter() - start
+            stage.processed += 1
+
+            if result is not None and next_stage is not None:
+                await next_stage.queue.put(result)
+                stage.emitted += 1
+                next_stage.max_depth = max(next_stage.max_depth, next_stage.queue.qsize())
+
+    async def _run_stage(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        executor = ThreadPoolExecutor(max_workers=stage.workers) if stage.blocking else None
+
+        try:
+            await asyncio.gather(*(
+                self._worker(stage, next_stage, executor) for _ in range(stage.workers)
+            ))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+        if next_stage is not None:
+            for _ in range(next_stage.workers):
+                await next_stage.queue.put(_DONE)
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.print_report()
+
+    # ============ RUN ============
+
+    async def run(self):
+        """Chạy pipeline đến khi source cạn và mọi stage xử lý xong"""
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+
+        self.start_time = time.time()
+        tasks = [asyncio.ensure_future(self._produce())]
+        tasks += [asyncio.ensure_future(self._run_stage(i)) for i in range(len(self.stages))]
+        reporter = asyncio.ensure_future(self._report())
+
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    for other in pending:
+                        other.cancel()
+                    raise task.exception()
+        finally:
+            reporter.cancel()
+
+        self.print_report(final=True)
+
+    # ============ REPORT ============
+
+    def bottleneck(self) -> Optional[PipelineStage]:
+        """
+        Stage nghẽn: queue đầu vào gần đầy nhưng queue của stage sau thì không
+        (các stage phía trước đầy chỉ vì bị stage này chặn lại)
+        """
+        def is_full(stage: PipelineStage) -> bool:
+            return stage.depth() >= stage.queue_size * 0.9
+
+        slowest = None
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            if is_full(stage) and (next_stage is None or not is_full(next_stage)):
+                slowest = stage
+        return slowest
+
+    def print_report(self, final: bool = False):
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        if final:
+            utilization = self.source_busy_time / elapsed * 100
+            parts = [f"{self.source_name} {self.produced} ({self.produced / elapsed:.0f}/s, "
+                     f"1 thread bận {utilization:.0f}%)"]
+        else:
+            parts = [f"{self.source_name} {self.produced} ({self.produced / elapsed:.0f}/s)"]
+
+        for stage in self.stages:
+            if final:
+                utilization = stage.busy_time / (elapsed * stage.workers) * 100
+                parts.append(f"{stage.name} {stage.processed} ({stage.processed / elapsed:.0f}/s, "
+                             f"queue max {stage.max_depth}/{stage.queue_size}, "
+                             f"{stage.workers} worker bận {utilization:.0f}%)")
+            else:
+                parts.append(f"{stage.name} q {stage.depth()}/{stage.queue_size} "
+                             f"{stage.processed} ({stage.processed / elapsed:.0f}/s)")
+
+        prefix = "  📊 Pipeline (tổng kết): " if final else "  📊 "
+        print(prefix + " | ".join(parts))
+
+        if not final:
+            slowest = self.bottleneck()
+            extra = f" - {self.status()}" if self.status else ""
+            if slowest is not None:
+                print(f"     ⚠️  Nghẽn tại: {slowest.name}{extra}")
+            elif self.status:
+                print(f"     {self.status()}")
@@ -0,0 +1,165 @@
+"""
+Chia bài theo chủ đề (chế độ "cluster" của lesson_partitioner.py): gom các từ giống nhau
+(chung chữ Hán, chung bộ thủ, cùng dạng lặp như 爸爸 / 妈妈) vào cùng một bài
+
+Đặc trưng của mỗi từ là một vector thưa lưu dạng CSR bằng mảng NumPy: các chữ Hán của từ,
+bộ thủ của từng chữ (nếu đã build bảng bộ thủ, xem stroke_table.py) và dạng lặp AA / AABB.
+Trọng số là idf (đặc trưng càng hiếm càng có ý nghĩa). Đặc trưng chỉ có ở một từ không
+giúp gom nhóm, đặc trưng có ở quá nhiều từ (> max_feature_words) không còn mang chủ đề:
+cả hai bị bỏ.
+
+Gom nhóm tham lam: mỗi bài bắt đầu từ từ đầu tiên chưa được xếp (giữ thứ tự HSK), lần lượt
+thêm từ có điểm tương đồng (tích vô hướng với các từ đã có trong bài) cao nhất. Điểm được
+cộng dồn qua chỉ mục ngược đặc trưng -> các từ (CSC), nên mỗi lần thêm một từ chỉ chạm các
+từ có chung đặc trưng, không so từng cặp O(n²). Không còn từ tương đồng thì lấy từ kế tiếp
+theo thứ tự trong file.
+
+Cách sử dụng:
+    groups = partition_words(words, "cluster", words_per_lesson=12, min_words=10, max_words=15)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lesson_partitioner import han_chars
+from stroke_table import RadicalTable, get_radical_table
+
+MAX_FEATURE_WORDS = 200  # Đặc trưng có ở nhiều từ hơn thì bỏ (VD: bộ 口)
+RADICAL_WEIGHT = 0.5  # Chung bộ thủ kém ý nghĩa hơn chung chữ
+PATTERN_WEIGHT = 1.0
+
+
+def word_features(word: Dict[str, Any], radical_table: Optional[RadicalTable] = None) -> Dict[str, float]:
+    """Đặc trưng (chưa nhân idf) của một từ: "c:<chữ>", "r:<số bộ thủ>", "p:AA" / "p:AABB" """
+    chars = han_chars(word.get("character") or "")
+    features = {f"c:{char}": 1.0 for char in chars}
+    if radical_table is not None:
+        for char in chars:
+            radical = radical_table.radical(char)
+            if radical:
+                features[f"r:{radical}"] = RADICAL_WEIGHT
+    if len(chars) == 2 and chars[0] == chars[1]:
+        features["p:AA"] = PATTERN_WEIGHT
+    elif len(chars) == 4 and chars[0] == chars[1] and chars[2] == chars[3]:
+        features["p:AABB"] = PATTERN_WEIGHT
+    return features
+
+
+class FeatureMatrix:
+    """
+    Ma trận đặc trưng thưa n từ x d đặc trưng, đã nhân idf
+
+    CSR (indptr, indices, weights): đặc trưng của từng từ.
+    CSC (col_ptr, col_words, col_weights): các từ có từng đặc trưng.
+    """
+
+    def __init__(self, words: Sequence[Dict[str, Any]], radical_table: Optional[RadicalTable] = None,
+                 max_feature_words: int = MAX_FEATURE_WORDS):
+        names: Dict[str, int] = {}
+        counts = []
+        indices = []
+        values = []
+        for word in words:
+            features = word_features(word, radical_table)
+            counts.append(len(features))
+            for name, value in features.items():
+                indices.append(names.setdefault(name, len(names)))
+                values.append(value)
+
+        n = len(words)
+        indices = np.asarray(indices, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        rows = np.repeat(np.arange(n, dtype=np.int64), counts)
+
+        # idf, bỏ đặc trưng chỉ có ở một từ hoặc ở quá nhiều từ
+        df = np.bincount(indices, minlength=len(names))
+        idf = np.log((n + 1) / (df + 1)) + 1.0
+        keep = (df[indices] >= 2) & (df[indices] <= max_feature_words)
+        indices, values, rows = indices[keep], values[keep] * idf[indices[keep]], rows[keep]
+
+        self.names = list(names)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        self.indices = indices
+        self.weights = values
+
+        order = np.argsort(indices, kind="stable")
+        self.col_ptr = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=len(names)))))
+        self.col_words = rows[order]
+        self.col_weights = values[order]
+
+    def neighbours(self, word: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Các từ có chung đặc trưng với word và phần điểm tương đồng tương ứng (có thể lặp từ)"""
+        start, end = self.indptr[word], self.indptr[word + 1]
+        if start == end:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        slices = [slice(self.col_ptr[f], self.col_ptr[f + 1]) for f in self.indices[start:end]]
+        others = np.concatenate([self.col_words[s] for s in slices])
+        gains = np.concatenate([self.col_weights[s] * w for s, w in zip(slices, self.weights[start:end])])
+        return others, gains
+
+
+def cluster_words(words: Sequence[Dict[str, Any]], sizes: List[int],
+                  radical_table: Optional[RadicalTable] = None,
+                  max_feature_words: int = MAX_FEATURE_WORDS) -> List[List[Dict[str, Any]]]:
+    """
+    Chia words thành len(sizes) bài, bài thứ i có sizes[i] từ, các từ tương đồng vào cùng bài
+
+    radical_table: mặc định dùng bảng bộ thủ đã build (get_radical_table), không có thì
+    chỉ dùng đặc trưng chữ Hán và dạng lặp.
+    """
+    if sum(sizes) != len(words):
+        raise ValueError(f"Tổng số từ các bài ({sum(sizes)}) khác số từ vựng ({len(words)})")
+    if radical_table is None:
+        radical_table = get_radical_table()
+    matrix = FeatureMatrix(words, radical_table, max_feature_words)
+
+    score = np.zeros(len(words))
+    assigned = np.zeros(len(words), dtype=bool)
+    next_word = 0  # Từ đầu tiên có thể chưa được xếp (theo thứ tự file)
+    groups = []
+
+    for size in sizes:
+        members = []
+        candidates = np.empty(0, dtype=np.int64)
+        current = None
+        while len(members) < size:
+            if candidates.size:
+                best = int(np.argmax(score[candidates]))  # Điểm bằng nhau: từ đứng trước
+                current = int(candidates[best])
+            else:
+                while assigned[next_word]:
+                    next_word += 1
+                current = next_word
+            members.append(current)
+            assigned[current] = True
+
+            others, gains = matrix.neighbours(current)
+            np.add.at(score, others, gains)
+            candidates = np.union1d(candidates, others)
+            candidates = candidates[~assigned[candidates]]
+
+        # Điểm chỉ tính trong một bài
+        score[candidates] = 0.0
+        groups.append(sorted(members))
+
+    groups.sort(key=lambda indexes: indexes[0])
+    return [[words[i] for i in indexes] for indexes in groups]
+
+
+def lesson_similarity(words: Sequence[Dict[str, Any]], groups: List[List[Dict[str, Any]]],
+                      radical_table: Optional[RadicalTable] = None) -> float:
+    """
+    Tỉ lệ cặp từ cùng bài có chung ít nhất một chữ Hán / bộ thủ / dạng lặp (để so sánh các cách chia)
+    Chỉ dùng để đánh giá: duyệt từng cặp trong bài, O(số từ x số từ mỗi bài).
+    """
+    if radical_table is None:
+        radical_table = get_radical_table()
+    pairs = related = 0
+    for group in groups:
+        features = [set(word_features(word, radical_table)) for word in group]
+        for i in range(len(features)):
+            for j in range(i + 1, len(features)):
+                pairs += 1
+                related += bool(features[i] & features[j])
+    return related / pairs if pairs else 0.0
@@ -0,0 +1,115 @@
+"""
+Sắp thứ tự bài học theo phụ thuộc chữ Hán (đồ thị bài tiên quyết)
+
+Một từ phụ thuộc vào các từ một chữ nằm trong nó: 电脑 phụ thuộc 电 và 脑 (nếu 电, 脑 có
+trong từ vựng), nên bài chứa 电 phải được học trước bài chứa 电脑.
+
+Đồ thị được dựng qua chỉ mục chữ -> các từ chứa chữ đó: mỗi từ một chữ chỉ nối tới các từ
+trong danh sách của chữ đó, số cạnh không vượt quá tổng số chữ của từ vựng (tuyến tính).
+Các bài được sắp topo (Kahn): trong các bài đã đủ điều kiện, bài đứng trước trong thứ tự
+ban đầu được xếp trước. Gặp chu trình (hai bài phụ thuộc lẫn nhau) thì xếp bài đứng trước
+nhất trong số còn lại, bỏ qua cạnh ngược.
+
+Bài tiên quyết (prerequisiteLessonId) của mỗi bài là bài phụ thuộc được xếp gần nhất trước
+nó; bài không phụ thuộc chữ nào dùng bài liền trước (giữ đường mở khóa tuần tự).
+
+Cách sử dụng:
+    groups, prerequisites = order_lessons(groups)
+    # prerequisites[i]: lessonIndex (từ 1) của bài tiên quyết của groups[i], None với bài đầu
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from lesson_partitioner import han_chars
+
+LESSON_ORDERS = ("dependencies", "file")
+
+
+def character_index(words: Sequence[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Chỉ mục chữ Hán -> vị trí các từ chứa chữ đó"""
+    index: Dict[str, List[int]] = defaultdict(list)
+    for position, word in enumerate(words):
+        for char in dict.fromkeys(han_chars(word.get("character") or "")):
+            index[char].append(position)
+    return index
+
+
+def word_dependencies(words: Sequence[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Phụ thuộc của từng từ: vị trí các từ một chữ nằm trong nó
+
+    Từ một chữ không phụ thuộc lẫn nhau (VD: hai mục 会 khác pinyin).
+    """
+    chars = [han_chars(word.get("character") or "") for word in words]
+    index = character_index(words)
+    dependencies: List[List[int]] = [[] for _ in words]
+    for position, word_chars in enumerate(chars):
+        if len(word_chars) != 1:
+            continue
+        for dependent in index[word_chars[0]]:
+            if len(chars[dependent]) > 1:
+                dependencies[dependent].append(position)
+    return dependencies
+
+
+def lesson_dependencies(groups: Sequence[Sequence[Dict[str, Any]]]) -> List[Set[int]]:
+    """Các bài (vị trí trong groups) mà từng bài phụ thuộc, bỏ phụ thuộc trong cùng bài"""
+    words = [word for group in groups for word in group]
+    lesson_of = [lesson for lesson, group in enumerate(groups) for _ in group]
+    requires: List[Set[int]] = [set() for _ in groups]
+    for position, dependencies in enumerate(word_dependencies(words)):
+        lesson = lesson_of[position]
+        for dependency in dependencies:
+            if lesson_of[dependency] != lesson:
+                requires[lesson].add(lesson_of[dependency])
+    return requires
+
+
+def order_lessons(groups: Sequence[List[Dict[str, Any]]]) -> Tuple[List[List[Dict[str, Any]]], List[Optional[int]]]:
+    """
+    Sắp các bài theo thứ tự topo của đồ thị phụ thuộc
+
+    Trả về (các bài theo thứ tự mới, lessonIndex của bài tiên quyết của từng bài)
+    """
+    requires = lesson_dependencies(groups)
+    dependents: List[List[int]] = [[] for _ in groups]
+    for lesson, required in enumerate(requires):
+        for dependency in required:
+            dependents[dependency].append(lesson)
+
+    remaining = [len(required) for required in requires]
+    ready = [lesson for lesson, count in enumerate(remaining) if count == 0]
+    heapq.heapify(ready)
+    placed = [False] * len(groups)
+    position: List[int] = [0] * len(groups)
+    order: List[int] = []
+    next_unplaced = 0
+
+    while len(order) < len(groups):
+        if ready:
+            lesson = heapq.heappop(ready)
+            if placed[lesson]:
+                continue
+        else:
+            # Chu trình: xếp bài đứng trước nhất còn lại
+            while placed[next_unplaced]:
+                next_unplaced += 1
+            lesson = next_unplaced
+        placed[lesson] = True
+        position[lesson] = len(order)
+        order.append(lesson)
+        for dependent in dependents[lesson]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0 and not placed[dependent]:
+                heapq.heappush(ready, dependent)
+
+    prerequisites: List[Optional[int]] = []
+    for index, lesson in enumerate(order):
+        earlier = [position[dependency] for dependency in requires[lesson] if position[dependency] < index]
+        if earlier:
+            prerequisites.append(max(earlier) + 1)
+        else:
+            prerequisites.append(index if index else None)
+    return [groups[lesson] for lesson in order], prerequisites
@@ -0,0 +1,154 @@
+"""
+Chia từ vựng thành các bài học (dùng chung cho convert_hsk1_to_seed_data.py
+và divide_vocabulary_into_lessons.py)
+
+Các cách chia:
+- "sequential": cắt theo thứ tự trong file, mỗi bài words_per_lesson từ (như trước)
+- "balanced":   cân bằng độ khó giữa các bài theo mô hình chi phí của từng từ
+                (số nét, tần suất, số chữ Hán mới), tham lam O(n log n)
+- "cluster":    gom các từ cùng chữ Hán / bộ thủ vào một bài (lesson_clustering.py, cần NumPy)
+
+Chi phí một từ (0-3, càng cao càng khó), trọng số chỉnh được qua CostWeights:
+    số nét / số nét lớn nhất + (100 - frequency) / 90 + số chữ chưa gặp ở các từ trước / số chữ của từ
+
+Cân bằng: sắp xếp từ theo chi phí giảm dần, lần lượt đưa mỗi từ vào bài có tổng chi phí
+nhỏ nhất còn chỗ (heap theo tổng chi phí), kích thước bài nằm trong [min_words, max_words].
+Trong mỗi bài từ giữ thứ tự gốc, các bài xếp theo vị trí từ đầu tiên trong file.
+
+Cách sử dụng:
+    groups = partition_words(words, "balanced", words_per_lesson=12, min_words=10, max_words=15)
+"""
+
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+PARTITION_MODES = ("sequential", "balanced", "cluster")
+
+DEFAULT_FREQUENCY = 50  # Từ chưa có frequency (thang 10-100)
+
+
+class CostWeights:
+    """Trọng số của mô hình chi phí"""
+
+    def __init__(self, strokes: float = 1.0, frequency: float = 1.0, novelty: float = 1.0):
+        self.strokes = strokes
+        self.frequency = frequency
+        self.novelty = novelty
+
+
+def han_chars(text: str) -> List[str]:
+    """Các chữ Hán trong text (bỏ BOM, chữ Latin, dấu câu)"""
+    return [c for c in text if "\u3400" <= c <= "\u9fff" or "\uf900" <= c <= "\ufaff"]
+
+
+def word_costs(words: Sequence[Dict[str, Any]], weights: Optional[CostWeights] = None) -> List[float]:
+    """
+    Chi phí học của từng từ: số nét (chuẩn hóa theo từ nhiều nét nhất), độ hiếm
+    (frequency thấp) và tỉ lệ chữ Hán mới (chưa xuất hiện ở các từ đứng trước)
+    """
+    weights = weights or CostWeights()
+    max_strokes = max((w.get("strokeCount") or 0 for w in words), default=0) or 1
+    seen = set()
+    costs = []
+    for word in words:
+        chars = han_chars(word.get("character") or "")
+        novel = [c for c in set(chars) if c not in seen]
+        seen.update(chars)
+        frequency = word.get("frequency") or DEFAULT_FREQUENCY
+        costs.append(
+            weights.strokes * (word.get("strokeCount") or 0) / max_strokes
+            + weights.frequency * max(0, 100 - frequency) / 90
+            + weights.novelty * (len(novel) / len(set(chars)) if chars else 0.0)
+        )
+    return costs
+
+
+def lesson_count(total_words: int, words_per_lesson: int, min_words: Optional[int] = None,
+                 max_words: Optional[int] = None) -> int:
+    """Số bài gần words_per_lesson từ/bài nhất mà mọi bài nằm trong [min_words, max_words]"""
+    if total_words == 0:
+        return 0
+    min_words = min_words or 1
+    max_words = max_words or max(words_per_lesson, min_words)
+    if min_words > max_words:
+        raise ValueError(f"min_words ({min_words}) lớn hơn max_words ({max_words})")
+    count = math.ceil(total_words / words_per_lesson)
+    count = max(count, math.ceil(total_words / max_words))
+    # Quá ít từ cho min_words (VD: 5 từ, tối thiểu 10): một bài chứa tất cả
+    return max(1, min(count, total_words // min_words))
+
+
+def lesson_sizes(total_words: int, words_per_lesson: int, min_words: Optional[int] = None,
+                 max_words: Optional[int] = None) -> List[int]:
+    """Số từ của từng bài khi chia đều (lệch nhau không quá 1 từ), các bài đầu nhận thêm phần dư"""
+    count = lesson_count(total_words, words_per_lesson, min_words, max_words)
+    if count == 0:
+        return []
+    base, extra = divmod(total_words, count)
+    return [base + (1 if i < extra else 0) for i in range(count)]
+
+
+def partition_sequential(words: Sequence[Dict[str, Any]], words_per_lesson: int) -> List[List[Dict[str, Any]]]:
+    """Cắt theo thứ tự trong file"""
+    return [list(words[i:i + words_per_lesson]) for i in range(0, len(words), words_per_lesson)]
+
+
+def partition_balanced(words: Sequence[Dict[str, Any]], words_per_lesson: int,
+                       min_words: Optional[int] = None, max_words: Optional[int] = None,
+                       weights: Optional[CostWeights] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Chia sao cho tổng chi phí các bài gần bằng nhau (tham lam kiểu LPT, O(n log n))
+
+    Kích thước các bài lệch nhau không quá 1 từ (số từ chia đều cho số bài).
+    """
+    capacity = lesson_sizes(len(words), words_per_lesson, min_words, max_words)
+    count = len(capacity)
+    if count == 0:
+        return []
+    costs = word_costs(words, weights)
+
+    members: List[List[int]] = [[] for _ in range(count)]
+    heap = [(0.0, i) for i in range(count)]  # (tổng chi phí, bài)
+    for index in sorted(range(len(words)), key=costs.__getitem__, reverse=True):
+        load, lesson = heapq.heappop(heap)
+        members[lesson].append(index)
+        if len(members[lesson]) < capacity[lesson]:
+            heapq.heappush(heap, (load + costs[index], lesson))
+
+    groups = [sorted(indexes) for indexes in members]
+    groups.sort(key=lambda indexes: indexes[0])
+    return [[words[i] for i in indexes] for indexes in groups]
+
+
+def partition_words(words: Sequence[Dict[str, Any]], mode: str = "sequential", words_per_lesson: int = 12,
+                    min_words: Optional[int] = None, max_words: Optional[int] = None,
+                    weights: Optional[CostWeights] = None) -> List[List[Dict[str, Any]]]:
+    """Chia từ vựng thành các nhóm (mỗi nhóm một bài) theo cách chia mode"""
+    if mode == "sequential":
+        return partition_sequential(words, words_per_lesson)
+    if mode == "balanced":
+        return partition_balanced(words, words_per_lesson, min_words, max_words, weights)
+    if mode == "cluster":
+        # Import khi dùng: chỉ chế độ này cần NumPy
+        from lesson_clustering import cluster_words
+        return cluster_words(words, lesson_sizes(len(words), words_per_lesson, min_words, max_words))
+    raise ValueError(f"Cách chia bài không hỗ trợ: {mode} (chọn một trong {', '.join(PARTITION_MODES)})")
+
+
+def lesson_cost_spread(words: Sequence[Dict[str, Any]], groups: List[List[Dict[str, Any]]],
+                       weights: Optional[CostWeights] = None) -> Dict[str, float]:
+    """
+    Thống kê tổng chi phí các bài (để so sánh các cách chia): min, max, độ lệch chuẩn
+    Chi phí tính trên thứ tự gốc words, groups là kết quả chia của chính các từ đó.
+    """
+    cost_by_word = {id(word): cost for word, cost in zip(words, word_costs(words, weights))}
+    totals = [sum(cost_by_word[id(word)] for word in group) for group in groups]
+    if not totals:
+        return {"min": 0.0, "max": 0.0, "stdev": 0.0}
+    mean = sum(totals) / len(totals)
+    return {
+        "min": min(totals),
+        "max": max(totals),
+        "stdev": math.sqrt(sum((t - mean) ** 2 for t in totals) / len(totals)),
+    }
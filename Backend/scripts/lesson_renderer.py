@@ -0,0 +1,124 @@
+"""
+Render tiêu đề và nội dung HTML của bài học (dùng chung cho convert_hsk1_to_seed_data.py
+và divide_vocabulary_into_lessons.py)
+
+Template được kiểm tra và chuyển một lần khi tạo LessonTemplate: dòng HTML của mỗi từ
+({character}, {pinyin}, {meaning}) thành chuỗi str.format đánh số tự động ("{}"), lặp
+theo số từ của bài (lưu sẵn theo từng số từ) nên cả bài chỉ cần một lần format.
+Giá trị của từ được escape bằng html.escape(quote=False) (&, < và >, đủ cho nội dung
+text trong thẻ); nhánh nhanh: bài không có giá trị nào chứa các ký tự này thì không gọi
+escape, có thì chỉ escape giá trị chứa chúng.
+
+Chậm hơn cách cộng chuỗi cũ (không escape) khoảng 1,8 lần, xem benchmark_lesson_rendering.py.
+
+Cách sử dụng:
+    renderer = get_lesson_renderer()
+    renderer.title(1, words)           # "Bài 1: 爱, 八 và các từ liên quan"
+    renderer.content(words)            # "<h2>Học 12 từ vựng</h2>\\n..."
+    renderer.render_contents(batches)  # Nội dung của nhiều bài một lượt
+"""
+
+import html
+import string
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_HEADER = "<h2>Học {count} từ vựng</h2>\n<p>Trong bài học này, bạn sẽ học các từ vựng sau:</p>\n<ul>\n"
+DEFAULT_ITEM = "<li><strong>{character}</strong> ({pinyin}) - {meaning}</li>\n"
+DEFAULT_FOOTER = "</ul>"
+
+
+def escape_html(text: Any) -> str:
+    """Escape &, < và > trong nội dung text của thẻ HTML"""
+    return html.escape(str(text), quote=False)
+
+
+def _compile_template(template: str, allowed: Optional[Tuple[str, ...]] = None) -> Tuple[str, List[str]]:
+    """
+    Chuyển template có placeholder theo tên thành chuỗi format đánh số tự động:
+    "<b>{character}</b> {pinyin}" -> ("<b>{}</b> {}", ["character", "pinyin"])
+
+    Lỗi ValueError nếu placeholder không phải tên trường đơn giản (hoặc không thuộc allowed).
+    """
+    parts = []
+    fields: List[str] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion or (allowed is not None and field not in allowed):
+            raise ValueError(f"Placeholder không hỗ trợ trong template: {{{field}}}")
+        parts.append("{}")
+        fields.append(field)
+    return "".join(parts), fields
+
+
+class LessonTemplate:
+    """Template HTML của một bài: header ({count} = số từ), mỗi từ một item, footer"""
+
+    def __init__(self, header: str = DEFAULT_HEADER, item: str = DEFAULT_ITEM, footer: str = DEFAULT_FOOTER):
+        self.header, header_fields = _compile_template(header, allowed=("count",))
+        self.header_slots = len(header_fields)  # Số lần {count} xuất hiện
+        self.item, self.fields = _compile_template(item)
+        footer_format, _ = _compile_template(footer, allowed=())
+        self.footer = footer_format.format()  # Không có placeholder nên render sẵn
+        self._bodies: Dict[int, str] = {}  # Số từ -> item lặp lại (chuỗi format của cả bài)
+
+    def render(self, words: Sequence[Dict[str, Any]]) -> str:
+        """Nội dung HTML của một bài"""
+        count = len(words)
+        body = self._bodies.get(count)
+        if body is None:
+            body = self._bodies[count] = self.item * count
+
+        fields = self.fields
+        values = [w.get(field, "") for w in words for field in fields]
+        try:
+            text = "".join(values)
+        except TypeError:  # Có giá trị không phải chuỗi (số, None)
+            values = [str(value) for value in values]
+            text = "".join(values)
+        if "&" in text or "<" in text or ">" in text:
+            escape = html.escape
+            values = [escape(value, quote=False) if "&" in value or "<" in value or ">" in value else value
+                      for value in values]
+        return self.header.format(*[count] * self.header_slots) + body.format(*values) + self.footer
+
+
+class LessonRenderer:
+    """Render bài học theo một LessonTemplate đã biên dịch"""
+
+    def __init__(self, template: Optional[LessonTemplate] = None):
+        self.template = template or LessonTemplate()
+
+    def topic(self, words: Sequence[Dict[str, Any]]) -> str:
+        """Chủ đề bài học dựa trên các từ vựng đầu tiên"""
+        titles = [w.get("character") for w in words[:3] if w.get("character")]
+        if len(titles) >= 2:
+            return f"{titles[0]}, {titles[1]} và các từ liên quan"
+        if len(titles) == 1:
+            return f"{titles[0]} và các từ cơ bản"
+        return "Từ vựng cơ bản"
+
+    def title(self, lesson_index: int, words: Sequence[Dict[str, Any]]) -> str:
+        """Tiêu đề bài học: "Bài N: <chủ đề>" """
+        return f"Bài {lesson_index}: {self.topic(words)}"
+
+    def content(self, words: Sequence[Dict[str, Any]]) -> str:
+        """Nội dung HTML của một bài học"""
+        return self.template.render(words)
+
+    def render_contents(self, lessons: Iterable[Sequence[Dict[str, Any]]]) -> List[str]:
+        """Nội dung HTML của nhiều bài (mỗi phần tử là danh sách từ của một bài)"""
+        render = self.template.render
+        return [render(words) for words in lessons]
+
+
+_lesson_renderer: Optional[LessonRenderer] = None
+
+
+def get_lesson_renderer() -> LessonRenderer:
+    """LessonRenderer dùng chung với template mặc định"""
+    global _lesson_renderer
+    if _lesson_renderer is None:
+        _lesson_renderer = LessonRenderer()
+    return _lesson_renderer
@@ -0,0 +1,133 @@
+"""
+Build seed data tăng dần theo hash nội dung
+
+Mỗi word của seed data (đã chuẩn hóa, chưa gán ID) được hash, fingerprint của
+một bài học là hash của các word trong bài cùng vị trí bài và phiên bản renderer.
+Bài học đã render ở lần build trước được lưu trong file SQLite cạnh file seed
+(seed-data-hsk{N}.build.db): bài có fingerprint không đổi được dùng lại, chỉ bài
+có word thay đổi mới render lại nội dung HTML.
+
+Danh sách bài thay đổi / thêm mới / bị xóa được ghi ra seed-data-hsk{N}.changes.json
+để chỉ seed lại những bài cần thiết.
+
+Cách sử dụng:
+    state = SeedBuildState(Path("../data/seed-data-hsk1.json"), LESSON_RENDER_VERSION)
+    lesson = state.lookup(lesson_id, fingerprint)
+    if lesson is None:
+        lesson = render(...)
+        state.store(lesson_id, fingerprint, lesson)
+    changes = state.finish()  # Sau khi ghi xong file seed
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Trường được gán khi chia bài, không thuộc nội dung của word
+_ASSIGNED_FIELDS = ("id", "lessonId")
+
+
+def word_hash(word: Dict[str, Any]) -> str:
+    """Hash của bản ghi word đã chuẩn hóa (thứ tự key cố định, bỏ id/lessonId)"""
+    record = {k: v for k, v in word.items() if k not in _ASSIGNED_FIELDS}
+    text = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def lesson_fingerprint(lesson_id: int, lesson_index: int, course_id: int, hsk_level: int,
+                       word_hashes: List[str], prerequisite_id: Optional[int] = None) -> str:
+    """Fingerprint của một bài học: vị trí bài, bài tiên quyết và hash các word theo thứ tự"""
+    digest = hashlib.sha1(f"{lesson_id}:{lesson_index}:{course_id}:{hsk_level}:{prerequisite_id}".encode("utf-8"))
+    for value in word_hashes:
+        digest.update(b"\n" + value.encode("ascii"))
+    return digest.hexdigest()
+
+
+def build_state_path(output_path: Path) -> Path:
+    """seed-data-hsk1.json -> seed-data-hsk1.build.db"""
+    return output_path.with_name(output_path.stem + ".build.db")
+
+
+def changes_path(output_path: Path) -> Path:
+    """seed-data-hsk1.json -> seed-data-hsk1.changes.json"""
+    return output_path.with_name(output_path.stem + ".changes.json")
+
+
+class SeedBuildState:
+    """
+    Bài học đã render ở lần build trước (SQLite cạnh file seed), nạp vào dict để tra O(1)
+
+    Thay đổi chỉ được commit khi finish(): build lỗi giữa chừng không làm hỏng state.
+    """
+
+    def __init__(self, output_path: Path, render_version: int):
+        self.db_path = build_state_path(Path(output_path))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS lessons (lesson_id INTEGER PRIMARY KEY,
+                                                fingerprint TEXT NOT NULL, lesson TEXT NOT NULL);
+            """
+        )
+
+        # Renderer đổi thì mọi bài phải render lại
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'render_version'").fetchone()
+        self.invalidated = row is not None and row[0] != str(render_version)
+        if row is None or self.invalidated:
+            self.conn.execute("DELETE FROM lessons")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('render_version', ?)",
+                              (str(render_version),))
+            self.conn.commit()
+
+        self._previous: Dict[int, Tuple[str, str]] = {
+            lesson_id: (fingerprint, lesson)
+            for lesson_id, fingerprint, lesson in self.conn.execute(
+                "SELECT lesson_id, fingerprint, lesson FROM lessons")
+        }
+        self._seen: Set[int] = set()
+        self.reused = 0
+        self.changed: List[int] = []  # Bài đã có ở lần build trước nhưng nội dung đổi
+        self.added: List[int] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def lookup(self, lesson_id: int, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Bài học đã render nếu fingerprint không đổi, None nếu cần render lại"""
+        self._seen.add(lesson_id)
+        previous = self._previous.get(lesson_id)
+        if previous is not None and previous[0] == fingerprint:
+            self.reused += 1
+            return json.loads(previous[1])
+        return None
+
+    def store(self, lesson_id: int, fingerprint: str, lesson: Dict[str, Any]):
+        """Lưu bài vừa render lại (commit khi finish)"""
+        self._seen.add(lesson_id)
+        (self.changed if lesson_id in self._previous else self.added).append(lesson_id)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO lessons (lesson_id, fingerprint, lesson) VALUES (?, ?, ?)",
+            (lesson_id, fingerprint, json.dumps(lesson, ensure_ascii=False)),
+        )
+
+    def finish(self) -> Dict[str, List[int]]:
+        """Xóa bài không còn trong build này, commit và trả về danh sách bài thay đổi"""
+        removed = sorted(set(self._previous) - self._seen)
+        self.conn.executemany("DELETE FROM lessons WHERE lesson_id = ?", ((i,) for i in removed))
+        self.conn.commit()
+        return {
+            "changedLessons": sorted(self.changed),
+            "addedLessons": sorted(self.added),
+            "removedLessons": removed,
+        }
+
+    def close(self):
+        self.conn.close()
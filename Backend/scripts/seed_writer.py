@@ -0,0 +1,235 @@
+"""
+Ghi file seed data theo kiểu stream (không giữ toàn bộ seed data trong bộ nhớ)
+
+Lesson được ghi thẳng ra file ngay khi tạo, word được ghi tạm ra file spool
+rồi nối vào sau mảng lessons khi đóng, nên bộ nhớ chỉ phụ thuộc một bài học.
+
+Các format:
+- "json":    JSON thụt lề 2 (giống json.dump(..., indent=2) trước đây)
+- "compact": JSON không khoảng trắng thừa (nhỏ hơn nhiều, DataSeeder vẫn đọc được)
+- "ndjson":  mỗi dòng một bản ghi {"section": "words", "data": {...}}
+
+Tùy chọn tạo thêm file nén sẵn bên cạnh: .gz (gzip) và .br (cần package brotli).
+Nếu nội dung giống hệt file đang có, file cũ được giữ nguyên (không đổi mtime,
+không nén lại) để các bước sau biết là không có gì thay đổi.
+
+Cách sử dụng:
+    with SeedWriter(Path("seed-data-hsk1.json"), "compact", compress=("gzip",)) as writer:
+        writer.write_section("courseCategories", categories)
+        writer.write_section("courses", courses)
+        for lesson, lesson_words in lessons:
+            writer.add_lesson(lesson)
+            for word in lesson_words:
+                writer.add_word(word)
+        writer.write_section("questions", [])
+"""
+
+import filecmp
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # brotli là tùy chọn
+    brotli = None
+
+SEED_FORMATS = ("json", "compact", "ndjson")
+COMPRESSIONS = ("gzip", "brotli")
+_CHUNK_SIZE = 1024 * 1024
+
+
+def seed_file_suffix(fmt: str) -> str:
+    return ".ndjson" if fmt == "ndjson" else ".json"
+
+
+class SeedWriter:
+    """
+    Ghi một file seed data: các section nhỏ (courseCategories, courses, questions)
+    ghi bằng write_section(), lessons và words ghi từng bản ghi bằng add_lesson()/add_word()
+
+    File được ghi ra .tmp rồi đổi tên khi close(), không để lại file dở nếu bị lỗi.
+    """
+
+    def __init__(self, path: Path, fmt: str = "compact", compress: Sequence[str] = ()):
+        if fmt not in SEED_FORMATS:
+            raise ValueError(f"Format không hỗ trợ: {fmt} (chọn một trong {', '.join(SEED_FORMATS)})")
+        unknown = set(compress) - set(COMPRESSIONS)
+        if unknown:
+            raise ValueError(f"Kiểu nén không hỗ trợ: {', '.join(sorted(unknown))}")
+
+        self.path = Path(path)
+        self.fmt = fmt
+        self.compress = tuple(compress)
+        self.lesson_count = 0
+        self.word_count = 0
+        self.outputs: List[Path] = []  # Các file đã ghi (file chính + file nén)
+        self.unchanged = False  # Nội dung giống file đang có, file cũ được giữ nguyên
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        self._file: IO[str] = open(self._tmp_path, "w", encoding="utf-8")
+        self._words_spool: Optional[IO[str]] = None
+        self._sections_written = 0
+        self._lessons_open = False
+        self._late_sections: List[tuple] = []  # Section gọi sau khi đã bắt đầu lessons, ghi khi đóng
+
+        if self.fmt != "ndjson":
+            self._file.write("{" if self.fmt == "compact" else "{\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # ============ ENCODING ============
+
+    def _encode(self, item: Any) -> str:
+        if self.fmt == "compact":
+            return json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+        # Thụt lề như phần tử của mảng trong json.dump(indent=2): 4 khoảng trắng
+        return "    " + json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+
+    def _ndjson_line(self, section: str, item: Any) -> str:
+        return json.dumps({"section": section, "data": item}, ensure_ascii=False,
+                          separators=(",", ":")) + "\n"
+
+    def _open_array(self, out: IO[str], name: str):
+        """Mở mảng name trong object JSON (thêm dấu phẩy nếu không phải section đầu)"""
+        if self.fmt == "compact":
+            out.write(("," if self._sections_written else "") + json.dumps(name) + ":[")
+        else:
+            out.write((",\n" if self._sections_written else "") + f"  {json.dumps(name)}: [")
+        self._sections_written += 1
+
+    def _close_array(self, out: IO[str], count: int):
+        if self.fmt == "compact" or count == 0:
+            out.write("]")
+        else:
+            out.write("\n  ]")
+
+    def _write_item(self, out: IO[str], item: Any, index: int):
+        if self.fmt == "compact":
+            out.write(("," if index else "") + self._encode(item))
+        else:
+            out.write((",\n" if index else "\n") + self._encode(item))
+
+    # ============ WRITE ============
+
+    def write_section(self, name: str, items: List[Any]):
+        """Ghi một section nhỏ (ghi ngay nếu chưa bắt đầu lessons, không thì ghi sau words)"""
+        if self.fmt == "ndjson":
+            for item in items:
+                self._file.write(self._ndjson_line(name, item))
+            return
+        if self._lessons_open:
+            self._late_sections.append((name, items))
+            return
+        self._write_array(name, items)
+
+    def _write_array(self, name: str, items: List[Any]):
+        self._open_array(self._file, name)
+        for index, item in enumerate(items):
+            self._write_item(self._file, item, index)
+        self._close_array(self._file, len(items))
+
+    def add_lesson(self, lesson: Dict[str, Any]):
+        if self.fmt == "ndjson":
+            self._file.write(self._ndjson_line("lessons", lesson))
+        else:
+            if not self._lessons_open:
+                self._open_array(self._file, "lessons")
+                self._lessons_open = True
+            self._write_item(self._file, lesson, self.lesson_count)
+        self.lesson_count += 1
+
+    def add_word(self, word: Dict[str, Any]):
+        if self.fmt == "ndjson":
+            self._file.write(self._ndjson_line("words", word))
+        else:
+            if self._words_spool is None:
+                self._words_spool = tempfile.TemporaryFile("w+", encoding="utf-8", dir=self.path.parent)
+            self._write_item(self._words_spool, word, self.word_count)
+        self.word_count += 1
+
+    # ============ CLOSE ============
+
+    def close(self):
+        """Kết thúc file (nối words từ spool), đổi tên và tạo các file nén"""
+        if self.fmt != "ndjson":
+            if not self._lessons_open:
+                self._open_array(self._file, "lessons")
+            self._close_array(self._file, self.lesson_count)
+
+            self._open_array(self._file, "words")
+            if self._words_spool is not None:
+                self._words_spool.seek(0)
+                shutil.copyfileobj(self._words_spool, self._file, _CHUNK_SIZE)
+                self._words_spool.close()
+            self._close_array(self._file, self.word_count)
+
+            for name, items in self._late_sections:
+                self._write_array(name, items)
+            self._file.write("}" if self.fmt == "compact" else "\n}")
+
+        self._file.close()
+        if self.path.exists() and filecmp.cmp(self._tmp_path, self.path, shallow=False):
+            self._tmp_path.unlink()
+            self.unchanged = True
+        else:
+            self._tmp_path.replace(self.path)
+        self.outputs = [self.path]
+
+        for method in self.compress:
+            existing = compressed_path(self.path, method)
+            if self.unchanged and existing.exists():
+                self.outputs.append(existing)
+                continue
+            compressed = compress_file(self.path, method)
+            if compressed is not None:
+                self.outputs.append(compressed)
+
+    def abort(self):
+        """Hủy file đang ghi"""
+        self._file.close()
+        if self._words_spool is not None:
+            self._words_spool.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def compressed_path(path: Path, method: str) -> Path:
+    return path.with_name(path.name + (".gz" if method == "gzip" else ".br"))
+
+
+def compress_file(path: Path, method: str) -> Optional[Path]:
+    """
+    Tạo file nén bên cạnh (path.gz / path.br) theo kiểu stream, trả về None nếu
+    không có thư viện. File gzip không ghi mtime để nội dung ổn định giữa các lần build.
+    """
+    if method == "gzip":
+        output = compressed_path(path, method)
+        with open(path, "rb") as src, open(output, "wb") as raw:
+            with gzip.GzipFile(filename="", mode="wb", compresslevel=9, fileobj=raw, mtime=0) as dst:
+                shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+        return output
+
+    if method == "brotli":
+        if brotli is None:
+            print("   ⚠️  Chưa cài package brotli (pip install brotli), bỏ qua file .br")
+            return None
+        output = compressed_path(path, method)
+        compressor = brotli.Compressor(quality=11)
+        with open(path, "rb") as src, open(output, "wb") as dst:
+            for chunk in iter(lambda: src.read(_CHUNK_SIZE), b""):
+                dst.write(compressor.process(chunk))
+            dst.write(compressor.finish())
+        return output
+
+    raise ValueError(f"Kiểu nén không hỗ trợ: {method}")
@@ -0,0 +1,232 @@
+"""
+Bảng số nét chữ Hán (từ Unihan kTotalStrokes) lưu dạng mảng byte theo codepoint,
+cùng bảng bộ thủ (số thứ tự 1-214 trong Khang Hy, từ Unihan kRSUnicode) cùng format
+
+Bảng phủ CJK Unified Ideographs (U+4E00-U+9FFF) cùng Extension A liền kề
+(U+3400-U+4DBF): mỗi codepoint một byte (0 = không có dữ liệu), tổng ~27 KB.
+File được mmap ở lần tra đầu tiên, tra một chữ là đọc một byte tại
+(codepoint - FIRST_CODEPOINT), không tốn thời gian khởi động.
+
+Format file:
+    header : magic b"HSKSTRK1" (bảng bộ thủ: b"HSKRADL1"), uint32 codepoint đầu, uint32 số codepoint
+    data   : uint8 x số codepoint
+
+Cách sử dụng:
+    python stroke_table.py [đường dẫn Unihan_IRGSources.txt]
+
+    table = get_stroke_table()
+    if table is not None:
+        table.word_strokes("你好")  # 13
+
+    radicals = get_radical_table()
+    if radicals is not None:
+        radicals.radical("妈")  # 38 (女)
+
+Tải Unihan: https://www.unicode.org/Public/UCD/latest/ucd/Unihan.zip
+(giải nén Unihan_IRGSources.txt vào Backend/data)
+"""
+
+import mmap
+import struct
+import sys
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_SOURCE_FILE = DATA_DIR / "Unihan_IRGSources.txt"
+DEFAULT_TABLE_FILE = DATA_DIR / "stroke_table.bin"
+DEFAULT_RADICAL_FILE = DATA_DIR / "radical_table.bin"
+
+MAGIC = b"HSKSTRK1"
+RADICAL_MAGIC = b"HSKRADL1"
+_HEADER = struct.Struct("<8sII")
+FIRST_CODEPOINT = 0x3400  # Extension A
+LAST_CODEPOINT = 0x9FFF  # Hết CJK Unified Ideographs
+
+
+def _parse_strokes(value: str) -> int:
+    # Nhiều giá trị (VD: "8 9"): giá trị đầu là số nét theo chuẩn giản thể (zh-Hans)
+    return int(value.split()[0])
+
+
+def _parse_radical(value: str) -> int:
+    # "38.3" (bộ 38, thêm 3 nét), "120'.3" (dạng giản thể của bộ 120): lấy số bộ của giá trị đầu
+    return int(value.split()[0].split(".")[0].rstrip("'"))
+
+
+def _build_table(source_path: Path, output_path: Path, field: str, parse, magic: bytes) -> int:
+    """Build bảng một byte / codepoint từ trường field của file Unihan, trả về số chữ có dữ liệu"""
+    count = LAST_CODEPOINT - FIRST_CODEPOINT + 1
+    table = bytearray(count)
+    filled = 0
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("U+"):
+                continue
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 3 or parts[1] != field:
+                continue
+            codepoint = int(parts[0][2:], 16)
+            if not FIRST_CODEPOINT <= codepoint <= LAST_CODEPOINT:
+                continue
+            table[codepoint - FIRST_CODEPOINT] = min(parse(parts[2]), 255)
+            filled += 1
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(magic, FIRST_CODEPOINT, count))
+        f.write(table)
+    tmp_path.replace(output_path)
+    return filled
+
+
+def build_stroke_table(source_path: Path, output_path: Path = DEFAULT_TABLE_FILE) -> int:
+    """
+    Build bảng từ file Unihan có trường kTotalStrokes, trả về số chữ có dữ liệu
+
+    Dòng Unihan: "U+4E00<TAB>kTotalStrokes<TAB>1".
+    """
+    return _build_table(source_path, output_path, "kTotalStrokes", _parse_strokes, MAGIC)
+
+
+def build_radical_table(source_path: Path, output_path: Path = DEFAULT_RADICAL_FILE) -> int:
+    """
+    Build bảng bộ thủ từ trường kRSUnicode (cùng file Unihan_IRGSources.txt), trả về số chữ có dữ liệu
+
+    Dòng Unihan: "U+5988<TAB>kRSUnicode<TAB>38.3".
+    """
+    return _build_table(source_path, output_path, "kRSUnicode", _parse_radical, RADICAL_MAGIC)
+
+
+class StrokeTable:
+    """Bảng số nét read-only, mmap khi tra lần đầu"""
+
+    MAGIC = MAGIC
+
+    def __init__(self, path: Path = DEFAULT_TABLE_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._first = 0
+        self._count = 0
+
+    def _open(self) -> mmap.mmap:
+        with self._lock:
+            if self._mm is None:
+                self._file = open(self.path, "rb")
+                mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, first, count = _HEADER.unpack_from(mm, 0)
+                if magic != self.MAGIC:
+                    mm.close()
+                    self._file.close()
+                    raise ValueError(f"{self.path} không phải file {self.MAGIC!r} ({magic!r})")
+                self._first = first
+                self._count = count
+                self._mm = mm
+        return self._mm
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._file.close()
+                self._mm = None
+
+    def _value(self, char: str) -> Optional[int]:
+        mm = self._mm or self._open()
+        offset = ord(char) - self._first
+        if 0 <= offset < self._count:
+            return mm[_HEADER.size + offset] or None
+        return None
+
+    def strokes(self, char: str) -> Optional[int]:
+        """Số nét của một chữ, None nếu ngoài bảng hoặc không có dữ liệu"""
+        return self._value(char)
+
+    def word_strokes(self, word: str) -> Optional[int]:
+        """
+        Tổng số nét của một từ (bỏ qua ký tự không phải chữ như BOM, chữ Latin, dấu câu),
+        None nếu có chữ không tra được
+        """
+        total = 0
+        found = False
+        for char in word:
+            if unicodedata.category(char) != "Lo":
+                continue
+            strokes = self.strokes(char)
+            if strokes is None:
+                return None
+            total += strokes
+            found = True
+        return total if found else None
+
+
+class RadicalTable(StrokeTable):
+    """Bảng bộ thủ read-only (cùng format với bảng số nét)"""
+
+    MAGIC = RADICAL_MAGIC
+
+    def __init__(self, path: Path = DEFAULT_RADICAL_FILE):
+        super().__init__(path)
+
+    def radical(self, char: str) -> Optional[int]:
+        """Số thứ tự bộ thủ (1-214) của một chữ, None nếu ngoài bảng hoặc không có dữ liệu"""
+        return self._value(char)
+
+
+_stroke_table: Optional[StrokeTable] = None
+_stroke_table_checked = False
+_radical_table: Optional[RadicalTable] = None
+_radical_table_checked = False
+
+
+def get_stroke_table() -> Optional[StrokeTable]:
+    """StrokeTable dùng chung, None nếu chưa build file DEFAULT_TABLE_FILE"""
+    global _stroke_table, _stroke_table_checked
+    if not _stroke_table_checked:
+        _stroke_table_checked = True
+        if DEFAULT_TABLE_FILE.exists():
+            _stroke_table = StrokeTable(DEFAULT_TABLE_FILE)
+    return _stroke_table
+
+
+def get_radical_table() -> Optional[RadicalTable]:
+    """RadicalTable dùng chung, None nếu chưa build file DEFAULT_RADICAL_FILE"""
+    global _radical_table, _radical_table_checked
+    if not _radical_table_checked:
+        _radical_table_checked = True
+        if DEFAULT_RADICAL_FILE.exists():
+            _radical_table = RadicalTable(DEFAULT_RADICAL_FILE)
+    return _radical_table
+
+
+def main():
+    source_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SOURCE_FILE
+    if not source_path.exists():
+        print(f"❌ Không tìm thấy file Unihan: {source_path}")
+        print("   Tải https://www.unicode.org/Public/UCD/latest/ucd/Unihan.zip "
+              "và giải nén Unihan_IRGSources.txt vào Backend/data")
+        sys.exit(1)
+
+    filled = build_stroke_table(source_path, DEFAULT_TABLE_FILE)
+    print(f"✅ Đã build {DEFAULT_TABLE_FILE} ({DEFAULT_TABLE_FILE.stat().st_size:,} bytes, {filled:,} chữ)")
+
+    radicals = build_radical_table(source_path, DEFAULT_RADICAL_FILE)
+    print(f"✅ Đã build {DEFAULT_RADICAL_FILE} ({radicals:,} chữ có bộ thủ)")
+
+    table = StrokeTable(DEFAULT_TABLE_FILE)
+    radical_table = RadicalTable(DEFAULT_RADICAL_FILE)
+    for word in ("你好", "爱", "北京"):
+        print(f"   {word}: {table.word_strokes(word)} nét, bộ thủ {[radical_table.radical(c) for c in word]}")
+    table.close()
+    radical_table.close()
+
+
+if __name__ == "__main__":
+    main()
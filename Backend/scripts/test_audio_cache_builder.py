@@ -0,0 +1,163 @@
+"""
+Kiểm tra AudioCacheBuilder.build với TTS endpoint giả lập (http.server local, không cần mạng)
+
+- Từ có audio giống hệt nhau dùng chung một file (tên file = sha256 nội dung)
+- Chạy lại chỉ tải các từ còn thiếu (chưa có trong manifest, file bị xóa, lần trước lỗi)
+- Lỗi ghi file hoặc lỗi bất ngờ giữa chừng vẫn ghi manifest cho các từ đã tải
+
+Cách sử dụng:
+python -m unittest test_audio_cache_builder
+"""
+
+import hashlib
+import json
+import tempfile
+import threading
+import unittest
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from audio_cache_builder import MANIFEST_FILE, AudioCacheBuilder, AudioManifest
+
+# Từ -> bytes audio trả về; 爸爸 và 妈妈 cùng nội dung để kiểm tra dùng chung file
+AUDIO = {
+    "你": b"ID3 audio ni",
+    "好": b"ID3 audio hao",
+    "爸爸": b"ID3 audio shared",
+    "妈妈": b"ID3 audio shared",
+    "再见": b"ID3 audio zaijian",
+}
+
+
+class FakeTTSHandler(BaseHTTPRequestHandler):
+    requests = Counter()  # Từ -> số request nhận được
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        text = query.get("q", [""])[0]
+        with self.lock:
+            self.requests[text] += 1
+        data = AUDIO.get(text)
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AudioCacheBuilderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTTSHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}/tts?q={{text}}&lang={{lang}}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.audio_dir = Path(self.tmp.name)
+        FakeTTSHandler.requests.clear()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, texts, builder_class=AudioCacheBuilder):
+        builder = builder_class(self.audio_dir, self.endpoint, workers=4)
+        return builder, builder.build(texts)
+
+    def manifest_entries(self):
+        manifest = json.loads((self.audio_dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+        return manifest["entries"]
+
+    def audio_files(self):
+        return sorted(path.name for path in self.audio_dir.iterdir() if path.name != MANIFEST_FILE)
+
+    def test_identical_audio_is_stored_once(self):
+        builder, (done, failed) = self.build(["你", "好", "爸爸", "妈妈"])
+
+        self.assertEqual(done, 4)
+        self.assertEqual(failed, [])
+        self.assertEqual(builder.entries["爸爸"], builder.entries["妈妈"])
+        self.assertEqual(len(self.audio_files()), 3)
+        for text, filename in builder.entries.items():
+            self.assertEqual(filename, hashlib.sha256(AUDIO[text]).hexdigest() + ".mp3")
+            self.assertEqual((self.audio_dir / filename).read_bytes(), AUDIO[text])
+
+        manifest = json.loads((self.audio_dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+        self.assertEqual((manifest["words"], manifest["files"]), (4, 3))
+        self.assertEqual(AudioManifest(self.audio_dir / MANIFEST_FILE).url("\ufeff爸爸 "),
+                         "/audio/" + builder.entries["爸爸"])
+
+    def test_rerun_fetches_only_missing_words(self):
+        _, (done, failed) = self.build(["你", "好", "爸爸", "không có"])
+        self.assertEqual(done, 3)
+        self.assertEqual([text for text, _ in failed], ["không có"])
+
+        FakeTTSHandler.requests.clear()
+        builder, (done, failed) = self.build(["你", "好", "爸爸", "妈妈", "再见", "không có"])
+
+        # Chỉ từ mới và từ lỗi lần trước được gửi lại, mỗi từ một request
+        self.assertEqual(FakeTTSHandler.requests, Counter({"妈妈": 1, "再见": 1, "không có": 1}))
+        self.assertEqual(done, 2)
+        self.assertEqual([text for text, _ in failed], ["không có"])
+        self.assertNotIn("không có", builder.entries)
+        self.assertEqual(len(self.audio_files()), 4)
+
+    def test_rerun_refetches_deleted_file(self):
+        builder, _ = self.build(["你", "好"])
+        (self.audio_dir / builder.entries["好"]).unlink()
+
+        FakeTTSHandler.requests.clear()
+        _, (done, failed) = self.build(["你", "好"])
+
+        self.assertEqual(FakeTTSHandler.requests, Counter({"好": 1}))
+        self.assertEqual((done, failed), (1, []))
+        self.assertEqual(len(self.audio_files()), 2)
+
+    def test_write_error_is_recorded_as_failed(self):
+        class DiskFullBuilder(AudioCacheBuilder):
+            def store(self, data, extension):
+                if data == AUDIO["好"]:
+                    raise OSError(28, "No space left on device")
+                return super().store(data, extension)
+
+        builder, (done, failed) = self.build(["你", "好", "再见"], DiskFullBuilder)
+
+        self.assertEqual(done, 2)
+        self.assertEqual([text for text, _ in failed], ["好"])
+        self.assertEqual(sorted(self.manifest_entries()), sorted(["你", "再见"]))
+        self.assertEqual(len(self.audio_files()), 2)  # Không còn file .tmp dở
+
+    def test_unexpected_error_still_writes_manifest(self):
+        class BrokenBuilder(AudioCacheBuilder):
+            def _fetch_and_store(self, text):
+                if text == "好":
+                    raise RuntimeError("lỗi bất ngờ")
+                return super()._fetch_and_store(text)
+
+        with self.assertRaises(RuntimeError):
+            self.build(["你", "好"], BrokenBuilder)
+        self.assertIn("你", self.manifest_entries())
+
+        FakeTTSHandler.requests.clear()
+        _, (done, failed) = self.build(["你", "好"])
+        self.assertEqual(FakeTTSHandler.requests, Counter({"好": 1}))
+        self.assertEqual((done, failed), (1, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
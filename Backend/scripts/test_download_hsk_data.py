@@ -0,0 +1,207 @@
+"""
+Kiểm tra download_hsk_data.py với HTTP server giả lập (http.server local, không cần mạng)
+
+Server phục vụ 6 file hsk{N}.json có ETag / Last-Modified và trả 304 cho request có điều kiện:
+- Lần tải đầu ghi nguyên bytes và manifest (ETag, số từ, sha1)
+- --force tải lại mọi file, không gửi request có điều kiện
+- Chạy lại: mọi file nhận 304, không tải lại
+- Đổi nội dung một file trên server: chỉ file đó được tải lại
+- Server trả nội dung hỏng: báo lỗi, bản mirror và manifest cũ giữ nguyên
+
+Cách sử dụng:
+python -m unittest test_download_hsk_data
+"""
+
+import contextlib
+import email.utils
+import hashlib
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from download_hsk_data import HSK_DATA_SOURCES, MIRROR_MANIFEST_FILE, download_hsk_data
+
+SOURCE_NAME = "local_test"
+LEVELS = range(1, 7)
+WORDS = 50
+
+
+def level_file(level: int, version: int = 1) -> bytes:
+    items = [{"id": i, "hanzi": chr(0x4E00 + level * 100 + i), "pinyin": "pīn yīn",
+              "translations": [f"meaning {level}-{i} v{version}"]} for i in range(WORDS)]
+    return json.dumps(items, ensure_ascii=False).encode("utf-8")
+
+
+class FakeMirrorHandler(BaseHTTPRequestHandler):
+    files = {}  # Tên file -> (bytes, ETag, Last-Modified)
+    requests = Counter()  # Tên file -> số request
+    conditional = Counter()  # Tên file -> số request có If-None-Match
+    not_modified = Counter()  # Tên file -> số lần trả 304
+    lock = threading.Lock()
+
+    @classmethod
+    def put(cls, name: str, content: bytes):
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        cls.files[name] = (content, etag, email.utils.formatdate(time.time(), usegmt=True))
+
+    @classmethod
+    def reset_counters(cls):
+        cls.requests.clear()
+        cls.conditional.clear()
+        cls.not_modified.clear()
+
+    def do_GET(self):
+        name = self.path.lstrip("/")
+        if_none_match = self.headers.get("If-None-Match")
+        with self.lock:
+            self.requests[name] += 1
+            if if_none_match:
+                self.conditional[name] += 1
+        entry = self.files.get(name)
+        if entry is None:
+            self.send_error(404)
+            return
+        content, etag, last_modified = entry
+        if if_none_match == etag:
+            with self.lock:
+                self.not_modified[name] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DownloadHskDataTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeMirrorHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        HSK_DATA_SOURCES[SOURCE_NAME] = {
+            "name": "local test",
+            "base_url": f"http://127.0.0.1:{cls.server.server_address[1]}",
+            "files": {level: f"hsk{level}.json" for level in LEVELS},
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        del HSK_DATA_SOURCES[SOURCE_NAME]
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.tmp.name)
+        FakeMirrorHandler.files.clear()
+        for level in LEVELS:
+            FakeMirrorHandler.put(f"hsk{level}.json", level_file(level))
+        FakeMirrorHandler.reset_counters()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def download(self, workers: int = 6, force: bool = False) -> dict:
+        FakeMirrorHandler.reset_counters()
+        with contextlib.redirect_stdout(io.StringIO()):
+            return download_hsk_data(self.output_dir, SOURCE_NAME, workers, force)
+
+    def manifest(self) -> dict:
+        return json.loads((self.output_dir / MIRROR_MANIFEST_FILE).read_text(encoding="utf-8"))["files"]
+
+    def assert_mirror_matches_server(self):
+        for name, (content, _, _) in FakeMirrorHandler.files.items():
+            self.assertEqual((self.output_dir / name).read_bytes(), content, name)
+
+    def test_first_download_writes_files_and_manifest(self):
+        stats = self.download(workers=1)
+
+        self.assertEqual((stats["downloaded"], stats["notModified"], stats["failed"]), (6, 0, 0))
+        self.assertEqual(stats["totalWords"], 6 * WORDS)
+        self.assertEqual(FakeMirrorHandler.requests, Counter({f"hsk{level}.json": 1 for level in LEVELS}))
+        self.assertEqual(sum(FakeMirrorHandler.conditional.values()), 0)
+        self.assert_mirror_matches_server()
+
+        manifest = self.manifest()
+        self.assertEqual(sorted(manifest), sorted(f"hsk{level}.json" for level in LEVELS))
+        for name, entry in manifest.items():
+            content, etag, last_modified = FakeMirrorHandler.files[name]
+            self.assertEqual(entry["etag"], etag)
+            self.assertEqual(entry["lastModified"], last_modified)
+            self.assertEqual(entry["bytes"], len(content))
+            self.assertEqual(entry["sha1"], hashlib.sha1(content).hexdigest())
+            self.assertEqual(entry["items"], WORDS)
+            self.assertTrue(entry["url"].endswith("/" + name))
+
+    def test_force_downloads_without_conditional_requests(self):
+        self.download()
+        stats = self.download(force=True)
+
+        self.assertEqual((stats["downloaded"], stats["notModified"]), (6, 0))
+        self.assertEqual(sum(FakeMirrorHandler.requests.values()), 6)
+        self.assertEqual(sum(FakeMirrorHandler.conditional.values()), 0)
+        self.assert_mirror_matches_server()
+
+    def test_rerun_reuses_mirror_with_304(self):
+        first = self.download()
+        stats = self.download()
+
+        self.assertEqual((stats["downloaded"], stats["notModified"], stats["failed"]), (0, 6, 0))
+        self.assertEqual(FakeMirrorHandler.not_modified, Counter({f"hsk{level}.json": 1 for level in LEVELS}))
+        self.assertEqual(stats["bytesDownloaded"], 0)
+        self.assertEqual(stats["bytesSaved"], first["bytesDownloaded"])
+        self.assertEqual(stats["totalWords"], 6 * WORDS)
+        self.assert_mirror_matches_server()
+
+    def test_only_changed_file_is_downloaded_again(self):
+        self.download()
+        FakeMirrorHandler.put("hsk3.json", level_file(3, version=2))
+        stats = self.download()
+
+        self.assertEqual((stats["downloaded"], stats["notModified"]), (1, 5))
+        self.assertEqual(sum(FakeMirrorHandler.requests.values()), 6)
+        self.assertNotIn("hsk3.json", FakeMirrorHandler.not_modified)
+        self.assert_mirror_matches_server()
+        self.assertEqual(self.manifest()["hsk3.json"]["etag"], FakeMirrorHandler.files["hsk3.json"][1])
+
+    def test_deleted_mirror_file_is_downloaded_unconditionally(self):
+        self.download()
+        (self.output_dir / "hsk2.json").unlink()
+        stats = self.download()
+
+        self.assertEqual((stats["downloaded"], stats["notModified"]), (1, 5))
+        self.assertNotIn("hsk2.json", FakeMirrorHandler.conditional)
+        self.assert_mirror_matches_server()
+
+    def test_corrupt_response_keeps_old_mirror(self):
+        self.download()
+        old_content = (self.output_dir / "hsk5.json").read_bytes()
+        old_entry = self.manifest()["hsk5.json"]
+
+        FakeMirrorHandler.put("hsk5.json", b"<html>rate limited</html>")
+        stats = self.download()
+
+        self.assertEqual((stats["downloaded"], stats["notModified"], stats["failed"]), (0, 5, 1))
+        self.assertEqual((self.output_dir / "hsk5.json").read_bytes(), old_content)
+        self.assertEqual(self.manifest()["hsk5.json"], old_entry)
+        self.assertEqual(stats["totalWords"], 5 * WORDS)
+        self.assertFalse(list(self.output_dir.glob("*.tmp")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Kiểm tra FrequencyIndex: nhận dạng danh sách tần suất theo từng file và build tăng dần
+
+Cách sử dụng:
+python -m unittest test_frequency_index
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from frequency_index import FrequencyIndex
+
+VOCABULARY = {"我", "你", "年", "北京", "去", "好"}
+
+
+class FrequencyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.corpus = self.dir / "corpus"
+        self.corpus.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = self.corpus / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def counts(self, db_name="index.db"):
+        with FrequencyIndex(VOCABULARY, self.dir / db_name) as index:
+            index.update([self.corpus])
+            return {word: count for word, _, count in index.top(100)}
+
+    def test_prose_with_number_is_counted_as_text(self):
+        self.write("news.txt", "我 2008 年去北京\n你好\n")
+
+        self.assertEqual(self.counts(), {"我": 1, "年": 1, "去": 1, "北京": 1, "你": 1, "好": 1})
+
+    def test_frequency_list_with_header_and_extra_columns(self):
+        self.write("SUBTLEX-CH-WF.txt",
+                   "Total word count: 33,546,516\n"
+                   "Word\tWCount\tW/million\tlogW\n"
+                   "我\t500\t14.9\t2.7\n"
+                   "北京\t20\t0.6\t1.3\n")
+
+        self.assertEqual(self.counts(), {"我": 500, "北京": 20})
+
+    def test_frequency_list_mode_is_decided_per_file(self):
+        # Một dòng văn xuôi trong các dòng đầu: cả file là văn bản, số không được dùng làm số lần
+        self.write("mixed.tsv", "我\t500\n你好，我 3 年没去北京\n")
+
+        self.assertEqual(self.counts(), {"我": 2, "你": 1, "好": 1, "年": 1, "去": 1, "北京": 1})
+
+    def test_deleted_file_matches_fresh_build(self):
+        self.write("a.txt", "我去北京\n")
+        removed = self.write("b.txt", "你好\n你好\n")
+        self.counts()
+
+        removed.unlink()
+        incremental = self.counts()
+
+        self.assertEqual(incremental, self.counts("fresh.db"))
+        self.assertEqual(incremental, {"我": 1, "去": 1, "北京": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Cache bản dịch lưu trên đĩa (SQLite), dùng chung cho các script
+
+convert_hsk1_to_seed_data.py và import_hsk_all_levels.py dịch lại cùng các
+nghĩa tiếng Anh ở mỗi lần chạy. Cache lưu kết quả theo text tiếng Anh đã
+chuẩn hóa, kèm version của dictionary: khi TRANSLATION_DICT (hoặc thuật toán
+dịch, xem TRANSLATOR_VERSION, hoặc file dictionary ngoài) thay đổi thì toàn bộ
+cache tự bị xóa.
+
+Cách sử dụng:
+    with open_translation_cache() as cache:
+        meaning = cache.translate("meaning", english_text, translate_meaning)
+
+namespace tách kết quả của các hàm dịch khác nhau trên cùng một text
+(VD: "meaning" cho translate_meaning, "definitions" cho TranslationEngine).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from translation_dict import TRANSLATION_DICT, get_external_dictionary
+
+# Tăng khi thay đổi cách dịch (không chỉ nội dung dictionary) để bỏ cache cũ
+TRANSLATOR_VERSION = 2
+
+DEFAULT_CACHE_FILE = Path(__file__).parent.parent / "data" / "translation_cache.db"
+
+
+def dictionary_version(dictionary: Dict[str, str], external_version: str = "") -> str:
+    """
+    Version của dictionary: hash nội dung (không phụ thuộc thứ tự key) + TRANSLATOR_VERSION,
+    kèm version của dictionary ngoài (external_dictionary.py) nếu có
+    """
+    data = json.dumps(dictionary, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha1(data.encode("utf-8")).hexdigest()
+    return f"{TRANSLATOR_VERSION}:{digest}:{external_version}"
+
+
+def normalize_text(text: str) -> str:
+    """Chuẩn hóa text làm key: bỏ khoảng trắng đầu/cuối và gộp khoảng trắng liên tiếp"""
+    return " ".join(text.split())
+
+
+class TranslationCache:
+    """
+    Cache SQLite: (namespace, text) -> bản dịch
+
+    Toàn bộ cache được nạp vào dict khi mở nên get() là O(1), ghi được commit
+    theo nhóm commit_every bản ghi. Thread-safe (các worker dịch dùng chung được).
+    """
+
+    def __init__(self, db_path: Path, version: str, commit_every: int = 200):
+        self.db_path = Path(db_path)
+        self.version = version
+        self.commit_every = max(1, commit_every)
+        self.invalidated = False  # True nếu cache cũ bị xóa do dictionary thay đổi
+        self.hits = 0
+        self.misses = 0
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], str] = {}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                namespace TEXT NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (namespace, text)
+            )
+            """
+        )
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            self.invalidated = row is not None
+            self.conn.execute("DELETE FROM translations")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (self.version,)
+            )
+        self.conn.commit()
+
+        for namespace, text, translation in self.conn.execute(
+            "SELECT namespace, text, translation FROM translations"
+        ):
+            self._entries[(namespace, text)] = translation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get(self, namespace: str, text: str) -> Optional[str]:
+        """Bản dịch đã lưu của text (đã chuẩn hóa), None nếu chưa có"""
+        return self._entries.get((namespace, text))
+
+    def put(self, namespace: str, text: str, translation: str):
+        """Lưu bản dịch của text (đã chuẩn hóa)"""
+        with self._lock:
+            self._entries[(namespace, text)] = translation
+            self.conn.execute(
+                "INSERT OR REPLACE INTO translations (namespace, text, translation, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, text, translation, time.time()),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self.conn.commit()
+                self._uncommitted = 0
+
+    def translate(self, namespace: str, text: str, translate_func: Callable[[str], str]) -> str:
+        """Lấy bản dịch từ cache, chưa có thì gọi translate_func (trên text đã chuẩn hóa) và lưu lại"""
+        key = normalize_text(text)
+        cached = self._entries.get((namespace, key))
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        translation = translate_func(key)
+        self.put(namespace, key, translation)
+        return translation
+
+    def flush(self):
+        """Commit các bản ghi đang chờ"""
+        with self._lock:
+            if self._uncommitted:
+                self.conn.commit()
+                self._uncommitted = 0
+
+    def status(self) -> str:
+        """Thống kê để in khi kết thúc"""
+        return f"{len(self._entries)} bản dịch, {self.hits} hit, {self.misses} miss"
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def open_translation_cache(db_path: Path = DEFAULT_CACHE_FILE) -> TranslationCache:
+    """Mở cache với version của TRANSLATION_DICT (và dictionary ngoài) hiện tại"""
+    external = get_external_dictionary()
+    external_version = external.version if external is not None else ""
+    return TranslationCache(db_path, dictionary_version(TRANSLATION_DICT, external_version))
@@ -1,7 +1,22 @@
 """
 Dictionary để dịch meaning từ tiếng Anh sang tiếng Việt cho HSK 1
+
+Ngoài TRANSLATION_DICT viết tay, nếu có file Backend/data/translation_dict.bin
+(build bằng external_dictionary.py) thì dictionary lớn này được tra bổ sung.
+File chỉ được mở (mmap) ở lần tra đầu tiên.
 """
 
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from external_dictionary import ExternalDictionary
+from translation_stats import TranslationStats
+
+# Dictionary lớn lưu ngoài (tùy chọn), TRANSLATION_DICT được ưu tiên khi trùng key
+EXTERNAL_DICT_FILE = Path(__file__).parent.parent / "data" / "translation_dict.bin"
+
 # Dictionary dịch từ tiếng Anh sang tiếng Việt
 TRANSLATION_DICT = {
     # Common words
@@ -250,6 +265,155 @@ TRANSLATION_DICT = {
 }
 
 
+# Dấu câu bỏ đi khi so khớp token (dấu ngoặc chỉ bỏ khi so khớp, không bỏ khi giữ nguyên)
+_STRIP_CHARS = '.,!?;:'
+_MATCH_STRIP_CHARS = _STRIP_CHARS + '()"'
+_TERMINAL = ""  # Key đánh dấu node kết thúc một cụm trong trie (token không bao giờ rỗng)
+
+
+def _tokenize(text: str) -> Tuple[List[str], List[str]]:
+    """Tách text thành token: (dạng chuẩn hóa để so khớp, dạng gốc để giữ nguyên)"""
+    normalized_tokens = []
+    original_tokens = []
+    for raw in text.split():
+        normalized = raw.strip(_MATCH_STRIP_CHARS).lower()
+        if normalized:
+            normalized_tokens.append(normalized)
+            original_tokens.append(raw.strip(_STRIP_CHARS))
+    return normalized_tokens, original_tokens
+
+
+_external_dictionary: Optional[ExternalDictionary] = None
+_external_checked = False
+_stats: Optional[TranslationStats] = None  # Bật bằng enable_translation_stats()
+
+
+def enable_translation_stats() -> TranslationStats:
+    """Bật thống kê hit/miss và thời gian cho translate_meaning và TranslationEngine"""
+    global _stats
+    if _stats is None:
+        _stats = TranslationStats()
+    return _stats
+
+
+def disable_translation_stats():
+    global _stats
+    _stats = None
+
+
+def get_translation_stats() -> Optional[TranslationStats]:
+    """Thống kê hiện tại, None nếu chưa bật"""
+    return _stats
+
+
+def get_external_dictionary() -> Optional[ExternalDictionary]:
+    """ExternalDictionary dùng chung, None nếu không có file EXTERNAL_DICT_FILE"""
+    global _external_dictionary, _external_checked
+    if not _external_checked:
+        _external_checked = True
+        if EXTERNAL_DICT_FILE.exists():
+            _external_dictionary = ExternalDictionary(EXTERNAL_DICT_FILE)
+    return _external_dictionary
+
+
+class PhraseTranslator:
+    """
+    Dịch theo cụm dài nhất (greedy longest match) bằng trie theo token
+
+    Trie được build một lần từ các key của dictionary. Mỗi definition được
+    tách token một lần rồi quét từ trái sang phải: tại mỗi vị trí đi sâu
+    trong trie đến cụm dài nhất có nghĩa, không khớp thì giữ nguyên token.
+    Nhờ vậy các cụm nằm trong definition dài hơn (VD: "make a phone call"
+    trong "to make a phone call") vẫn được dịch.
+
+    Nếu có external (ExternalDictionary), tại mỗi vị trí còn tra thêm các cụm
+    dài hơn cụm khớp trong trie, đến max_phrase_length của external.
+    """
+
+    def __init__(self, dictionary: Dict[str, str], external: Optional[ExternalDictionary] = None):
+        self.dictionary = dictionary
+        self.external = external
+        self.root: Dict = {}
+        self.max_phrase_length = 0
+
+        for english, vietnamese in dictionary.items():
+            tokens, _ = _tokenize(english)
+            if not tokens:
+                continue
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_TERMINAL, vietnamese)
+            self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+    def translate_phrase(self, text: str) -> str:
+        """Dịch một cụm (không chứa dấu phẩy), trả về chuỗi rỗng nếu không có token"""
+        # Cả cụm có sẵn trong dictionary thì không cần tách token
+        stats = _stats
+        exact = self.dictionary.get(text)
+        if exact is not None:
+            if stats is not None:
+                stats.record_exact()
+            return exact
+
+        tokens, originals = _tokenize(text)
+        root = self.root
+        count = len(tokens)
+        external = self.external
+        external_max = external.max_phrase_length if external is not None else 0
+        translated = []
+        hits = 0
+        missed = []
+        i = 0
+
+        while i < count:
+            node = root
+            match = None
+            match_end = i
+            j = i
+            while j < count:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERMINAL in node:
+                    match = node[_TERMINAL]
+                    match_end = j
+
+            # Cụm dài hơn trong dictionary ngoài (tra từ dài nhất xuống)
+            for end in range(min(count, i + external_max), match_end, -1):
+                value = external.get_normalized(" ".join(tokens[i:end]))
+                if value is not None:
+                    match = value
+                    match_end = end
+                    break
+
+            if match is not None:
+                translated.append(match)
+                hits += match_end - i
+                i = match_end
+            else:
+                # Giữ nguyên nếu không tìm thấy
+                translated.append(originals[i])
+                missed.append(tokens[i])
+                i += 1
+
+        if stats is not None and count:
+            stats.record_tokens(hits, missed)
+        return ' '.join(translated)
+
+
+_phrase_translator: Optional[PhraseTranslator] = None
+
+
+def get_phrase_translator() -> PhraseTranslator:
+    """PhraseTranslator dùng chung (build trie ở lần gọi đầu tiên)"""
+    global _phrase_translator
+    if _phrase_translator is None:
+        _phrase_translator = PhraseTranslator(TRANSLATION_DICT, get_external_dictionary())
+    return _phrase_translator
+
+
 def translate_meaning(english_text: str) -> str:
     """
     Dịch meaning từ tiếng Anh sang tiếng Việt
@@ -260,9 +424,22 @@ def translate_meaning(english_text: str) -> str:
     Returns:
         Text tiếng Việt
     """
+    stats = _stats
+    if stats is None:
+        return _translate_meaning(english_text)
+    
+    start = time.perf_counter()
+    result = _translate_meaning(english_text)
+    stats.record_call(english_text, time.perf_counter() - start)
+    return result
+
+
+def _translate_meaning(english_text: str) -> str:
     if not english_text:
         return ""
     
+    translator = get_phrase_translator()
+    
     # Tách các nghĩa bằng dấu phẩy
     meanings = [m.strip() for m in english_text.split(',')]
     
@@ -271,28 +448,94 @@ def translate_meaning(english_text: str) -> str:
         # Loại bỏ dấu ngoặc đơn và nội dung bên trong
         clean_meaning = meaning.split('(')[0].strip()
         
-        # Tìm trong dictionary
-        if clean_meaning in TRANSLATION_DICT:
-            translated_meanings.append(TRANSLATION_DICT[clean_meaning])
-        else:
-            # Nếu không tìm thấy, giữ nguyên hoặc thử tìm từng từ
-            # Tìm từng từ riêng lẻ
-            words = clean_meaning.split()
-            translated_words = []
-            for word in words:
-                # Loại bỏ dấu câu
-                clean_word = word.strip('.,!?;:')
-                if clean_word.lower() in TRANSLATION_DICT:
-                    translated_words.append(TRANSLATION_DICT[clean_word.lower()])
-                else:
-                    # Giữ nguyên nếu không tìm thấy
-                    translated_words.append(clean_word)
-            
-            if translated_words:
-                translated_meanings.append(' '.join(translated_words))
-            else:
-                # Giữ nguyên nếu không dịch được
-                translated_meanings.append(meaning)
+        # Dịch theo cụm dài nhất có trong dictionary
+        translated = translator.translate_phrase(clean_meaning)
+        
+        # Giữ nguyên nếu không dịch được
+        translated_meanings.append(translated if translated else meaning)
     
     return ', '.join(translated_meanings) if translated_meanings else english_text
 
+
+class TranslationEngine:
+    """
+    Dịch danh sách definitions, tạo một lần và dùng chung cho cả process
+
+    - Index key đã lowercase + strip được tính sẵn khi khởi tạo
+      (tra "Dad", "dad" hay " Dad " đều ra cùng kết quả)
+    - Definition không có nguyên cụm trong index được dịch theo cụm dài nhất qua
+      PhraseTranslator (dùng chung get_phrase_translator() với translate_meaning)
+    - Kết quả được memoize theo tuple definitions nên nghĩa lặp lại không tốn chi phí
+    - Không có trạng thái ghi ngoài cache (lru_cache thread-safe) nên các worker dùng chung được
+    - Gán persistent_cache (TranslationCache) để dùng lại kết quả giữa các lần chạy
+    """
+
+    def __init__(self, dictionary: Optional[Dict[str, str]] = None, cache_size: int = 65536,
+                 external: Optional[ExternalDictionary] = None):
+        self.dictionary = dictionary if dictionary is not None else TRANSLATION_DICT
+        self.external = external  # Tra bổ sung khi không có trong dictionary
+        self.persistent_cache = None  # TranslationCache (translation_cache.py), tùy chọn
+        self.index: Dict[str, str] = {}
+        for english, vietnamese in self.dictionary.items():
+            self.index.setdefault(english.strip().lower(), vietnamese)
+        if dictionary is None and external is get_external_dictionary():
+            self.phrases = get_phrase_translator()
+        else:
+            self.phrases = PhraseTranslator(self.dictionary, external)
+        self._translate_cached = lru_cache(maxsize=cache_size)(self._translate_tuple)
+
+    def translate_definition(self, definition: str) -> str:
+        """Dịch một definition, token không có trong dictionary được giữ nguyên tiếng Anh"""
+        value = self.index.get(definition.strip().lower())
+        if value is not None:
+            stats = _stats
+            if stats is not None:
+                stats.record_exact()
+            return value
+
+        # Thống kê hit/miss theo token do PhraseTranslator ghi
+        translated = self.phrases.translate_phrase(definition.strip())
+        return translated if translated else definition
+
+    def _translate_tuple(self, definitions: Tuple[str, ...]) -> str:
+        cache = self.persistent_cache
+        if cache is None:
+            return ", ".join(self.translate_definition(d) for d in definitions)
+
+        # Mỗi definition một dòng để key không lẫn với dấu phẩy bên trong definition
+        key = "\n".join(" ".join(d.split()) for d in definitions)
+        cached = cache.get("definitions", key)
+        if cached is not None:
+            cache.hits += 1
+            return cached
+
+        cache.misses += 1
+        translated = ", ".join(self.translate_definition(d) for d in definitions)
+        cache.put("definitions", key, translated)
+        return translated
+
+    def translate_definitions(self, definitions: Sequence[str]) -> str:
+        """Dịch danh sách definitions, nối bằng dấu phẩy"""
+        stats = _stats
+        if stats is None:
+            return self._translate_cached(tuple(definitions))
+
+        # Lần gọi trúng lru_cache không đi qua translate_definition nên chỉ tính thời gian
+        start = time.perf_counter()
+        result = self._translate_cached(tuple(definitions))
+        stats.record_call(", ".join(definitions), time.perf_counter() - start)
+        return result
+
+    def cache_info(self):
+        return self._translate_cached.cache_info()
+
+
+_engine: Optional[TranslationEngine] = None
+
+
+def get_translation_engine() -> TranslationEngine:
+    """TranslationEngine dùng chung (tạo ở lần gọi đầu tiên)"""
+    global _engine
+    if _engine is None:
+        _engine = TranslationEngine(external=get_external_dictionary())
+    return _engine
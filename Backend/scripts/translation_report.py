@@ -0,0 +1,51 @@
+"""
+Báo cáo độ phủ của lớp dịch trên toàn bộ corpus HSK
+
+Dịch definitions của mọi từ trong các file hsk*.json (Backend/scripts và
+Backend/data) với thống kê bật, rồi in tỉ lệ dịch được, các token chưa dịch
+xếp theo tần suất (nên bổ sung vào dictionary trước) và các lần gọi chậm nhất.
+
+Cách sử dụng:
+python translation_report.py [số token hiển thị] [file csv xuất token chưa dịch]
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+from benchmark_translation import load_definitions
+from translation_dict import enable_translation_stats, get_phrase_translator, translate_meaning
+
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    csv_path = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    script_dir = Path(__file__).parent
+
+    print("=" * 60)
+    print("BÁO CÁO DỊCH - TRANSLATE_MEANING")
+    print("=" * 60)
+
+    definitions = load_definitions([script_dir, script_dir.parent / "data"])
+    if not definitions:
+        print("❌ Không tìm thấy file hsk*.json")
+        sys.exit(1)
+
+    get_phrase_translator()  # Build trie trước để không tính vào lần gọi đầu tiên
+    stats = enable_translation_stats()
+    for text in definitions:
+        translate_meaning(text)
+
+    print()
+    print(stats.report(top))
+
+    if csv_path is not None:
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["token", "count"])
+            writer.writerows(stats.untranslated.most_common())
+        print(f"\n✅ Đã xuất {len(stats.untranslated)} token chưa dịch vào {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Thống kê cho lớp dịch (translation_dict.py)
+
+Đếm số cụm khớp nguyên văn, số token dịch được qua trie / dictionary ngoài,
+số token phải giữ nguyên tiếng Anh, thời gian mỗi lần gọi, và xếp hạng các
+token chưa dịch theo tần suất để biết nên bổ sung dictionary ở đâu.
+
+Cách sử dụng:
+    stats = enable_translation_stats()   # từ translation_dict
+    ... translate_meaning(...) ...
+    print(stats.report())
+
+Khi chưa bật, lớp dịch chỉ tốn một phép kiểm tra None mỗi lần gọi.
+"""
+
+import heapq
+import threading
+from collections import Counter
+from typing import List, Tuple
+
+
+class TranslationStats:
+    """Bộ đếm thread-safe (các worker dịch của import pipeline dùng chung được)"""
+
+    def __init__(self, slowest_size: int = 10):
+        self.slowest_size = slowest_size
+        self.calls = 0
+        self.total_time = 0.0
+        self.exact_hits = 0  # Cụm khớp nguyên văn một key (không cần tách token)
+        self.token_hits = 0  # Token được dịch qua trie hoặc dictionary ngoài
+        self.misses = 0  # Token giữ nguyên tiếng Anh
+        self.untranslated_phrases = 0  # Cụm không dịch được token nào
+        self.untranslated: Counter = Counter()
+        self._slowest: List[Tuple[float, str]] = []  # Min-heap (thời gian, text)
+        self._lock = threading.Lock()
+
+    def record_exact(self):
+        with self._lock:
+            self.exact_hits += 1
+
+    def record_tokens(self, hits: int, missed: List[str]):
+        """Kết quả dịch theo token của một cụm: số token dịch được và các token giữ nguyên"""
+        with self._lock:
+            self.token_hits += hits
+            self.misses += len(missed)
+            if missed:
+                self.untranslated.update(missed)
+                if not hits:
+                    self.untranslated_phrases += 1
+
+    def record_call(self, text: str, elapsed: float):
+        """Thời gian của một lần gọi hàm dịch"""
+        with self._lock:
+            self.calls += 1
+            self.total_time += elapsed
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, (elapsed, text))
+            elif elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (elapsed, text))
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        """Các lần gọi chậm nhất, chậm nhất trước"""
+        with self._lock:
+            return sorted(self._slowest, reverse=True)
+
+    def hit_rate(self) -> float:
+        """Tỉ lệ token được dịch (cụm khớp nguyên văn tính là một lần trúng)"""
+        total = self.exact_hits + self.token_hits + self.misses
+        return (self.exact_hits + self.token_hits) / total if total else 0.0
+
+    def report(self, top: int = 30) -> str:
+        """Báo cáo dạng text: tổng quan, token chưa dịch theo tần suất, các lần gọi chậm nhất"""
+        with self._lock:
+            untranslated = self.untranslated.most_common(top)
+            distinct = len(self.untranslated)
+
+        average = self.total_time / self.calls * 1e6 if self.calls else 0.0
+        lines = [
+            f"Số lần gọi: {self.calls:,} - tổng {self.total_time * 1000:.1f}ms, trung bình {average:.1f}µs",
+            f"Khớp nguyên cụm: {self.exact_hits:,} | token dịch được: {self.token_hits:,} | "
+            f"token giữ nguyên: {self.misses:,} ({distinct:,} token khác nhau)",
+            f"Tỉ lệ dịch được: {self.hit_rate() * 100:.1f}% | "
+            f"cụm giữ nguyên hoàn toàn tiếng Anh: {self.untranslated_phrases:,}",
+        ]
+
+        if untranslated:
+            lines.append(f"\nTop {len(untranslated)} token chưa dịch:")
+            for rank, (token, count) in enumerate(untranslated, 1):
+                lines.append(f"  {rank:>3}. {token:<25} {count:,}")
+
+        slowest = self.slowest()
+        if slowest:
+            lines.append("\nCác lần gọi chậm nhất:")
+            for elapsed, text in slowest:
+                lines.append(f"  {elapsed * 1e6:>8.1f}µs  {text[:60]}")
+
+        return "\n".join(lines)
@@ -0,0 +1,121 @@
+"""
+Đọc file từ vựng (JSON hoặc Excel .xlsx) thành các word theo schema seed data
+(character, pinyin, meaning, hskLevel, exampleSentence, audioUrl, frequency, strokeCount)
+
+Excel được đọc kiểu stream: openpyxl mở workbook ở chế độ read-only và duyệt từng dòng
+(iter_rows values_only), không tạo đối tượng cell cho cả sheet, nên file giáo viên gửi
+hàng trăm nghìn dòng không làm đầy RAM. Dòng đầu tiên có tên cột được nhận là dòng tiêu đề;
+tên cột được so khớp không phân biệt hoa thường / khoảng trắng với COLUMN_ALIASES
+(VD: "Chữ Hán", "Hanzi", "汉字" -> character), hoặc chỉ định qua columns.
+
+Cách sử dụng:
+    for word in iter_vocabulary("tu_vung_hsk3.xlsx", sheet="HSK3"):
+        ...
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from openpyxl import load_workbook
+
+EXCEL_SUFFIXES = (".xlsx", ".xlsm")
+HEADER_SEARCH_ROWS = 20  # Tìm dòng tiêu đề trong số dòng đầu (bỏ qua dòng tên bảng, dòng trống)
+
+# Tên cột chấp nhận cho từng trường (đã chuẩn hóa bằng _normalize_header)
+COLUMN_ALIASES = {
+    "character": ("character", "chữhán", "hanzi", "chinese", "simplified", "từvựng", "word", "汉字", "词语"),
+    "pinyin": ("pinyin", "phiênâm", "拼音"),
+    "meaning": ("meaning", "nghĩa", "nghĩatiếngviệt", "tiếngviệt", "english", "definition", "释义"),
+    "hskLevel": ("hsklevel", "hsk", "level", "cấpđộ", "cấp"),
+    "exampleSentence": ("examplesentence", "example", "vídụ", "câuvídụ", "例句"),
+    "audioUrl": ("audiourl", "audio"),
+    "frequency": ("frequency", "tầnsuất"),
+    "strokeCount": ("strokecount", "strokes", "sốnét"),
+}
+INT_FIELDS = ("hskLevel", "frequency", "strokeCount")
+
+
+def _normalize_header(value: Any) -> str:
+    # NFC: Excel có thể lưu tiếng Việt dạng tổ hợp (NFD)
+    if value is None:
+        return ""
+    return re.sub(r"[\s_\-]+", "", unicodedata.normalize("NFC", str(value))).lower()
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Số nguyên từ ô Excel: 3, 3.0, "3", "HSK 3" -> 3"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.search(r"\d+", str(value))
+    return int(match.group()) if match else None
+
+
+def map_columns(header: Sequence[Any], columns: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Vị trí cột của từng trường trong dòng tiêu đề
+    columns: tên cột chỉ định cho trường (VD: {"meaning": "Nghĩa tiếng Việt"}), ưu tiên hơn COLUMN_ALIASES
+    """
+    normalized = [_normalize_header(value) for value in header]
+    mapping = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        if columns and field in columns:
+            aliases = (_normalize_header(columns[field]),)
+        for alias in aliases:
+            if alias in normalized:
+                mapping[field] = normalized.index(alias)
+                break
+    return mapping
+
+
+def iter_excel_words(path: Path, sheet: Optional[str] = None,
+                     columns: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Đọc từng word từ sheet Excel (mặc định sheet đang chọn) theo kiểu stream
+
+    Dòng trống hoặc không có chữ Hán bị bỏ qua. Lỗi ValueError nếu không tìm thấy cột character.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+
+        mapping = {}
+        for _, header in zip(range(HEADER_SEARCH_ROWS), rows):
+            mapping = map_columns(header, columns)
+            if "character" in mapping:
+                break
+        if "character" not in mapping:
+            raise ValueError(f"{path}: không tìm thấy cột chữ Hán trong {HEADER_SEARCH_ROWS} dòng đầu "
+                             f"(tên cột hỗ trợ: {', '.join(COLUMN_ALIASES['character'])})")
+
+        fields = list(mapping.items())
+        for row in rows:
+            word = {}
+            for field, index in fields:
+                value = row[index] if index < len(row) else None
+                if field in INT_FIELDS:
+                    value = _to_int(value)
+                elif value is not None:
+                    value = str(value).strip()
+                if value not in (None, ""):
+                    word[field] = value
+            if word.get("character"):
+                yield word
+    finally:
+        workbook.close()
+
+
+def iter_vocabulary(path: Path, sheet: Optional[str] = None,
+                    columns: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Đọc từng word từ file JSON (danh sách word) hoặc Excel (.xlsx/.xlsm)"""
+    path = Path(path)
+    if path.suffix.lower() in EXCEL_SUFFIXES:
+        yield from iter_excel_words(path, sheet, columns)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield from json.load(f)
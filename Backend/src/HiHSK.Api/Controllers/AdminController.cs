@@ -405,10 +405,15 @@ public class AdminController : ControllerBase
 
     /// <summary>
     /// Lấy danh sách từ vựng (Admin) với filter
+    /// Phân trang tùy chọn qua page/pageSize (không truyền pageSize thì trả về toàn bộ)
     /// </summary>
     [HttpGet("words")]
     [AllowAnonymous] // Tạm thời cho phép không cần auth
-    public async Task<IActionResult> GetWords([FromQuery] int? hskLevel, [FromQuery] string? search)
+    public async Task<IActionResult> GetWords(
+        [FromQuery] int? hskLevel,
+        [FromQuery] string? search,
+        [FromQuery] int? page = null,
+        [FromQuery] int? pageSize = null)
     {
         try
         {
@@ -429,9 +434,21 @@ public class AdminController : ControllerBase
                 );
             }
 
-            var words = await query
+            var orderedQuery = query
                 .OrderBy(w => w.HSKLevel)
                 .ThenBy(w => w.Character)
+                .ThenBy(w => w.Id);
+
+            IQueryable<Word> pagedQuery = orderedQuery;
+            if (pageSize.HasValue && pageSize.Value > 0)
+            {
+                var pageNumber = Math.Max(page ?? 1, 1);
+                pagedQuery = orderedQuery
+                    .Skip((pageNumber - 1) * pageSize.Value)
+                    .Take(pageSize.Value);
+            }
+
+            var words = await pagedQuery
                 .Select(w => new
                 {
                     id = w.Id,
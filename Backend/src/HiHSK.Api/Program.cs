@@ -185,6 +185,19 @@ if (app.Environment.IsDevelopment())
 
 app.UseHttpsRedirection();
 
+// File tĩnh trong wwwroot, gồm audio build sẵn (Backend/scripts/audio_cache_builder.py).
+// Tên file audio là hash nội dung nên trình duyệt cache lâu dài được
+app.UseStaticFiles(new StaticFileOptions
+{
+    OnPrepareResponse = ctx =>
+    {
+        if (ctx.Context.Request.Path.StartsWithSegments("/audio"))
+        {
+            ctx.Context.Response.Headers.CacheControl = "public, max-age=31536000, immutable";
+        }
+    }
+});
+
 // CORS must be before Authentication & Authorization
 app.UseCors("AllowSpecificOrigins");
 
@@ -1,10 +1,21 @@
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5075'
+
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   reactStrictMode: true,
   images: {
     domains: ['localhost'],
   },
+  async rewrites() {
+    return [
+      {
+        // Audio build sẵn (Backend/scripts/audio_cache_builder.py) có audioUrl tương đối /audio/<hash>.mp3,
+        // file nằm trong wwwroot của backend
+        source: '/audio/:path*',
+        destination: `${API_BASE_URL}/audio/:path*`,
+      },
+    ]
+  },
 }
 
 module.exports = nextConfig
-